@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Time the construction of wide, deep and balanced route trees of increasing
+size, and report the memory retained by each tree once built.
+
+Run with ``python -m benchmarks.construction``. The time and memory per route
+should remain roughly constant as the size of the tree grows, regardless of
+its shape, both when routes are validated as they are created, when the
+validation is deferred until the tree is complete and when the tree is built
+from a specification or from rows.
+
+"""
+
+from __future__ import print_function
+
+import gc
+from timeit import default_timer
+import tracemalloc
+
+from django_routing.builders import RouteTreeBuilder
+from django_routing.routes import Route
+from django_routing.routes import deferred_validation
+
+
+ROUTE_COUNTS = (1000, 10000, 100000)
+
+
+SUB_ROUTES_PER_GROUP = 100
+
+
+SUB_ROUTES_PER_BALANCED_ROUTE = 4
+
+
+def build_wide_route_tree(route_count):
+    group_count = max(route_count // SUB_ROUTES_PER_GROUP, 1)
+    groups = []
+    for group_index in range(group_count):
+        leaf_routes = [
+            Route(None, 'route_{}_{}'.format(group_index, leaf_index))
+            for leaf_index in range(SUB_ROUTES_PER_GROUP)
+            ]
+        group_name = 'group_{}'.format(group_index)
+        groups.append(Route(None, group_name, leaf_routes))
+
+    root_route = Route(None, 'root', groups)
+    return root_route
+
+
+def build_deep_route_tree(route_count):
+    route = Route(None, 'route_0')
+    for route_index in range(1, route_count):
+        route = Route(None, 'route_{}'.format(route_index), [route])
+    return route
+
+
+def build_balanced_route_tree(route_count):
+    # The tree is built level by level, from the leaves up
+    leaf_count = max(
+        route_count * (SUB_ROUTES_PER_BALANCED_ROUTE - 1) //
+        SUB_ROUTES_PER_BALANCED_ROUTE,
+        1,
+        )
+    routes = [
+        Route(None, 'route_{}'.format(route_index))
+        for route_index in range(leaf_count)
+        ]
+    route_index = leaf_count
+    while 1 < len(routes):
+        parent_routes = []
+        for first_sub_route_index in \
+            range(0, len(routes), SUB_ROUTES_PER_BALANCED_ROUTE):
+            sub_routes = routes[
+                first_sub_route_index:
+                first_sub_route_index + SUB_ROUTES_PER_BALANCED_ROUTE
+                ]
+            parent_routes.append(
+                Route(None, 'route_{}'.format(route_index), sub_routes),
+                )
+            route_index += 1
+        routes = parent_routes
+    return routes[0]
+
+
+def defer_validation(build_route_tree):
+    def build_route_tree_with_deferred_validation(route_count):
+        with deferred_validation():
+            root_route = build_route_tree(route_count)
+        root_route.validate()
+        return root_route
+    return build_route_tree_with_deferred_validation
+
+
+build_wide_route_tree_with_deferred_validation = \
+    defer_validation(build_wide_route_tree)
+
+
+def build_wide_route_tree_from_specification(route_count):
+    group_count = max(route_count // SUB_ROUTES_PER_GROUP, 1)
+    group_specifications = []
+    for group_index in range(group_count):
+        leaf_specifications = [
+            (None, 'route_{}_{}'.format(group_index, leaf_index))
+            for leaf_index in range(SUB_ROUTES_PER_GROUP)
+            ]
+        group_name = 'group_{}'.format(group_index)
+        group_specifications.append((None, group_name, leaf_specifications))
+
+    route_tree_builder = \
+        RouteTreeBuilder((None, 'root', group_specifications))
+    root_route = route_tree_builder.build()
+    return root_route
+
+
+def build_wide_route_tree_from_rows(route_count):
+    group_count = max(route_count // SUB_ROUTES_PER_GROUP, 1)
+    rows = [(None, 'root', None)]
+    for group_index in range(group_count):
+        group_name = 'group_{}'.format(group_index)
+        rows.append(('root', group_name, None))
+        for leaf_index in range(SUB_ROUTES_PER_GROUP):
+            leaf_name = 'route_{}_{}'.format(group_index, leaf_index)
+            rows.append((group_name, leaf_name, None))
+
+    route_tree_builder = RouteTreeBuilder.from_rows(rows)
+    root_route = route_tree_builder.build()
+    return root_route
+
+
+def time_construction(build_route_tree, route_count):
+    # Like timeit, keep the garbage collector from skewing the measurements
+    gc.disable()
+    try:
+        start_time = default_timer()
+        build_route_tree(route_count)
+        elapsed_time = default_timer() - start_time
+    finally:
+        gc.enable()
+    return elapsed_time
+
+
+def measure_retained_memory(build_route_tree, route_count):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        route_tree = build_route_tree(route_count)
+        retained_bytes = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    del route_tree
+    return retained_bytes
+
+
+def main():
+    route_tree_builders = (
+        ('Wide tree, eager validation', build_wide_route_tree),
+        (
+            'Wide tree, deferred validation',
+            build_wide_route_tree_with_deferred_validation,
+            ),
+        (
+            'Wide tree, builder from specification',
+            build_wide_route_tree_from_specification,
+            ),
+        ('Wide tree, builder from rows', build_wide_route_tree_from_rows),
+        ('Deep tree, eager validation', build_deep_route_tree),
+        (
+            'Deep tree, deferred validation',
+            defer_validation(build_deep_route_tree),
+            ),
+        ('Balanced tree, eager validation', build_balanced_route_tree),
+        (
+            'Balanced tree, deferred validation',
+            defer_validation(build_balanced_route_tree),
+            ),
+        )
+    for title, build_route_tree in route_tree_builders:
+        print(title)
+        for route_count in ROUTE_COUNTS:
+            elapsed_time = time_construction(build_route_tree, route_count)
+            retained_bytes = \
+                measure_retained_memory(build_route_tree, route_count)
+            print(
+                '{:>7} routes: {:8.3f}s ({:.2f}us and {:.0f} bytes per '
+                'route)'.format(
+                    route_count,
+                    elapsed_time,
+                    elapsed_time / route_count * 1e6,
+                    float(retained_bytes) / route_count,
+                    ),
+                )
+
+
+if __name__ == '__main__':
+    main()
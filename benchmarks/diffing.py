@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Time the diff of two independently built route trees that only differ in the
+view of one route, compared with checking whether two independently built
+trees are equivalent, which tells nothing about what changed.
+
+Run with ``python -m benchmarks.diffing``.
+
+"""
+
+from __future__ import print_function
+
+from timeit import default_timer
+
+from django_routing.diffing import diff
+
+from benchmarks.construction import SUB_ROUTES_PER_GROUP
+from benchmarks.construction import build_wide_route_tree
+
+
+ROUTE_COUNTS = (1000, 10000, 50000)
+
+
+def _view():
+    pass  # pragma: no cover
+
+
+def time_function(function, *args):
+    start_time = default_timer()
+    result = function(*args)
+    elapsed_time = default_timer() - start_time
+    return elapsed_time, result
+
+
+def are_route_trees_equivalent(old_route, new_route):
+    return old_route == new_route
+
+
+def main():
+    for route_count in ROUTE_COUNTS:
+        old_route = build_wide_route_tree(route_count)
+        last_group_index = route_count // SUB_ROUTES_PER_GROUP - 1
+        new_route = build_wide_route_tree(route_count).with_view(
+            'route_{}_0'.format(last_group_index),
+            _view,
+            )
+
+        equality_time = time_function(
+            are_route_trees_equivalent,
+            old_route,
+            build_wide_route_tree(route_count),
+            )[0]
+        diff_time, route_tree_diff = \
+            time_function(diff, old_route, new_route)
+        print('{:>7} routes: == {:.6f}s, diff {:.6f}s {!r}'.format(
+            route_count,
+            equality_time,
+            diff_time,
+            route_tree_diff,
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Compare the memory used by, and the lookup latency in, many tenant route trees
+built as specializations of a shared base and as tenants in a route forest.
+
+Run with ``python -m benchmarks.forests``.
+
+"""
+
+from __future__ import print_function
+
+import gc
+import random
+from timeit import default_timer
+import tracemalloc
+
+from django_routing.forests import RouteForest
+from django_routing.routes import Route
+
+from benchmarks.construction import SUB_ROUTES_PER_GROUP
+from benchmarks.construction import build_wide_route_tree
+
+
+BASE_ROUTE_COUNT = 10000
+
+
+TENANT_COUNT = 1000
+
+
+OVERRIDDEN_VIEWS_PER_TENANT = 5
+
+
+ADDITIONAL_ROUTES_PER_TENANT = 3
+
+
+LOOKUP_COUNT = 100000
+
+
+def _view():
+    pass  # pragma: no cover
+
+
+def get_tenant_overrides(tenant_index):
+    # Every tenant overrides the view of the first leaf in a few groups and
+    # adds routes to the first group
+    group_count = BASE_ROUTE_COUNT // SUB_ROUTES_PER_GROUP
+    overridden_group_indices = [
+        (tenant_index + offset) % group_count
+        for offset in range(OVERRIDDEN_VIEWS_PER_TENANT)
+        ]
+    additional_routes = [
+        Route(_view, 'tenant_{}_route_{}'.format(tenant_index, route_index))
+        for route_index in range(ADDITIONAL_ROUTES_PER_TENANT)
+        ]
+    return overridden_group_indices, additional_routes
+
+
+def build_specialized_tenants(base_route):
+    tenant_routes = []
+    for tenant_index in range(TENANT_COUNT):
+        overridden_group_indices, additional_routes = \
+            get_tenant_overrides(tenant_index)
+
+        specialized_groups = []
+        for group_index in overridden_group_indices:
+            group = base_route.get_route_by_name(
+                'group_{}'.format(group_index),
+                )
+            leaf_route = base_route.get_route_by_name(
+                'route_{}_0'.format(group_index),
+                )
+            specialized_group = group.create_specialization(
+                specialized_sub_routes=[
+                    leaf_route.create_specialization(_view),
+                    ],
+                additional_sub_routes=additional_routes
+                if group_index == overridden_group_indices[0] else (),
+                )
+            specialized_groups.append(specialized_group)
+
+        tenant_route = base_route.create_specialization(
+            specialized_sub_routes=specialized_groups,
+            )
+        tenant_routes.append(tenant_route)
+    return tenant_routes
+
+
+def build_route_forest(base_route):
+    route_forest = RouteForest(base_route)
+    tenant_routes = []
+    for tenant_index in range(TENANT_COUNT):
+        overridden_group_indices, additional_routes = \
+            get_tenant_overrides(tenant_index)
+
+        views_by_route_name = {
+            'route_{}_0'.format(group_index): _view
+            for group_index in overridden_group_indices
+            }
+        first_group_name = 'group_{}'.format(overridden_group_indices[0])
+        tenant_route = route_forest.add_tenant(
+            tenant_index,
+            views_by_route_name=views_by_route_name,
+            additional_sub_routes_by_route_name={
+                first_group_name: additional_routes,
+                },
+            )
+        tenant_routes.append(tenant_route)
+    return tenant_routes
+
+
+def get_lookups():
+    route_names = [
+        'route_{}_{}'.format(group_index, leaf_index)
+        for group_index in range(BASE_ROUTE_COUNT // SUB_ROUTES_PER_GROUP)
+        for leaf_index in range(SUB_ROUTES_PER_GROUP)
+        ]
+    random_generator = random.Random(0)
+    lookups = [
+        (
+            random_generator.randrange(TENANT_COUNT),
+            random_generator.choice(route_names),
+            )
+        for _ in range(LOOKUP_COUNT)
+        ]
+    return lookups
+
+
+def look_up_routes(tenant_routes, lookups):
+    for tenant_index, route_name in lookups:
+        tenant_routes[tenant_index].get_route_by_name(route_name)
+
+
+def measure_tenants(build_tenants, base_route, lookups):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        tenant_routes = build_tenants(base_route)
+        build_allocated_bytes = tracemalloc.get_traced_memory()[0]
+
+        look_up_routes(tenant_routes, lookups)
+        lookup_allocated_bytes = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    # Lookups are timed once any lazy index is built and without tracing
+    start_time = default_timer()
+    look_up_routes(tenant_routes, lookups)
+    lookup_time = default_timer() - start_time
+
+    del tenant_routes
+    return build_allocated_bytes, lookup_allocated_bytes, lookup_time
+
+
+def main():
+    base_route = build_wide_route_tree(BASE_ROUTE_COUNT)
+    base_route.get_route_by_name('root')
+    lookups = get_lookups()
+
+    print('{} tenants over {} routes'.format(TENANT_COUNT, BASE_ROUTE_COUNT))
+    tenant_builders = (
+        ('Specializations', build_specialized_tenants),
+        ('Route forest', build_route_forest),
+        )
+    for title, build_tenants in tenant_builders:
+        build_allocated_bytes, lookup_allocated_bytes, lookup_time = \
+            measure_tenants(build_tenants, base_route, lookups)
+        print(
+            '{:>16}: {:.1f}MB built, {:.1f}MB after lookups, '
+            '{:.2f}us per lookup'.format(
+                title,
+                build_allocated_bytes / 1e6,
+                lookup_allocated_bytes / 1e6,
+                lookup_time / LOOKUP_COUNT * 1e6,
+                ),
+            )
+
+
+if __name__ == '__main__':
+    main()
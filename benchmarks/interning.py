@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Compare the memory used by forests of route trees built with and without
+a route interner.
+
+Run with ``python -m benchmarks.interning``.
+
+"""
+
+from __future__ import print_function
+
+import tracemalloc
+
+from django_routing.routes import Route
+from django_routing.routes import RouteInterner
+
+
+TREE_COUNT = 200
+
+
+SECTION_COUNT = 20
+
+
+SUB_ROUTES_PER_SECTION = 25
+
+
+def _view():
+    pass  # pragma: no cover
+
+
+def build_forest(route_factory):
+    forest = []
+    for tree_index in range(TREE_COUNT):
+        sections = []
+        for section_index in range(SECTION_COUNT):
+            leaf_routes = [
+                route_factory(
+                    _view,
+                    'route_{}_{}'.format(section_index, leaf_index),
+                    )
+                for leaf_index in range(SUB_ROUTES_PER_SECTION)
+                ]
+            section_name = 'section_{}'.format(section_index)
+            sections.append(route_factory(None, section_name, leaf_routes))
+
+        tree_name = 'tenant_{}'.format(tree_index)
+        forest.append(route_factory(None, tree_name, sections))
+
+    return forest
+
+
+def measure_forest_memory(route_factory):
+    tracemalloc.start()
+    try:
+        forest = build_forest(route_factory)
+        allocated_bytes = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    del forest
+    return allocated_bytes
+
+
+def main():
+    route_count = \
+        TREE_COUNT * SECTION_COUNT * (SUB_ROUTES_PER_SECTION + 1) + TREE_COUNT
+    print('{} trees with {} routes in total'.format(TREE_COUNT, route_count))
+
+    non_interned_bytes = measure_forest_memory(Route)
+    print('Not interned: {:>12,} bytes'.format(non_interned_bytes))
+
+    interner = RouteInterner()
+    interned_bytes = measure_forest_memory(interner.create_route)
+    print('Interned:     {:>12,} bytes'.format(interned_bytes))
+
+
+if __name__ == '__main__':
+    main()
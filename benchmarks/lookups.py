@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Time the probing of route names that mostly do not exist, by catching the
+errors from ``get_route_by_name()`` and by calling ``find_route()``, in route
+trees, compiled route trees and tenant route trees.
+
+Also time the lookup of the routes in a navigation menu, one at a time and
+in a batch with ``get_routes_by_names()``.
+
+Run with ``python -m benchmarks.lookups``.
+
+"""
+
+from __future__ import print_function
+
+import random
+from timeit import default_timer
+
+from django_routing.exceptions import NonExistingRouteError
+from django_routing.forests import RouteForest
+
+from benchmarks.construction import build_wide_route_tree
+
+
+ROUTE_COUNT = 10000
+
+
+PROBE_COUNT = 100000
+
+
+MISS_RATIO = 0.9
+
+
+MENU_ROUTE_COUNT = 150
+
+
+MENU_COUNT = 1000
+
+
+def get_probed_route_names():
+    random_generator = random.Random(0)
+    probed_route_names = []
+    for _ in range(PROBE_COUNT):
+        route_index = random_generator.randrange(ROUTE_COUNT)
+        if random_generator.random() < MISS_RATIO:
+            probed_route_names.append('feature_{}'.format(route_index))
+        else:
+            probed_route_names.append('route_{}_{}'.format(
+                *divmod(route_index, 100)
+                ))
+    return probed_route_names
+
+
+def probe_by_getting_routes(route_tree, probed_route_names):
+    for route_name in probed_route_names:
+        try:
+            route_tree.get_route_by_name(route_name)
+        except NonExistingRouteError:
+            pass
+
+
+def probe_by_finding_routes(route_tree, probed_route_names):
+    for route_name in probed_route_names:
+        route_tree.find_route(route_name)
+
+
+def get_menu_route_names():
+    random_generator = random.Random(0)
+    menu_route_names = [
+        'route_{}_{}'.format(*divmod(route_index, 100))
+        for route_index
+        in random_generator.sample(range(ROUTE_COUNT), MENU_ROUTE_COUNT)
+        ]
+    return menu_route_names
+
+
+def get_menu_routes_one_at_a_time(route_tree, menu_route_names):
+    for _ in range(MENU_COUNT):
+        {
+            route_name: route_tree.get_route_by_name(route_name)
+            for route_name in menu_route_names
+            }
+
+
+def get_menu_routes_in_batch(route_tree, menu_route_names):
+    for _ in range(MENU_COUNT):
+        route_tree.get_routes_by_names(menu_route_names)
+
+
+def time_probing(probe_route_names, route_tree, probed_route_names):
+    # Any lazy index is built before timing
+    route_tree.find_route('root')
+
+    start_time = default_timer()
+    probe_route_names(route_tree, probed_route_names)
+    elapsed_time = default_timer() - start_time
+    return elapsed_time
+
+
+def main():
+    route = build_wide_route_tree(ROUTE_COUNT)
+    route_trees = (
+        ('Route tree', route),
+        ('Compiled tree', route.compile()),
+        ('Tenant tree', RouteForest(route).add_tenant('tenant')),
+        )
+    probed_route_names = get_probed_route_names()
+
+    print('{} probes with {:.0%} misses over {} routes'.format(
+        PROBE_COUNT,
+        MISS_RATIO,
+        ROUTE_COUNT,
+        ))
+    for title, route_tree in route_trees:
+        getting_time = time_probing(
+            probe_by_getting_routes,
+            route_tree,
+            probed_route_names,
+            )
+        finding_time = time_probing(
+            probe_by_finding_routes,
+            route_tree,
+            probed_route_names,
+            )
+        print(
+            '{:>16}: {:.2f}us per probe with errors, {:.2f}us per probe '
+            'without them'.format(
+                title,
+                getting_time / PROBE_COUNT * 1e6,
+                finding_time / PROBE_COUNT * 1e6,
+                ),
+            )
+
+    menu_route_names = get_menu_route_names()
+    print('{} menus of {} routes'.format(MENU_COUNT, MENU_ROUTE_COUNT))
+    for title, route_tree in route_trees:
+        one_at_a_time_time = time_probing(
+            get_menu_routes_one_at_a_time,
+            route_tree,
+            menu_route_names,
+            )
+        batch_time = time_probing(
+            get_menu_routes_in_batch,
+            route_tree,
+            menu_route_names,
+            )
+        print(
+            '{:>16}: {:.1f}us per menu one at a time, {:.1f}us per menu in '
+            'a batch'.format(
+                title,
+                one_at_a_time_time / MENU_COUNT * 1e6,
+                batch_time / MENU_COUNT * 1e6,
+                ),
+            )
+
+
+if __name__ == '__main__':
+    main()
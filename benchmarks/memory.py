@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Report the memory used per route node in wide trees of leaf routes and in
+specializations of them.
+
+Run with ``python -m benchmarks.memory``.
+
+"""
+
+from __future__ import print_function
+
+import tracemalloc
+
+from django_routing.routes import Route
+
+
+ROUTE_COUNT = 100000
+
+
+SUB_ROUTES_PER_GROUP = 100
+
+
+def build_route_tree():
+    groups = []
+    for group_index in range(ROUTE_COUNT // SUB_ROUTES_PER_GROUP):
+        leaf_routes = [
+            Route(None, 'route_{}_{}'.format(group_index, leaf_index))
+            for leaf_index in range(SUB_ROUTES_PER_GROUP)
+            ]
+        groups.append(Route(None, None, leaf_routes))
+
+    root_route = Route(None, None, groups)
+    return root_route
+
+
+def specialize_route_tree(route_tree):
+    specialized_groups = []
+    for group in route_tree.sub_routes:
+        specialized_leaf_routes = [
+            leaf_route.create_specialization()
+            for leaf_route in group.sub_routes
+            ]
+        specialized_group = group.create_specialization(
+            specialized_sub_routes=specialized_leaf_routes,
+            )
+        specialized_groups.append(specialized_group)
+
+    specialized_route_tree = route_tree.create_specialization(
+        specialized_sub_routes=specialized_groups,
+        )
+    return specialized_route_tree
+
+
+def measure_bytes_per_node(tree_builder, *args):
+    tracemalloc.start()
+    try:
+        route_tree = tree_builder(*args)
+        allocated_bytes = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    node_count = ROUTE_COUNT + ROUTE_COUNT // SUB_ROUTES_PER_GROUP + 1
+    bytes_per_node = float(allocated_bytes) / node_count
+    return route_tree, bytes_per_node
+
+
+def main():
+    route_tree, bytes_per_route = measure_bytes_per_node(build_route_tree)
+    print('Routes:          {:8.1f} bytes per node'.format(bytes_per_route))
+
+    bytes_per_specialization = \
+        measure_bytes_per_node(specialize_route_tree, route_tree)[1]
+    print(
+        'Specializations: {:8.1f} bytes per node'.format(
+            bytes_per_specialization,
+            ),
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Compare the size and load time of pickled route trees with the flat encoding
+used by routes against the default pickling of their slots.
+
+The default pickling only stands for a lower bound on the load time: it
+restores the fingerprints of the routes as they were, but they are derived
+from the hashes of strings, which differ from one process to another. The
+flat encoding therefore creates routes again when it is loaded, trading some
+load time for pickles several times smaller, correct fingerprints and no
+recursion limit on the depth of the trees.
+
+Run with ``python -m benchmarks.pickling`` (Python 3.8+).
+
+"""
+
+from __future__ import print_function
+
+import copyreg
+from io import BytesIO
+import pickle
+from timeit import default_timer
+
+from django_routing.routes import _BaseRoute
+from django_routing.routes import _BaseRouteCollection
+
+from benchmarks.shapes import ROUTE_TREE_BUILDERS_BY_SHAPE
+
+
+ROUTE_TREE_SIZE = 1000
+
+
+LOAD_REPETITIONS = 20
+
+
+class _DefaultRoutePickler(pickle.Pickler):
+
+    def reducer_override(self, obj):
+        if isinstance(obj, (_BaseRoute, _BaseRouteCollection)):
+            reduction = _reduce_slots(obj)
+        else:
+            reduction = NotImplemented
+        return reduction
+
+
+def _reduce_slots(obj):
+    # This is how objects with slots are pickled by default
+    slot_values_by_name = {}
+    for class_ in type(obj).__mro__:
+        for slot_name in getattr(class_, '__slots__', ()):
+            if hasattr(obj, slot_name):
+                slot_values_by_name[slot_name] = getattr(obj, slot_name)
+    return copyreg.__newobj__, (type(obj),), (None, slot_values_by_name)
+
+
+def dump_with_default_pickling(route):
+    pickle_buffer = BytesIO()
+    _DefaultRoutePickler(pickle_buffer, pickle.HIGHEST_PROTOCOL).dump(route)
+    return pickle_buffer.getvalue()
+
+
+def dump_with_flat_encoding(route):
+    return pickle.dumps(route, pickle.HIGHEST_PROTOCOL)
+
+
+def time_loading(pickled_route):
+    start_time = default_timer()
+    for _ in range(LOAD_REPETITIONS):
+        pickle.loads(pickled_route)
+    elapsed_time = (default_timer() - start_time) / LOAD_REPETITIONS
+    return elapsed_time
+
+
+def main():
+    dumpers = (
+        ('default', dump_with_default_pickling),
+        ('flat', dump_with_flat_encoding),
+        )
+    for shape in sorted(ROUTE_TREE_BUILDERS_BY_SHAPE):
+        route = ROUTE_TREE_BUILDERS_BY_SHAPE[shape](ROUTE_TREE_SIZE)
+        print(shape)
+        for dumper_name, dump_route in dumpers:
+            try:
+                pickled_route = dump_route(route)
+            except RecursionError:
+                print('  {:>7}: recursion limit exceeded'.format(dumper_name))
+                continue
+
+            load_time = time_loading(pickled_route)
+            print('  {:>7}: {:>8} bytes, loaded in {:.6f}s'.format(
+                dumper_name,
+                len(pickled_route),
+                load_time,
+                ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Time the resolution of paths by a route tree compiled into a path trie,
+compared with Django's URLResolver trying the equivalent ``urlpatterns`` one
+after another, and the reversal of route names into URLs by both.
+
+The comparison with Django is skipped if Django is not installed.
+
+Run with ``python -m benchmarks.resolution``.
+
+"""
+
+from __future__ import print_function
+
+import random
+from timeit import default_timer
+
+from django_routing.resolution import RouteResolver
+from django_routing.routes import Route
+from django_routing.routes import deferred_validation
+
+from benchmarks.construction import SUB_ROUTES_PER_GROUP
+
+
+ROUTE_COUNT = 5000
+
+
+RESOLUTION_COUNT = 10000
+
+
+REVERSAL_COUNT = 10000
+
+
+def _view(request, **kwargs):
+    pass  # pragma: no cover
+
+
+def iter_route_paths():
+    # Every route has a static path and a dynamic one
+    group_count = ROUTE_COUNT // SUB_ROUTES_PER_GROUP // 2
+    for group_index in range(group_count):
+        for leaf_index in range(SUB_ROUTES_PER_GROUP):
+            route_name = 'route_{}_{}'.format(group_index, leaf_index)
+            yield (
+                group_index,
+                route_name,
+                'route_{}'.format(leaf_index),
+                '<int:pk>',
+                )
+
+
+def build_route_tree():
+    groups_by_index = {}
+    for group_index, route_name, static_path_segment, dynamic_path_segment \
+        in iter_route_paths():
+        group_sub_routes = groups_by_index.setdefault(group_index, [])
+        group_sub_routes.append(Route(
+            _view,
+            route_name,
+            [Route(_view, route_name + '_detail', (), dynamic_path_segment)],
+            static_path_segment,
+            ))
+
+    with deferred_validation():
+        groups = [
+            Route(None, None, sub_routes, 'group_{}'.format(group_index))
+            for group_index, sub_routes in sorted(groups_by_index.items())
+            ]
+        root_route = Route(None, 'root', groups, '')
+    root_route.validate()
+    return root_route
+
+
+def build_django_resolver():
+    from django.conf import settings
+    from django.urls import URLResolver
+    from django.urls import path
+    from django.urls.resolvers import RegexPattern
+
+    if not settings.configured:
+        settings.configure()
+
+    urlpatterns = []
+    for group_index, route_name, static_path_segment, dynamic_path_segment \
+        in iter_route_paths():
+        group_path = 'group_{}/{}/'.format(group_index, static_path_segment)
+        urlpatterns.append(path(group_path, _view, name=route_name))
+        urlpatterns.append(path(
+            group_path + dynamic_path_segment + '/',
+            _view,
+            name=route_name + '_detail',
+            ))
+
+    django_resolver = URLResolver(RegexPattern(r'^/'), urlpatterns)
+    return django_resolver
+
+
+def get_paths():
+    route_paths = []
+    for group_index, _, static_path_segment, _ in iter_route_paths():
+        group_path = '/group_{}/{}/'.format(group_index, static_path_segment)
+        route_paths.append(group_path)
+        route_paths.append(group_path + '42/')
+
+    random_generator = random.Random(0)
+    paths = [
+        random_generator.choice(route_paths)
+        for _ in range(RESOLUTION_COUNT)
+        ]
+    return paths
+
+
+def get_reversals():
+    reversals = []
+    for _, route_name, _, _ in iter_route_paths():
+        reversals.append((route_name, {}))
+        reversals.append((route_name + '_detail', {'pk': 42}))
+
+    random_generator = random.Random(0)
+    reversals = [
+        random_generator.choice(reversals) for _ in range(REVERSAL_COUNT)
+        ]
+    return reversals
+
+
+def time_reversal(reverse, reversals):
+    start_time = default_timer()
+    for route_name, kwargs in reversals:
+        reverse(route_name, **kwargs)
+    elapsed_time = default_timer() - start_time
+    return elapsed_time
+
+
+def time_resolution(resolve, paths):
+    start_time = default_timer()
+    for path in paths:
+        resolve(path)
+    elapsed_time = default_timer() - start_time
+    return elapsed_time
+
+
+def main():
+    paths = get_paths()
+    reversals = get_reversals()
+
+    start_time = default_timer()
+    route_resolver = RouteResolver(build_route_tree())
+    compilation_time = default_timer() - start_time
+
+    print('{} routes, compiled in {:.1f}ms'.format(
+        ROUTE_COUNT,
+        compilation_time * 1e3,
+        ))
+
+    resolution_time = time_resolution(route_resolver.resolve, paths)
+    reversal_time = time_reversal(route_resolver.reverse, reversals)
+    print('{:>16}: {:.2f}us per path, {:.2f}us per URL'.format(
+        'Path trie',
+        resolution_time / RESOLUTION_COUNT * 1e6,
+        reversal_time / REVERSAL_COUNT * 1e6,
+        ))
+
+    try:
+        django_resolver = build_django_resolver()
+    except ImportError:
+        print('{:>16}: skipped, Django is not installed'.format('Django'))
+    else:
+        resolution_time = time_resolution(django_resolver.resolve, paths)
+        reversal_time = time_reversal(django_resolver.reverse, reversals)
+        print('{:>16}: {:.2f}us per path, {:.2f}us per URL'.format(
+            'Django',
+            resolution_time / RESOLUTION_COUNT * 1e6,
+            reversal_time / REVERSAL_COUNT * 1e6,
+            ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Compare the memory allocated to enumerate the names in route trees of
+different depths.
+
+Run with ``python -m benchmarks.route_names``. The recursive enumeration that
+``get_route_names()`` used to perform copies the names at every level of the
+tree, whereas ``iter_route_names()`` only keeps the pending routes in memory
+and ``get_route_names()`` just the resulting list.
+
+"""
+
+from __future__ import print_function
+
+import tracemalloc
+
+from django_routing.routes import Route
+from django_routing.routes import deferred_validation
+
+
+ROUTE_COUNT = 900
+
+
+DEPTHS = (1, 10, 100, 450)
+
+
+def build_route_tree(depth):
+    # Every level holds the same number of leaves, hanging from a chain of
+    # routes as deep as requested
+    leaves_per_level = ROUTE_COUNT // depth - 1
+    with deferred_validation():
+        route = None
+        for level in range(depth - 1, -1, -1):
+            sub_routes = [
+                Route(None, 'route_{}_{}'.format(level, leaf_index))
+                for leaf_index in range(leaves_per_level)
+                ]
+            if route is not None:
+                sub_routes.append(route)
+            route = Route(None, 'route_{}'.format(level), sub_routes)
+    route.validate()
+    return route
+
+
+def get_route_names_recursively(route):
+    route_names = []
+
+    if route.name:
+        route_names.append(route.name)
+
+    for sub_route in route.sub_routes:
+        sub_route_names = get_route_names_recursively(sub_route)
+        route_names.extend(sub_route_names)
+
+    return route_names
+
+
+def get_route_names(route):
+    return route.get_route_names()
+
+
+def count_route_names(route):
+    return sum(1 for _ in route.iter_route_names())
+
+
+def measure_peak_memory(function, route):
+    tracemalloc.start()
+    try:
+        function(route)
+        peak_allocated_bytes = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak_allocated_bytes
+
+
+def main():
+    enumerators = (
+        ('recursive', get_route_names_recursively),
+        ('get_route_names', get_route_names),
+        ('iter_route_names', count_route_names),
+        )
+    for depth in DEPTHS:
+        route = build_route_tree(depth)
+        print('Depth {}'.format(depth))
+        for enumerator_name, enumerate_route_names in enumerators:
+            peak_allocated_bytes = \
+                measure_peak_memory(enumerate_route_names, route)
+            print('  {:>16}: {:>8} bytes'.format(
+                enumerator_name,
+                peak_allocated_bytes,
+                ))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Command line runner for the benchmark suite.
+
+Run with ``python -m benchmarks --help`` for the available options. Timings
+can be saved as JSON with ``--output`` and compared against a previously
+saved file with ``--baseline``, in which case the exit status is non-zero
+if any benchmark got slower than the tolerance allows.
+
+With ``--count-calls``, each benchmark is also run once with the route
+instrumentation enabled and any increase in the number of calls to the
+instrumented functions is reported as a regression too, regardless of the
+tolerance.
+
+A reference baseline, recorded with ``--count-calls`` and the default size on
+CPython 3.11, is kept in ``benchmarks/baseline.json``. Its call counts hold on
+any machine, whereas its timings are only meaningful on comparable hardware,
+so the baseline should be recorded again before relying on them elsewhere::
+
+    python -m benchmarks --count-calls --baseline benchmarks/baseline.json
+
+"""
+
+from __future__ import print_function
+
+from argparse import ArgumentParser
+import json
+import platform
+import sys
+from timeit import Timer
+
+from benchmarks.shapes import ROUTE_TREE_BUILDERS_BY_SHAPE
+from benchmarks.suite import BENCHMARKS_BY_NAME
+from django_routing.routes import instrument_routes
+
+
+DEFAULT_SIZE = 5000
+
+
+DEFAULT_REPEAT = 5
+
+
+DEFAULT_TOLERANCE = 1.25
+
+
+_MINIMUM_TIMING_DURATION = 0.2
+
+
+def main(argv=None):
+    arguments = _parse_arguments(argv)
+
+    timings, call_counts = run_benchmarks(
+        arguments.shapes or sorted(ROUTE_TREE_BUILDERS_BY_SHAPE),
+        arguments.benchmarks or sorted(BENCHMARKS_BY_NAME),
+        arguments.size,
+        arguments.repeat,
+        arguments.count_calls,
+        )
+    results = {
+        'python_version': platform.python_version(),
+        'size': arguments.size,
+        'timings': timings,
+        'call_counts': call_counts,
+        }
+
+    if arguments.output:
+        with open(arguments.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as baseline_file:
+            baseline_results = json.load(baseline_file)
+        regressions = compare_timings(
+            timings,
+            baseline_results['timings'],
+            arguments.tolerance,
+            )
+        regressions.extend(compare_call_counts(
+            call_counts,
+            baseline_results.get('call_counts', {}),
+            ))
+        exit_status = 1 if regressions else 0
+    else:
+        exit_status = 0
+
+    return exit_status
+
+
+def _parse_arguments(argv):
+    parser = ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument(
+        '--shape',
+        action='append',
+        choices=sorted(ROUTE_TREE_BUILDERS_BY_SHAPE),
+        dest='shapes',
+        help='shape of the route trees (default: all)',
+        )
+    parser.add_argument(
+        '--benchmark',
+        action='append',
+        choices=sorted(BENCHMARKS_BY_NAME),
+        dest='benchmarks',
+        help='benchmark to run (default: all)',
+        )
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE)
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--output', help='file to save the timings to')
+    parser.add_argument('--baseline', help='timings file to compare with')
+    parser.add_argument(
+        '--count-calls',
+        action='store_true',
+        help='count the calls to the instrumented routing functions',
+        )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=DEFAULT_TOLERANCE,
+        help='slowdown ratio above which a benchmark has regressed',
+        )
+    arguments = parser.parse_args(argv)
+    return arguments
+
+
+def run_benchmarks(shapes, benchmark_names, size, repeat, count_calls):
+    timings = {}
+    call_counts = {}
+    for shape in shapes:
+        build_route_tree = ROUTE_TREE_BUILDERS_BY_SHAPE[shape]
+        for benchmark_name in benchmark_names:
+            benchmark = BENCHMARKS_BY_NAME[benchmark_name]
+            benchmarked_function = benchmark(build_route_tree, size)
+
+            timing_name = '{}.{}'.format(shape, benchmark_name)
+            timing = time_function(benchmarked_function, repeat)
+            timings[timing_name] = timing
+
+            print('{:<45} {:>14.9f}s'.format(timing_name, timing))
+            sys.stdout.flush()
+
+            if count_calls:
+                with instrument_routes() as report:
+                    benchmarked_function()
+                call_counts[timing_name] = dict(report.call_counts)
+
+    return timings, call_counts
+
+
+def time_function(function, repeat):
+    timer = Timer(function)
+
+    number = 1
+    while timer.timeit(number) < _MINIMUM_TIMING_DURATION:
+        number *= 10
+
+    timing = min(timer.repeat(repeat, number)) / number
+    return timing
+
+
+def compare_timings(timings, baseline_timings, tolerance):
+    print()
+    print('{:<45} {:>8}'.format('Comparison with baseline', 'ratio'))
+
+    regressions = []
+    for timing_name in sorted(timings):
+        if timing_name not in baseline_timings:
+            continue
+
+        ratio = timings[timing_name] / baseline_timings[timing_name]
+        if tolerance < ratio:
+            regressions.append(timing_name)
+            status = 'REGRESSION'
+        else:
+            status = ''
+        comparison = '{:<45} {:>8.2f} {}'.format(timing_name, ratio, status)
+        print(comparison.rstrip())
+
+    return regressions
+
+
+def compare_call_counts(call_counts, baseline_call_counts):
+    regressions = []
+    for timing_name in sorted(call_counts):
+        function_call_counts = call_counts[timing_name]
+        baseline_function_call_counts = \
+            baseline_call_counts.get(timing_name, {})
+        for function_name in sorted(function_call_counts):
+            call_count = function_call_counts[function_name]
+            baseline_call_count = \
+                baseline_function_call_counts.get(function_name, call_count)
+            if baseline_call_count < call_count:
+                regressions.append(timing_name)
+                print('{} calls {} {} times instead of {} (REGRESSION)'.format(
+                    timing_name,
+                    function_name,
+                    call_count,
+                    baseline_call_count,
+                    ))
+
+    return regressions
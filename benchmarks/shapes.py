@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Synthetic route trees of different shapes, all built from roughly ``size``
+routes.
+
+"""
+
+from django_routing.routes import Route
+
+
+def _view():
+    pass  # pragma: no cover
+
+
+def build_wide_route_tree(size):
+    leaf_routes = [
+        Route(_view, 'route_{}'.format(leaf_index))
+        for leaf_index in range(size - 1)
+        ]
+    root_route = Route(None, 'root', leaf_routes)
+    return root_route
+
+
+def build_deep_route_tree(size):
+    # Deep trees are limited by the recursion in the equality checks
+    depth = min(size, 100)
+    route = Route(_view, 'route_{}'.format(depth - 1))
+    for route_index in range(depth - 2, -1, -1):
+        route = Route(_view, 'route_{}'.format(route_index), [route])
+    return route
+
+
+def build_named_leaves_route_tree(size, sub_routes_per_group=100):
+    group_count = max(size // sub_routes_per_group, 1)
+    groups = []
+    for group_index in range(group_count):
+        leaf_routes = [
+            Route(_view, 'route_{}_{}'.format(group_index, leaf_index))
+            for leaf_index in range(sub_routes_per_group - 1)
+            ]
+        groups.append(Route(None, None, leaf_routes))
+
+    root_route = Route(None, 'root', groups)
+    return root_route
+
+
+def build_specialization_chain(size, chain_length=50):
+    sub_routes_per_specialization = max(size // chain_length, 1)
+    route = Route(_view, 'root')
+    for specialization_index in range(chain_length):
+        additional_sub_routes = [
+            Route(_view, 'route_{}_{}'.format(specialization_index, index))
+            for index in range(sub_routes_per_specialization)
+            ]
+        route = route.create_specialization(
+            additional_sub_routes=additional_sub_routes,
+            )
+    return route
+
+
+def build_sibling_specializations(size):
+    generalized_route = build_wide_route_tree(size)
+    specialized_sub_routes = [
+        sub_route.create_specialization(object())
+        for sub_route in generalized_route.sub_routes
+        ]
+    specialized_route = generalized_route.create_specialization(
+        specialized_sub_routes=specialized_sub_routes,
+        )
+    return specialized_route
+
+
+ROUTE_TREE_BUILDERS_BY_SHAPE = {
+    'wide': build_wide_route_tree,
+    'deep': build_deep_route_tree,
+    'named_leaves': build_named_leaves_route_tree,
+    'specialization_chain': build_specialization_chain,
+    'sibling_specializations': build_sibling_specializations,
+    }
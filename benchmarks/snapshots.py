@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Compare building a route tree with loading it from a snapshot.
+
+Run with ``python -m benchmarks.snapshots``. Loading a snapshot skips the
+construction and validation of the tree, and only the parts of the tree that
+are used afterwards are read from disk.
+
+"""
+
+from __future__ import print_function
+
+import os
+from shutil import rmtree
+from tempfile import mkdtemp
+from timeit import default_timer
+
+from django_routing.snapshots import load_route_tree_snapshot
+from django_routing.snapshots import save_route_tree_snapshot
+
+from benchmarks.construction import ROUTE_COUNTS
+from benchmarks.construction import \
+    build_wide_route_tree_with_deferred_validation
+
+
+_SOURCE_HASH = 'benchmark'
+
+
+def time_function(function, *args):
+    start_time = default_timer()
+    result = function(*args)
+    elapsed_time = default_timer() - start_time
+    return elapsed_time, result
+
+
+def build_and_compile_route_tree(route_count):
+    root_route = build_wide_route_tree_with_deferred_validation(route_count)
+    return root_route.compile()
+
+
+def main():
+    snapshot_directory_path = mkdtemp()
+    try:
+        for route_count in ROUTE_COUNTS:
+            snapshot_path = os.path.join(
+                snapshot_directory_path,
+                'routes_{}.snapshot'.format(route_count),
+                )
+
+            build_time, route_tree = \
+                time_function(build_and_compile_route_tree, route_count)
+            save_route_tree_snapshot(route_tree, snapshot_path, _SOURCE_HASH)
+            load_time, loaded_route_tree = time_function(
+                load_route_tree_snapshot,
+                snapshot_path,
+                _SOURCE_HASH,
+                )
+            lookup_time = time_function(
+                loaded_route_tree.get_route_by_name,
+                'route_0_0',
+                )[0]
+
+            print(
+                '{:>7} routes: build {:.4f}s, load {:.4f}s, first lookup '
+                '{:.4f}s ({} bytes)'.format(
+                    route_count,
+                    build_time,
+                    load_time,
+                    lookup_time,
+                    os.path.getsize(snapshot_path),
+                    ),
+                )
+    finally:
+        rmtree(snapshot_directory_path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Benchmarks of the main operations on route trees.
+
+Each benchmark takes the function to build a route tree of a given shape
+and the size of the tree, prepares whatever it needs and returns the
+callable to be timed. Methods are looked up when the callable is called,
+so that they can be instrumented.
+
+"""
+
+from functools import partial
+from operator import eq
+
+from django_routing.routes import NonExistingRouteError
+from django_routing.routes import Route
+
+
+NON_EXISTING_ROUTE_NAME = 'non_existing_route'
+
+
+def benchmark_construction(build_route_tree, size):
+    return partial(build_route_tree, size)
+
+
+def benchmark_specialization(build_route_tree, size):
+    route = build_route_tree(size)
+    # Specializations can only replace sub-routes which are not specialized
+    specialized_sub_routes = [
+        sub_route.create_specialization()
+        for sub_route in route.sub_routes
+        if isinstance(sub_route, Route)
+        ]
+    return partial(
+        route.create_specialization,
+        specialized_sub_routes=specialized_sub_routes,
+        )
+
+
+def benchmark_lookup_hit(build_route_tree, size):
+    route = build_route_tree(size)
+    route_name = route.get_route_names()[-1]
+    return partial(_look_up_route, route, route_name)
+
+
+def _look_up_route(route, route_name):
+    return route.get_route_by_name(route_name)
+
+
+def benchmark_lookup_miss(build_route_tree, size):
+    route = build_route_tree(size)
+    return partial(_look_up_non_existing_route, route)
+
+
+def _look_up_non_existing_route(route):
+    try:
+        route.get_route_by_name(NON_EXISTING_ROUTE_NAME)
+    except NonExistingRouteError:
+        pass
+
+
+def benchmark_route_names(build_route_tree, size):
+    route = build_route_tree(size)
+    return partial(_get_route_names, route)
+
+
+def _get_route_names(route):
+    return route.get_route_names()
+
+
+def benchmark_equality(build_route_tree, size):
+    route_1 = build_route_tree(size)
+    route_2 = build_route_tree(size)
+    return partial(eq, route_1, route_2)
+
+
+def benchmark_length(build_route_tree, size):
+    route = build_route_tree(size)
+    return partial(len, route.sub_routes)
+
+
+BENCHMARKS_BY_NAME = {
+    'construction': benchmark_construction,
+    'specialization': benchmark_specialization,
+    'lookup_hit': benchmark_lookup_hit,
+    'lookup_miss': benchmark_lookup_miss,
+    'route_names': benchmark_route_names,
+    'equality': benchmark_equality,
+    'length': benchmark_length,
+    }
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""
+Time the derivation of route tree variants with a different view for one
+route, or with one route replaced.
+
+Run with ``python -m benchmarks.updates``. Rebuilding the tree costs time
+proportional to its size, whereas ``with_view()`` only copies the ancestors of
+the updated route. The last route in pre-order of wide and balanced trees is
+updated, and each variant is derived from the previous one, so neither a walk
+of the tree to find the route nor the recomputation of its names can go
+unnoticed.
+
+"""
+
+from __future__ import print_function
+
+from timeit import default_timer
+
+from benchmarks.construction import ROUTE_COUNTS
+from benchmarks.construction import build_balanced_route_tree
+from benchmarks.construction import build_wide_route_tree
+from django_routing.routes import Route
+
+
+VARIANT_COUNT = 10
+
+
+def _view():
+    pass  # pragma: no cover
+
+
+def time_function(function, *args):
+    start_time = default_timer()
+    function(*args)
+    elapsed_time = default_timer() - start_time
+    return elapsed_time
+
+
+def time_updates(route, route_name, update_route):
+    # The index of the original tree is built on the first update and then
+    # carried over to every variant
+    route = update_route(route, route_name)
+    start_time = default_timer()
+    for _ in range(VARIANT_COUNT):
+        route = update_route(route, route_name)
+    elapsed_time = default_timer() - start_time
+    return elapsed_time / VARIANT_COUNT
+
+
+def set_view(route, route_name):
+    return route.with_view(route_name, _view)
+
+
+def replace_route(route, route_name):
+    return route.with_route_replaced(route_name, Route(_view, route_name))
+
+
+def get_last_route_name(route):
+    route_name = None
+    for current_route, _, _ in route.walk():
+        route_name = current_route.name or route_name
+    return route_name
+
+
+def main():
+    route_tree_builders = (
+        ('Wide tree', build_wide_route_tree),
+        ('Balanced tree', build_balanced_route_tree),
+        )
+    for title, build_route_tree in route_tree_builders:
+        print(title)
+        for route_count in ROUTE_COUNTS:
+            rebuild_time = time_function(build_route_tree, route_count)
+
+            route = build_route_tree(route_count)
+            route_name = get_last_route_name(route)
+            print(
+                '{:>7} routes: rebuild {:.6f}s, with_view {:.6f}s, '
+                'with_route_replaced {:.6f}s'.format(
+                    route_count,
+                    rebuild_time,
+                    time_updates(route, route_name, set_view),
+                    time_updates(route, route_name, replace_route),
+                    ),
+                )
+
+
+if __name__ == '__main__':
+    main()
@@ -15,6 +15,8 @@
 #
 ##############################################################################
 
+from django_routing.exceptions import NonExistingRouteError
+
 
 def are_objects_inequivalent(object_1, object_2):
     are_objects_equivalent = object_1.__eq__(object_2)
@@ -23,3 +25,72 @@ def are_objects_inequivalent(object_1, object_2):
     else:
         are_objects_inequivalent_ = not are_objects_equivalent
     return are_objects_inequivalent_
+
+
+def get_routes_by_names(route, route_names, find_route):
+    # Each name is probed once in the name index of the route, and all the
+    # missing names are reported together, in the order they were given
+    routes_by_name = {}
+    missing_route_names = []
+    missing_route_name_set = set()
+    for route_name in route_names:
+        if route_name in routes_by_name or \
+            route_name in missing_route_name_set:
+            continue
+
+        matching_route = find_route(route_name)
+        if matching_route is None:
+            missing_route_names.append(route_name)
+            missing_route_name_set.add(route_name)
+        else:
+            routes_by_name[route_name] = matching_route
+
+    if missing_route_names:
+        exc_message = 'self {!r} does not contain ones named {}'.format(
+            route.name,
+            ', '.join(repr(route_name) for route_name in missing_route_names),
+            )
+        raise NonExistingRouteError(exc_message)
+
+    return routes_by_name
+
+
+def walk_route_tree(route, order):
+    # Any route-like object whose sub-routes can be reversed can be walked
+    if order == 'pre':
+        routes = _walk_route_tree_in_pre_order(route)
+    elif order == 'post':
+        routes = _walk_route_tree_in_post_order(route)
+    else:
+        raise ValueError('Unknown traversal order {!r}'.format(order))
+    return routes
+
+
+def _walk_route_tree_in_pre_order(route):
+    pending_routes = [(route, 0, None)]
+    while pending_routes:
+        current_route, depth, parent_route = pending_routes.pop()
+        yield current_route, depth, parent_route
+
+        sub_route_depth = depth + 1
+        pending_routes.extend(
+            (sub_route, sub_route_depth, current_route)
+            for sub_route in reversed(current_route.sub_routes)
+            )
+
+
+def _walk_route_tree_in_post_order(route):
+    pending_routes = [(route, 0, None, False)]
+    while pending_routes:
+        current_route, depth, parent_route, are_sub_routes_walked = \
+            pending_routes.pop()
+        if are_sub_routes_walked:
+            yield current_route, depth, parent_route
+            continue
+
+        pending_routes.append((current_route, depth, parent_route, True))
+        sub_route_depth = depth + 1
+        pending_routes.extend(
+            (sub_route, sub_route_depth, current_route, False)
+            for sub_route in reversed(current_route.sub_routes)
+            )
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from django_routing.exceptions import DuplicatedRouteError
+from django_routing.exceptions import InvalidRouteSpecificationError
+from django_routing.exceptions import NonExistingRouteError
+from django_routing.routes import Route
+from django_routing.routes import deferred_validation
+
+
+_ROUTE_SPECIFICATION_KEYS = frozenset(
+    ('view', 'name', 'sub_routes', 'path_segment'),
+    )
+
+
+class RouteTreeBuilder(object):
+
+    def __init__(self, route_specification):
+        super(RouteTreeBuilder, self).__init__()
+
+        self._route_specification = route_specification
+
+    @classmethod
+    def from_rows(cls, rows):
+        route_specifications_by_name = {}
+        root_route_specifications = []
+        route_specifications_by_parent_name = []
+        route_specifications = []
+        for parent_name, route_name, view in rows:
+            route_specification = (view, route_name, [])
+            route_specifications.append(route_specification)
+            if route_name:
+                if route_name in route_specifications_by_name:
+                    raise DuplicatedRouteError(route_name)
+                route_specifications_by_name[route_name] = route_specification
+
+            if parent_name is None:
+                root_route_specifications.append(route_specification)
+            else:
+                route_specifications_by_parent_name.append(
+                    (parent_name, route_specification),
+                    )
+
+        for parent_name, route_specification in \
+            route_specifications_by_parent_name:
+            if parent_name not in route_specifications_by_name:
+                exc_message = 'Parent route {!r} does not exist'.format(
+                    parent_name,
+                    )
+                raise NonExistingRouteError(exc_message)
+            parent_route_specification = \
+                route_specifications_by_name[parent_name]
+            parent_route_specification[2].append(route_specification)
+
+        if len(root_route_specifications) != 1:
+            exc_message = 'Expected one root route, found {}'.format(
+                len(root_route_specifications),
+                )
+            raise InvalidRouteSpecificationError(exc_message)
+
+        # Every route has one parent, so those whose ancestors form a cycle
+        # are the only ones that cannot be reached from the root
+        root_route_specification = root_route_specifications[0]
+        attached_route_specifications = \
+            _get_route_specifications_in_tree(root_route_specification)
+        if len(attached_route_specifications) != len(route_specifications):
+            attached_route_specification_ids = \
+                set(map(id, attached_route_specifications))
+            detached_route_names = [
+                route_specification[1]
+                for route_specification in route_specifications
+                if id(route_specification) not in
+                attached_route_specification_ids
+                ]
+            exc_message = 'Routes {!r} are not attached to the root'.format(
+                detached_route_names,
+                )
+            raise InvalidRouteSpecificationError(exc_message)
+
+        route_tree_builder = cls(root_route_specification)
+        return route_tree_builder
+
+    def build(self):
+        with deferred_validation():
+            route = _build_route_tree(self._route_specification)
+        return route
+
+    def compile(self):
+        route = self.build()
+        compiled_route_tree = route.compile()
+        return compiled_route_tree
+
+
+def _build_route_tree(route_specification):
+    # The specifications are flattened in pre-order so that the routes can
+    # then be built bottom-up without recursion. Every name is visited once
+    # whilst flattening, so the uniqueness of the names is checked there
+    # instead of traversing the tree again to validate it.
+    route_names = set()
+    flattened_route_specifications = []
+    pending_route_specifications = [route_specification]
+    while pending_route_specifications:
+        current_route_specification = pending_route_specifications.pop()
+        view, route_name, sub_route_specifications, path_segment = \
+            _parse_route_specification(current_route_specification)
+
+        if route_name:
+            if route_name in route_names:
+                raise DuplicatedRouteError(route_name)
+            route_names.add(route_name)
+
+        flattened_route_specifications.append((
+            view,
+            route_name,
+            len(sub_route_specifications),
+            path_segment,
+            ))
+        pending_route_specifications.extend(
+            reversed(sub_route_specifications),
+            )
+
+    built_routes = []
+    for view, route_name, sub_route_count, path_segment in \
+        reversed(flattened_route_specifications):
+        if sub_route_count:
+            sub_routes = built_routes[-sub_route_count:]
+            del built_routes[-sub_route_count:]
+            sub_routes.reverse()
+        else:
+            sub_routes = ()
+        route = Route(view, route_name, sub_routes, path_segment)
+        if 1 < sub_route_count:
+            # Unnamed siblings must still differ from one another
+            route.sub_routes._validate_routes()  #pylint:disable=W0212
+        built_routes.append(route)
+
+    # The root keeps the names, as it would have had they been validated
+    # when the routes were created
+    root_route = built_routes.pop()
+    root_route._route_names = route_names  #pylint:disable=W0212
+    return root_route
+
+
+def _get_route_specifications_in_tree(route_specification):
+    # The specifications built from rows all keep their sub-routes in a list,
+    # so they are gathered breadth-first without parsing them
+    route_specifications = [route_specification]
+    for current_route_specification in route_specifications:
+        route_specifications.extend(current_route_specification[2])
+    return route_specifications
+
+
+def _parse_route_specification(route_specification):
+    if isinstance(route_specification, dict):
+        if not _ROUTE_SPECIFICATION_KEYS.issuperset(route_specification):
+            unknown_keys = \
+                sorted(set(route_specification) - _ROUTE_SPECIFICATION_KEYS)
+            exc_message = 'Unknown keys {!r} in route specification'.format(
+                unknown_keys,
+                )
+            raise InvalidRouteSpecificationError(exc_message)
+
+        view = route_specification.get('view')
+        route_name = route_specification.get('name')
+        sub_route_specifications = route_specification.get('sub_routes', ())
+        path_segment = route_specification.get('path_segment')
+    elif isinstance(route_specification, (list, tuple)) and \
+        len(route_specification) in (2, 3, 4):
+        view = route_specification[0]
+        route_name = route_specification[1]
+        if 3 <= len(route_specification):
+            sub_route_specifications = route_specification[2]
+        else:
+            sub_route_specifications = ()
+        if len(route_specification) == 4:
+            path_segment = route_specification[3]
+        else:
+            path_segment = None
+    else:
+        exc_message = 'Invalid route specification {!r}'.format(
+            route_specification,
+            )
+        raise InvalidRouteSpecificationError(exc_message)
+
+    return view, route_name, tuple(sub_route_specifications), path_segment
@@ -0,0 +1,379 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from array import array
+from bisect import bisect_left
+
+from django_routing._utils import are_objects_inequivalent
+from django_routing._utils import get_routes_by_names
+from django_routing._utils import walk_route_tree
+from django_routing.exceptions import NonExistingRouteError
+
+
+_NO_NODE_INDEX = -1
+
+
+_NODE_INDEX_ARRAY_TYPECODE = 'i'
+
+
+class CompiledRouteTree(object):
+
+    __slots__ = (
+        '_parent_indices',
+        '_first_child_indices',
+        '_next_sibling_indices',
+        '_subtree_end_indices',
+        '_name_indices',
+        '_view_indices',
+        '_path_segment_indices',
+        '_names',
+        '_views',
+        '_path_segments',
+        '_node_indices_by_name',
+        '_duplicated_node_indices_by_name',
+        )
+
+    def __init__(
+        self,
+        parent_indices,
+        first_child_indices,
+        next_sibling_indices,
+        subtree_end_indices,
+        name_indices,
+        view_indices,
+        path_segment_indices,
+        names,
+        views,
+        path_segments,
+        ):
+        super(CompiledRouteTree, self).__init__()
+
+        self._parent_indices = parent_indices
+        self._first_child_indices = first_child_indices
+        self._next_sibling_indices = next_sibling_indices
+        self._subtree_end_indices = subtree_end_indices
+        self._name_indices = name_indices
+        self._view_indices = view_indices
+        self._path_segment_indices = path_segment_indices
+        self._names = names
+        self._views = views
+        self._path_segments = path_segments
+
+        # The name index is built lazily so that trees loaded from snapshots
+        # do not have to visit every node up front
+        self._node_indices_by_name = None
+        self._duplicated_node_indices_by_name = None
+
+    def __repr__(self):
+        repr_ = '<{} with {} routes>'.format(
+            self.__class__.__name__,
+            len(self),
+            )
+        return repr_
+
+    def __len__(self):
+        return len(self._parent_indices)
+
+    def __iter__(self):
+        for node_index in range(len(self)):
+            yield CompiledRoute(self, node_index)
+
+    @property
+    def root(self):
+        return CompiledRoute(self, 0)
+
+    def get_route_by_name(self, route_name):
+        return self.root.get_route_by_name(route_name)
+
+    def find_route(self, route_name, default=None):
+        return self._find_route(0, route_name, default)
+
+    def get_routes_by_names(self, route_names):
+        return self.root.get_routes_by_names(route_names)
+
+    def get_route_names(self):
+        return self.root.get_route_names()
+
+    def iter_route_names(self):
+        return self.root.iter_route_names()
+
+    def walk(self, order='pre'):
+        return self.root.walk(order)
+
+    def _get_node_name(self, node_index):
+        name_index = self._name_indices[node_index]
+        return self._names[name_index]
+
+    def _get_node_view(self, node_index):
+        view_index = self._view_indices[node_index]
+        return self._views[view_index]
+
+    def _get_node_path_segment(self, node_index):
+        path_segment_index = self._path_segment_indices[node_index]
+        return self._path_segments[path_segment_index]
+
+    def _get_sub_node_indices(self, node_index):
+        sub_node_index = self._first_child_indices[node_index]
+        while sub_node_index != _NO_NODE_INDEX:
+            yield sub_node_index
+            sub_node_index = self._next_sibling_indices[sub_node_index]
+
+    def _find_route(self, node_index, route_name, default):
+        matching_node_index = \
+            self._find_node_index_by_name(node_index, route_name)
+        if matching_node_index == _NO_NODE_INDEX:
+            matching_route = default
+        else:
+            matching_route = CompiledRoute(self, matching_node_index)
+        return matching_route
+
+    def _find_node_index_by_name(self, node_index, route_name):
+        node_indices_by_name, duplicated_node_indices_by_name = \
+            self._get_node_indices_by_name()
+        if route_name in duplicated_node_indices_by_name:
+            candidate_node_indices = \
+                duplicated_node_indices_by_name[route_name]
+        elif route_name in node_indices_by_name:
+            candidate_node_indices = (node_indices_by_name[route_name],)
+        else:
+            candidate_node_indices = ()
+
+        # The first node with the name within the subtree wins, as it would
+        # in the original route tree
+        subtree_end_index = self._subtree_end_indices[node_index]
+        position = bisect_left(candidate_node_indices, node_index)
+        if position < len(candidate_node_indices) and \
+            candidate_node_indices[position] < subtree_end_index:
+            matching_node_index = candidate_node_indices[position]
+        else:
+            matching_node_index = _NO_NODE_INDEX
+
+        return matching_node_index
+
+    def _get_node_indices_by_name(self):
+        if self._node_indices_by_name is None:
+            self._node_indices_by_name, \
+                self._duplicated_node_indices_by_name = \
+                _index_node_indices_by_name(self._name_indices, self._names)
+        return \
+            self._node_indices_by_name, self._duplicated_node_indices_by_name
+
+    def _iter_node_route_names(self, node_index):
+        subtree_end_index = self._subtree_end_indices[node_index]
+        for subtree_node_index in range(node_index, subtree_end_index):
+            route_name = self._get_node_name(subtree_node_index)
+            if route_name:
+                yield route_name
+
+
+class CompiledRoute(object):
+
+    __slots__ = ('_tree', '_node_index')
+
+    def __init__(self, tree, node_index):
+        super(CompiledRoute, self).__init__()
+
+        self._tree = tree
+        self._node_index = node_index
+
+    def __repr__(self):
+        repr_template = '<{class_name} view={view!r} name={name!r} with ' \
+            '{sub_route_count} sub-routes>'
+        repr_ = repr_template.format(
+            class_name=self.__class__.__name__,
+            name=self.name,
+            view=self.view,
+            sub_route_count=len(self.sub_routes),
+            )
+        return repr_
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            are_routes_equivalent = self._tree is other._tree and \
+                self._node_index == other._node_index
+        else:
+            are_routes_equivalent = NotImplemented
+        return are_routes_equivalent
+
+    __ne__ = are_objects_inequivalent
+
+    def __hash__(self):
+        return hash((id(self._tree), self._node_index))
+
+    @property
+    def name(self):
+        return self._tree._get_node_name(self._node_index)
+
+    @property
+    def view(self):
+        return self._tree._get_node_view(self._node_index)
+
+    @property
+    def path_segment(self):
+        return self._tree._get_node_path_segment(self._node_index)
+
+    @property
+    def sub_routes(self):
+        sub_node_indices = self._tree._get_sub_node_indices(self._node_index)
+        sub_routes = tuple(
+            CompiledRoute(self._tree, sub_node_index)
+            for sub_node_index in sub_node_indices
+            )
+        return sub_routes
+
+    @property
+    def parent(self):
+        parent_index = self._tree._parent_indices[self._node_index]
+        if parent_index == _NO_NODE_INDEX:
+            parent = None
+        else:
+            parent = CompiledRoute(self._tree, parent_index)
+        return parent
+
+    def get_route_by_name(self, route_name):
+        matching_node_index = \
+            self._tree._find_node_index_by_name(self._node_index, route_name)
+        if matching_node_index == _NO_NODE_INDEX:
+            exc_message = 'self {!r} does not contain one named {!r}'.format(
+                self.name,
+                route_name,
+                )
+            raise NonExistingRouteError(exc_message)
+
+        return CompiledRoute(self._tree, matching_node_index)
+
+    def find_route(self, route_name, default=None):
+        return self._tree._find_route(self._node_index, route_name, default)
+
+    def get_routes_by_names(self, route_names):
+        return get_routes_by_names(self, route_names, self.find_route)
+
+    def get_route_names(self):
+        return list(self.iter_route_names())
+
+    def iter_route_names(self):
+        return self._tree._iter_node_route_names(self._node_index)
+
+    def walk(self, order='pre'):
+        return walk_route_tree(self, order)
+
+
+def compile_route_tree(route):
+    parent_indices = array(_NODE_INDEX_ARRAY_TYPECODE)
+    first_child_indices = array(_NODE_INDEX_ARRAY_TYPECODE)
+    next_sibling_indices = array(_NODE_INDEX_ARRAY_TYPECODE)
+    name_indices = array(_NODE_INDEX_ARRAY_TYPECODE)
+    view_indices = array(_NODE_INDEX_ARRAY_TYPECODE)
+    path_segment_indices = array(_NODE_INDEX_ARRAY_TYPECODE)
+    names = []
+    name_table_indices = {}
+    views = []
+    # Views need not be hashable, so they are told apart by identity
+    view_table_indices_by_id = {}
+    path_segments = []
+    path_segment_table_indices = {}
+    last_child_indices = {}
+
+    # Nodes are stored in pre-order, so every subtree is a contiguous range
+    pending_routes = [(route, _NO_NODE_INDEX)]
+    while pending_routes:
+        current_route, parent_index = pending_routes.pop()
+        node_index = len(parent_indices)
+
+        parent_indices.append(parent_index)
+        first_child_indices.append(_NO_NODE_INDEX)
+        next_sibling_indices.append(_NO_NODE_INDEX)
+        if parent_index != _NO_NODE_INDEX:
+            previous_sibling_index = last_child_indices.get(parent_index)
+            if previous_sibling_index is None:
+                first_child_indices[parent_index] = node_index
+            else:
+                next_sibling_indices[previous_sibling_index] = node_index
+            last_child_indices[parent_index] = node_index
+
+        route_name = current_route.name
+        if route_name not in name_table_indices:
+            name_table_indices[route_name] = len(names)
+            names.append(route_name)
+        name_indices.append(name_table_indices[route_name])
+
+        route_view = current_route.view
+        if id(route_view) not in view_table_indices_by_id:
+            view_table_indices_by_id[id(route_view)] = len(views)
+            views.append(route_view)
+        view_indices.append(view_table_indices_by_id[id(route_view)])
+
+        path_segment = current_route.path_segment
+        if path_segment not in path_segment_table_indices:
+            path_segment_table_indices[path_segment] = len(path_segments)
+            path_segments.append(path_segment)
+        path_segment_indices.append(path_segment_table_indices[path_segment])
+
+        sub_routes = tuple(current_route.sub_routes)
+        pending_routes.extend(
+            (sub_route, node_index) for sub_route in reversed(sub_routes)
+            )
+
+    subtree_end_indices = _get_subtree_end_indices(parent_indices)
+
+    compiled_route_tree = CompiledRouteTree(
+        parent_indices,
+        first_child_indices,
+        next_sibling_indices,
+        subtree_end_indices,
+        name_indices,
+        view_indices,
+        path_segment_indices,
+        tuple(names),
+        tuple(views),
+        tuple(path_segments),
+        )
+    return compiled_route_tree
+
+
+def _get_subtree_end_indices(parent_indices):
+    node_count = len(parent_indices)
+    subtree_sizes = array(_NODE_INDEX_ARRAY_TYPECODE, [1]) * node_count
+    for node_index in range(node_count - 1, 0, -1):
+        parent_index = parent_indices[node_index]
+        subtree_sizes[parent_index] += subtree_sizes[node_index]
+
+    subtree_end_indices = array(
+        _NODE_INDEX_ARRAY_TYPECODE,
+        (
+            node_index + subtree_size
+            for node_index, subtree_size in enumerate(subtree_sizes)
+            ),
+        )
+    return subtree_end_indices
+
+
+def _index_node_indices_by_name(name_indices, names):
+    node_indices_by_name = {}
+    duplicated_node_indices_by_name = {}
+    for node_index, name_index in enumerate(name_indices):
+        route_name = names[name_index]
+        if route_name in node_indices_by_name:
+            duplicated_node_indices = \
+                duplicated_node_indices_by_name.setdefault(
+                    route_name,
+                    [node_indices_by_name[route_name]],
+                    )
+            duplicated_node_indices.append(node_index)
+        else:
+            node_indices_by_name[route_name] = node_index
+    return node_indices_by_name, duplicated_node_indices_by_name
@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from itertools import chain
+
+
+class RouteTreeDiff(object):
+
+    def __init__(
+        self,
+        added_route_names,
+        removed_route_names,
+        view_changed_route_names,
+        moved_route_names,
+        ):
+        super(RouteTreeDiff, self).__init__()
+
+        self.added_route_names = added_route_names
+        self.removed_route_names = removed_route_names
+        self.view_changed_route_names = view_changed_route_names
+        self.moved_route_names = moved_route_names
+
+    def __repr__(self):
+        repr_template = '<{class_name} added={added!r} removed={removed!r} ' \
+            'view_changed={view_changed!r} moved={moved!r}>'
+        repr_ = repr_template.format(
+            class_name=self.__class__.__name__,
+            added=sorted(self.added_route_names),
+            removed=sorted(self.removed_route_names),
+            view_changed=sorted(self.view_changed_route_names),
+            moved=sorted(self.moved_route_names),
+            )
+        return repr_
+
+    def __bool__(self):
+        has_changes = any((
+            self.added_route_names,
+            self.removed_route_names,
+            self.view_changed_route_names,
+            self.moved_route_names,
+            ))
+        return has_changes
+
+    __nonzero__ = __bool__
+
+
+def diff(old_route, new_route):
+    # The routes in both trees are paired by name (or by position if they
+    # are unnamed) and the pairs of subtrees with the same fingerprint are
+    # skipped, unless they have unhashable views, so only the routes in the
+    # subtrees that differ are indexed.
+    # A route is identified by its name and located by the names of its
+    # ancestors.
+    old_route_locations_by_name = {}
+    new_route_locations_by_name = {}
+    pending_route_pairs = [(old_route, new_route, (), ())]
+    while pending_route_pairs:
+        old_route, new_route, old_ancestor_names, new_ancestor_names = \
+            pending_route_pairs.pop()
+
+        if new_route is None:
+            _index_route_locations(
+                old_route,
+                old_ancestor_names,
+                old_route_locations_by_name,
+                )
+            continue
+
+        if old_route is None:
+            _index_route_locations(
+                new_route,
+                new_ancestor_names,
+                new_route_locations_by_name,
+                )
+            continue
+
+        are_routes_equivalent = \
+            _are_routes_equivalent_by_fingerprint(old_route, new_route)
+        if are_routes_equivalent and old_ancestor_names == new_ancestor_names:
+            continue
+
+        _add_route_location(
+            old_route,
+            old_ancestor_names,
+            old_route_locations_by_name,
+            )
+        _add_route_location(
+            new_route,
+            new_ancestor_names,
+            new_route_locations_by_name,
+            )
+
+        old_sub_route_ancestor_names = \
+            _get_sub_route_ancestor_names(old_route, old_ancestor_names)
+        new_sub_route_ancestor_names = \
+            _get_sub_route_ancestor_names(new_route, new_ancestor_names)
+        for old_sub_route, new_sub_route in \
+            _pair_sub_routes(old_route, new_route):
+            pending_route_pairs.append((
+                old_sub_route,
+                new_sub_route,
+                old_sub_route_ancestor_names,
+                new_sub_route_ancestor_names,
+                ))
+
+    # Names are unique in each tree, so the routes outside the indexed
+    # subtrees cannot have any of the names in them
+    old_route_names = frozenset(old_route_locations_by_name)
+    new_route_names = frozenset(new_route_locations_by_name)
+    view_changed_route_names = set()
+    moved_route_names = set()
+    for route_name in old_route_names & new_route_names:
+        old_view, old_ancestor_names = old_route_locations_by_name[route_name]
+        new_view, new_ancestor_names = new_route_locations_by_name[route_name]
+        if old_view != new_view:
+            view_changed_route_names.add(route_name)
+        if old_ancestor_names != new_ancestor_names:
+            moved_route_names.add(route_name)
+
+    route_tree_diff = RouteTreeDiff(
+        new_route_names - old_route_names,
+        old_route_names - new_route_names,
+        frozenset(view_changed_route_names),
+        frozenset(moved_route_names),
+        )
+    return route_tree_diff
+
+
+def _are_routes_equivalent_by_fingerprint(old_route, new_route):
+    #pylint:disable=W0212
+    if old_route is new_route:
+        are_routes_equivalent = True
+    elif old_route._has_unhashable_views or new_route._has_unhashable_views:
+        # Their fingerprints would not tell the views apart
+        are_routes_equivalent = False
+    else:
+        are_routes_equivalent = \
+            old_route._fingerprint == new_route._fingerprint
+    return are_routes_equivalent
+
+
+def _pair_sub_routes(old_route, new_route):
+    new_sub_routes_by_name = {}
+    new_unnamed_sub_routes = []
+    for new_sub_route in new_route.sub_routes:
+        if new_sub_route.name:
+            new_sub_routes_by_name[new_sub_route.name] = new_sub_route
+        else:
+            new_unnamed_sub_routes.append(new_sub_route)
+
+    new_unnamed_sub_routes.reverse()
+    for old_sub_route in old_route.sub_routes:
+        if old_sub_route.name:
+            new_sub_route = \
+                new_sub_routes_by_name.pop(old_sub_route.name, None)
+        elif new_unnamed_sub_routes:
+            new_sub_route = new_unnamed_sub_routes.pop()
+        else:
+            new_sub_route = None
+        yield old_sub_route, new_sub_route
+
+    unpaired_new_sub_routes = \
+        chain(new_sub_routes_by_name.values(), new_unnamed_sub_routes)
+    for new_sub_route in unpaired_new_sub_routes:
+        yield None, new_sub_route
+
+
+def _index_route_locations(route, ancestor_names, route_locations_by_name):
+    pending_routes = [(route, ancestor_names)]
+    while pending_routes:
+        current_route, current_ancestor_names = pending_routes.pop()
+        _add_route_location(
+            current_route,
+            current_ancestor_names,
+            route_locations_by_name,
+            )
+
+        sub_route_ancestor_names = _get_sub_route_ancestor_names(
+            current_route,
+            current_ancestor_names,
+            )
+        pending_routes.extend(
+            (sub_route, sub_route_ancestor_names)
+            for sub_route in current_route.sub_routes
+            )
+
+
+def _add_route_location(route, ancestor_names, route_locations_by_name):
+    if route.name:
+        route_locations_by_name[route.name] = (route.view, ancestor_names)
+
+
+def _get_sub_route_ancestor_names(route, ancestor_names):
+    if route.name:
+        sub_route_ancestor_names = ancestor_names + (route.name,)
+    else:
+        sub_route_ancestor_names = ancestor_names
+    return sub_route_ancestor_names
@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from itertools import chain
+
+from django_routing._utils import are_objects_inequivalent
+from django_routing._utils import get_routes_by_names
+from django_routing._utils import walk_route_tree
+from django_routing.exceptions import DuplicatedRouteError
+from django_routing.exceptions import NonExistingRouteError
+from django_routing.exceptions import RoutingException
+
+
+class RouteForest(object):
+
+    def __init__(self, base_route):
+        super(RouteForest, self).__init__()
+
+        self._base_route = base_route
+        self._tenant_route_trees = {}
+
+        # The name index of the base is shared by all the tenants
+        base_route._get_routes_by_name()  #pylint:disable=W0212
+
+    def __len__(self):
+        return len(self._tenant_route_trees)
+
+    def __contains__(self, tenant_id):
+        return tenant_id in self._tenant_route_trees
+
+    @property
+    def base_route(self):
+        return self._base_route
+
+    def add_tenant(
+        self,
+        tenant_id,
+        views_by_route_name=None,
+        additional_sub_routes_by_route_name=None,
+        ):
+        if tenant_id in self._tenant_route_trees:
+            raise RoutingException(
+                'Tenant {!r} already exists'.format(tenant_id),
+                )
+
+        tenant_route_tree = TenantRouteTree(
+            self._base_route,
+            views_by_route_name or {},
+            additional_sub_routes_by_route_name or {},
+            )
+        self._tenant_route_trees[tenant_id] = tenant_route_tree
+        return tenant_route_tree
+
+    def get_tenant(self, tenant_id):
+        return self._tenant_route_trees[tenant_id]
+
+
+class TenantRouteTree(object):
+
+    __slots__ = (
+        '_base_route',
+        '_views_by_route_name',
+        '_additional_sub_routes_by_route_name',
+        '_additional_routes_by_name',
+        )
+
+    def __init__(
+        self,
+        base_route,
+        views_by_route_name,
+        additional_sub_routes_by_route_name,
+        ):
+        super(TenantRouteTree, self).__init__()
+
+        self._base_route = base_route
+        self._views_by_route_name = dict(views_by_route_name)
+        self._additional_sub_routes_by_route_name = {
+            route_name: tuple(additional_sub_routes)
+            for route_name, additional_sub_routes
+            in additional_sub_routes_by_route_name.items()
+            if additional_sub_routes
+            }
+        # Tenants only index the routes they add, each along with the name
+        # of the base route it is attached to
+        self._additional_routes_by_name = {}
+
+        self._index_additional_routes()
+        self._require_overridden_routes_existence()
+
+    def __repr__(self):
+        repr_ = '<{} of {!r} with {} overridden views>'.format(
+            self.__class__.__name__,
+            self._base_route,
+            len(self._views_by_route_name),
+            )
+        return repr_
+
+    @property
+    def root(self):
+        return TenantRoute(self, self._base_route)
+
+    def get_route_by_name(self, route_name):
+        return self._get_tenant_route_by_name(self._base_route, route_name)
+
+    def find_route(self, route_name, default=None):
+        return self._find_tenant_route(self._base_route, route_name, default)
+
+    def get_routes_by_names(self, route_names):
+        return self.root.get_routes_by_names(route_names)
+
+    def get_route_names(self):
+        return list(self.iter_route_names())
+
+    def iter_route_names(self):
+        return self.root.iter_route_names()
+
+    def walk(self, order='pre'):
+        return self.root.walk(order)
+
+    def _index_additional_routes(self):
+        base_routes_by_name = self._base_route._get_routes_by_name()
+        for route_name, additional_sub_routes in \
+            self._additional_sub_routes_by_route_name.items():
+            if not route_name or route_name not in base_routes_by_name:
+                exc_message = \
+                    'Base route does not contain one named {!r}'.format(
+                        route_name,
+                        )
+                raise NonExistingRouteError(exc_message)
+
+            base_route = base_routes_by_name[route_name]
+            base_sub_routes = frozenset(base_route.sub_routes)
+            for additional_sub_route in additional_sub_routes:
+                if not additional_sub_route.name and \
+                    additional_sub_route in base_sub_routes:
+                    raise DuplicatedRouteError(repr(additional_sub_route))
+
+                for additional_route_name in \
+                    additional_sub_route.iter_route_names():
+                    is_name_duplicated = \
+                        additional_route_name in base_routes_by_name or \
+                        additional_route_name in \
+                        self._additional_routes_by_name
+                    if is_name_duplicated:
+                        raise DuplicatedRouteError(additional_route_name)
+
+                    self._additional_routes_by_name[additional_route_name] = (
+                        additional_sub_route.get_route_by_name(
+                            additional_route_name,
+                            ),
+                        route_name,
+                        )
+
+    def _require_overridden_routes_existence(self):
+        base_routes_by_name = self._base_route._get_routes_by_name()
+        for route_name in self._views_by_route_name:
+            does_route_exist = route_name and (
+                route_name in base_routes_by_name or
+                route_name in self._additional_routes_by_name
+                )
+            if not does_route_exist:
+                exc_message = \
+                    'Tenant does not contain one named {!r}'.format(route_name)
+                raise NonExistingRouteError(exc_message)
+
+    def _get_route_view(self, route):
+        route_name = route.name
+        if route_name and route_name in self._views_by_route_name:
+            view = self._views_by_route_name[route_name]
+        else:
+            view = route.view
+        return view
+
+    def _get_additional_sub_routes(self, route):
+        route_name = route.name
+        if route_name:
+            additional_sub_routes = \
+                self._additional_sub_routes_by_route_name.get(route_name, ())
+        else:
+            additional_sub_routes = ()
+        return additional_sub_routes
+
+    def _get_tenant_route_by_name(self, route, route_name):
+        matching_route = self._find_route_by_name(route, route_name)
+        if matching_route is None:
+            exc_message = 'self {!r} does not contain one named {!r}'.format(
+                route.name,
+                route_name,
+                )
+            raise NonExistingRouteError(exc_message)
+
+        return TenantRoute(self, matching_route)
+
+    def _find_tenant_route(self, route, route_name, default):
+        matching_route = self._find_route_by_name(route, route_name)
+        if matching_route is None:
+            tenant_route = default
+        else:
+            tenant_route = TenantRoute(self, matching_route)
+        return tenant_route
+
+    def _find_route_by_name(self, route, route_name):
+        # The overlay of the tenant is checked before the index of the base
+        routes_by_name = route._get_routes_by_name()  #pylint:disable=W0212
+        if route_name in self._additional_routes_by_name:
+            matching_route, attachment_route_name = \
+                self._additional_routes_by_name[route_name]
+            is_route_in_subtree = attachment_route_name in routes_by_name or \
+                route_name in routes_by_name
+            if not is_route_in_subtree:
+                matching_route = None
+        elif route_name in routes_by_name:
+            matching_route = routes_by_name[route_name]
+        else:
+            matching_route = None
+        return matching_route
+
+
+class TenantRoute(object):
+
+    __slots__ = ('_tenant_route_tree', '_route')
+
+    def __init__(self, tenant_route_tree, route):
+        super(TenantRoute, self).__init__()
+
+        self._tenant_route_tree = tenant_route_tree
+        self._route = route
+
+    def __repr__(self):
+        repr_template = '<{class_name} view={view!r} name={name!r} with ' \
+            '{sub_route_count} sub-routes>'
+        repr_ = repr_template.format(
+            class_name=self.__class__.__name__,
+            name=self.name,
+            view=self.view,
+            sub_route_count=len(self.sub_routes),
+            )
+        return repr_
+
+    def __eq__(self, other):
+        if isinstance(other, self.__class__):
+            are_routes_equivalent = \
+                self._tenant_route_tree is other._tenant_route_tree and \
+                self._route is other._route
+        else:
+            are_routes_equivalent = NotImplemented
+        return are_routes_equivalent
+
+    __ne__ = are_objects_inequivalent
+
+    def __hash__(self):
+        return hash((id(self._tenant_route_tree), id(self._route)))
+
+    @property
+    def name(self):
+        return self._route.name
+
+    @property
+    def view(self):
+        return self._tenant_route_tree._get_route_view(self._route)
+
+    @property
+    def path_segment(self):
+        return self._route.path_segment
+
+    @property
+    def sub_routes(self):
+        additional_sub_routes = \
+            self._tenant_route_tree._get_additional_sub_routes(self._route)
+        sub_routes = chain(self._route.sub_routes, additional_sub_routes)
+        tenant_sub_routes = tuple(
+            TenantRoute(self._tenant_route_tree, sub_route)
+            for sub_route in sub_routes
+            )
+        return tenant_sub_routes
+
+    def get_route_by_name(self, route_name):
+        tenant_route = self._tenant_route_tree._get_tenant_route_by_name(
+            self._route,
+            route_name,
+            )
+        return tenant_route
+
+    def find_route(self, route_name, default=None):
+        tenant_route = self._tenant_route_tree._find_tenant_route(
+            self._route,
+            route_name,
+            default,
+            )
+        return tenant_route
+
+    def get_routes_by_names(self, route_names):
+        return get_routes_by_names(self, route_names, self.find_route)
+
+    def get_route_names(self):
+        return list(self.iter_route_names())
+
+    def iter_route_names(self):
+        for route, _, _ in self.walk():
+            if route.name:
+                yield route.name
+
+    def walk(self, order='pre'):
+        return walk_route_tree(self, order)
+
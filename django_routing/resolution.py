@@ -0,0 +1,555 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+import re
+from uuid import UUID
+
+try:
+    from urllib.parse import quote
+except ImportError:
+    from urllib import quote
+
+from django_routing.exceptions import InvalidPathSegmentError
+from django_routing.exceptions import InvalidURLArgumentsError
+from django_routing.exceptions import NonExistingRouteError
+from django_routing.exceptions import UnresolvablePathError
+
+
+_PATH_SEPARATOR = '/'
+
+
+_DYNAMIC_PATH_COMPONENT_REGEX = re.compile(
+    r'^<(?:(?P<converter_name>[^<>:]+):)?(?P<argument_name>[A-Za-z_]\w*)>$',
+    )
+
+
+_DEFAULT_CONVERTER_NAME = 'str'
+
+
+_NO_MATCH = object()
+
+
+# Like in Django, the sub-delimiters of RFC 3986 are not quoted in URLs
+_URL_SAFE_CHARACTERS = "!$&'()*+,;=/~:@"
+
+
+_URL_UNSAFE_CHARACTER_REGEX = re.compile(r"[^-A-Za-z0-9_.!$&'()*+,;=/~:@]")
+
+
+class StringConverter(object):
+
+    regex = '[^/]+'
+
+    spans_segments = False
+
+    def to_python(self, value):
+        return value
+
+    def to_url(self, value):
+        return value
+
+
+class IntConverter(StringConverter):
+
+    regex = '[0-9]+'
+
+    def to_python(self, value):
+        return int(value)
+
+    def to_url(self, value):
+        return str(value)
+
+
+class SlugConverter(StringConverter):
+
+    regex = '[-a-zA-Z0-9_]+'
+
+
+class UUIDConverter(StringConverter):
+
+    regex = '[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}'
+
+    def to_python(self, value):
+        return UUID(value)
+
+    def to_url(self, value):
+        return str(value)
+
+
+class PathConverter(StringConverter):
+
+    regex = '.+'
+
+    spans_segments = True
+
+
+DEFAULT_CONVERTERS = {
+    'int': IntConverter(),
+    'path': PathConverter(),
+    'slug': SlugConverter(),
+    'str': StringConverter(),
+    'uuid': UUIDConverter(),
+    }
+
+
+class RouteMatch(object):
+
+    __slots__ = ('route', 'kwargs')
+
+    def __init__(self, route, kwargs):
+        super(RouteMatch, self).__init__()
+
+        self.route = route
+        self.kwargs = kwargs
+
+    def __repr__(self):
+        repr_ = '<RouteMatch of {!r} with {!r}>'.format(
+            self.route.name,
+            self.kwargs,
+            )
+        return repr_
+
+    @property
+    def view(self):
+        return self.route.view
+
+
+class RouteResolver(object):
+
+    def __init__(self, route, converters=None):
+        super(RouteResolver, self).__init__()
+
+        self._converters = dict(DEFAULT_CONVERTERS)
+        if converters:
+            self._converters.update(converters)
+
+        self._root_node, self._url_builders_by_route_name = \
+            _compile_route_paths(self._converters, route)
+
+    def resolve(self, path):
+        # Like in Django, the first route declared with a matching path wins,
+        # even if a static component of a later route would also match.
+        # Alternative matches are tried depth-first, in the order in which the
+        # first route under each of them was declared, and once a route
+        # matches, only the alternatives declared before it are still tried
+        path_components = _split_path(path)
+        path_component_count = len(path_components)
+        matching_node = None
+        matching_path_arguments = None
+        pending_node_matches = [iter(((self._root_node, 0, ()),))]
+        while pending_node_matches:
+            try:
+                node, path_component_index, path_arguments = \
+                    next(pending_node_matches[-1])
+            except StopIteration:
+                pending_node_matches.pop()
+                continue
+
+            if matching_node is not None and \
+                matching_node.route_index <= node.first_route_index:
+                # The remaining alternatives were declared later
+                pending_node_matches.pop()
+            elif path_component_index == path_component_count:
+                if node.route is not None and (
+                    matching_node is None or
+                    node.route_index < matching_node.route_index
+                    ):
+                    matching_node = node
+                    matching_path_arguments = path_arguments
+            else:
+                pending_node_matches.append(node.iter_child_node_matches(
+                    path_components,
+                    path_component_index,
+                    path_arguments,
+                    ))
+
+        if matching_node is None:
+            raise UnresolvablePathError('No route matches {!r}'.format(path))
+
+        route_match = \
+            RouteMatch(matching_node.route, dict(matching_path_arguments))
+        return route_match
+
+    def reverse(self, route_name, **kwargs):
+        try:
+            url_builder = self._url_builders_by_route_name[route_name]
+        except KeyError:
+            exc_message = 'No route named {!r} has a path'.format(route_name)
+            raise NonExistingRouteError(exc_message)
+
+        url = url_builder.build_url(route_name, kwargs)
+        return url
+
+
+class _PathTrieNode(object):
+
+    __slots__ = (
+        'route',
+        'route_index',
+        'first_route_index',
+        'static_child_nodes',
+        'dynamic_edges',
+        )
+
+    def __init__(self):
+        super(_PathTrieNode, self).__init__()
+
+        self.route = None
+        self.route_index = None
+        self.first_route_index = None
+        self.static_child_nodes = {}
+        self.dynamic_edges = []
+
+    def get_static_child_node(self, path_component):
+        child_node = self.static_child_nodes.get(path_component)
+        if child_node is None:
+            child_node = _PathTrieNode()
+            self.static_child_nodes[path_component] = child_node
+        return child_node
+
+    def get_dynamic_edge(self, converter, argument_name):
+        for dynamic_edge in self.dynamic_edges:
+            if dynamic_edge.converter is converter and \
+                dynamic_edge.argument_name == argument_name:
+                return dynamic_edge
+
+        dynamic_edge = _DynamicPathTrieEdge(converter, argument_name)
+        self.dynamic_edges.append(dynamic_edge)
+        return dynamic_edge
+
+    def get_child_nodes(self):
+        child_nodes = list(self.static_child_nodes.values())
+        child_nodes.extend(edge.node for edge in self.dynamic_edges)
+        return child_nodes
+
+    def iter_child_node_matches(
+        self,
+        path_components,
+        path_component_index,
+        path_arguments,
+        ):
+        if self.dynamic_edges:
+            child_node_matches = self._iter_child_node_matches_in_order(
+                path_components,
+                path_component_index,
+                path_arguments,
+                )
+        else:
+            # Most nodes only have static child nodes, so there is nothing
+            # to sort out
+            static_child_node = self.static_child_nodes.get(
+                path_components[path_component_index],
+                )
+            if static_child_node is None:
+                child_node_matches = iter(())
+            else:
+                child_node_matches = iter((
+                    (
+                        static_child_node,
+                        path_component_index + 1,
+                        path_arguments,
+                        ),
+                    ))
+        return child_node_matches
+
+    def _iter_child_node_matches_in_order(
+        self,
+        path_components,
+        path_component_index,
+        path_arguments,
+        ):
+        path_component = path_components[path_component_index]
+        next_path_component_index = path_component_index + 1
+
+        # The dynamic edges are sorted by the first route declared in them,
+        # and the static child node is tried in its place among them
+        static_child_node = self.static_child_nodes.get(path_component)
+        for dynamic_edge in self.dynamic_edges:
+            if static_child_node is not None and \
+                static_child_node.first_route_index < \
+                dynamic_edge.node.first_route_index:
+                yield (
+                    static_child_node,
+                    next_path_component_index,
+                    path_arguments,
+                    )
+                static_child_node = None
+
+            if dynamic_edge.converter.spans_segments:
+                # The longest run of components is tried first, like a
+                # greedy regular expression would
+                end_path_component_indices = range(
+                    len(path_components),
+                    path_component_index,
+                    -1,
+                    )
+            else:
+                end_path_component_indices = (next_path_component_index,)
+
+            for end_path_component_index in end_path_component_indices:
+                value = dynamic_edge.convert(_PATH_SEPARATOR.join(
+                    path_components[path_component_index:
+                                    end_path_component_index],
+                    ))
+                if value is not _NO_MATCH:
+                    child_path_arguments = path_arguments + \
+                        ((dynamic_edge.argument_name, value),)
+                    yield (
+                        dynamic_edge.node,
+                        end_path_component_index,
+                        child_path_arguments,
+                        )
+
+        if static_child_node is not None:
+            yield static_child_node, next_path_component_index, path_arguments
+
+
+class _DynamicPathTrieEdge(object):
+
+    __slots__ = ('converter', 'argument_name', 'node', '_match_value')
+
+    def __init__(self, converter, argument_name):
+        super(_DynamicPathTrieEdge, self).__init__()
+
+        self.converter = converter
+        self.argument_name = argument_name
+        self.node = _PathTrieNode()
+
+        value_regex = re.compile(r'(?:{})\Z'.format(converter.regex))
+        self._match_value = value_regex.match
+
+    def convert(self, path_value):
+        if self._match_value(path_value):
+            try:
+                value = self.converter.to_python(path_value)
+            except ValueError:
+                # Like in Django, the converter rejects the value
+                value = _NO_MATCH
+        else:
+            value = _NO_MATCH
+        return value
+
+    def to_url(self, value):
+        url_value = str(self.converter.to_url(value))
+        if self._match_value(url_value):
+            # Most values (e.g., integers and slugs) need no quoting
+            if _URL_UNSAFE_CHARACTER_REGEX.search(url_value):
+                url_value = quote(url_value, safe=_URL_SAFE_CHARACTERS)
+        else:
+            url_value = _NO_MATCH
+        return url_value
+
+
+class _URLBuilder(object):
+
+    __slots__ = ('_url_template', '_dynamic_edges_by_argument_name')
+
+    def __init__(self, url_template, dynamic_edges_by_argument_name):
+        super(_URLBuilder, self).__init__()
+
+        self._url_template = url_template
+        self._dynamic_edges_by_argument_name = dynamic_edges_by_argument_name
+
+    def build_url(self, route_name, kwargs):
+        dynamic_edges_by_argument_name = self._dynamic_edges_by_argument_name
+        if not dynamic_edges_by_argument_name and not kwargs:
+            return self._url_template
+
+        if len(kwargs) != len(dynamic_edges_by_argument_name):
+            self._raise_invalid_url_arguments_error(route_name, kwargs)
+
+        url_values_by_argument_name = {}
+        for argument_name, value in kwargs.items():
+            dynamic_edge = dynamic_edges_by_argument_name.get(argument_name)
+            if dynamic_edge is None:
+                self._raise_invalid_url_arguments_error(route_name, kwargs)
+
+            url_value = dynamic_edge.to_url(value)
+            if url_value is _NO_MATCH:
+                self._raise_invalid_url_arguments_error(route_name, kwargs)
+            url_values_by_argument_name[argument_name] = url_value
+
+        url = self._url_template.format(**url_values_by_argument_name)
+        return url
+
+    def _raise_invalid_url_arguments_error(self, route_name, kwargs):
+        exc_message = 'Route {!r} expects the arguments {!r}, got {!r}'.format(
+            route_name,
+            sorted(self._dynamic_edges_by_argument_name),
+            kwargs,
+            )
+        raise InvalidURLArgumentsError(exc_message)
+
+
+def _compile_route_paths(converters, route):
+    # The trie and the URL templates are compiled in the same walk. Routes
+    # without a path segment only group their sub-routes, which are then
+    # relative to the path of the closest ancestor with a segment
+    root_node = _PathTrieNode()
+    url_builders_by_route_name = {}
+    route_paths_by_depth = []
+    for route_index, (current_route, depth, _) in enumerate(route.walk()):
+        del route_paths_by_depth[depth:]
+        if route_paths_by_depth:
+            node, url_template_parts, dynamic_edges = \
+                route_paths_by_depth[-1]
+        else:
+            node, url_template_parts, dynamic_edges = root_node, (), ()
+
+        path_segment = current_route.path_segment
+        if path_segment is not None:
+            for path_component in _split_path(path_segment):
+                static_path_component, converter_name, argument_name = \
+                    _parse_path_component(path_component)
+                if converter_name is None:
+                    node = node.get_static_child_node(static_path_component)
+                    url_template_part = _escape_url_template(quote(
+                        static_path_component,
+                        safe=_URL_SAFE_CHARACTERS,
+                        ))
+                else:
+                    _require_argument_name_uniqueness_in_path(
+                        argument_name,
+                        dynamic_edges,
+                        )
+                    dynamic_edge = node.get_dynamic_edge(
+                        _get_converter(converters, converter_name),
+                        argument_name,
+                        )
+                    node = dynamic_edge.node
+                    url_template_part = '{' + argument_name + '}'
+                    dynamic_edges += (dynamic_edge,)
+                url_template_parts += (url_template_part,)
+
+            # Like in Django, the first route for a path wins
+            if node.route is None:
+                node.route = current_route
+                node.route_index = route_index
+
+            if current_route.name:
+                url_builders_by_route_name[current_route.name] = \
+                    _create_url_builder(url_template_parts, dynamic_edges)
+
+        route_paths_by_depth.append(
+            (node, url_template_parts, dynamic_edges),
+            )
+
+    _sort_path_trie_by_declaration(root_node)
+
+    return root_node, url_builders_by_route_name
+
+
+def _sort_path_trie_by_declaration(root_node):
+    # Every node is given the index of the first route declared under it, so
+    # the nodes are visited top-down and then updated bottom-up
+    nodes = []
+    pending_nodes = [root_node]
+    while pending_nodes:
+        node = pending_nodes.pop()
+        nodes.append(node)
+        pending_nodes.extend(node.get_child_nodes())
+
+    for node in reversed(nodes):
+        first_route_indices = [
+            child_node.first_route_index
+            for child_node in node.get_child_nodes()
+            ]
+        if node.route_index is not None:
+            first_route_indices.append(node.route_index)
+        if first_route_indices:
+            node.first_route_index = min(first_route_indices)
+
+        node.dynamic_edges.sort(key=_get_dynamic_edge_first_route_index)
+
+
+def _get_dynamic_edge_first_route_index(dynamic_edge):
+    return dynamic_edge.node.first_route_index
+
+
+def _parse_path_component(path_component):
+    dynamic_path_component_match = \
+        _DYNAMIC_PATH_COMPONENT_REGEX.match(path_component)
+    if dynamic_path_component_match:
+        static_path_component = None
+        converter_name = \
+            dynamic_path_component_match.group('converter_name') or \
+            _DEFAULT_CONVERTER_NAME
+        argument_name = dynamic_path_component_match.group('argument_name')
+    else:
+        _require_path_component_to_be_static(path_component)
+        static_path_component = path_component
+        converter_name = None
+        argument_name = None
+    return static_path_component, converter_name, argument_name
+
+
+def _create_url_builder(url_template_parts, dynamic_edges):
+    # URLs end with a slash, like Django's patterns conventionally do
+    if url_template_parts:
+        url_template = '/{}/'.format(_PATH_SEPARATOR.join(url_template_parts))
+    else:
+        url_template = _PATH_SEPARATOR
+
+    dynamic_edges_by_argument_name = {
+        dynamic_edge.argument_name: dynamic_edge
+        for dynamic_edge in dynamic_edges
+        }
+
+    if not dynamic_edges:
+        # URLs without arguments are built in full once and for all
+        url_template = url_template.format()
+
+    url_builder = _URLBuilder(url_template, dynamic_edges_by_argument_name)
+    return url_builder
+
+
+def _escape_url_template(url_template_part):
+    return url_template_part.replace('{', '{{').replace('}', '}}')
+
+
+def _split_path(path):
+    path = path.strip(_PATH_SEPARATOR)
+    if path:
+        path_components = path.split(_PATH_SEPARATOR)
+    else:
+        path_components = []
+    return path_components
+
+
+def _get_converter(converters, converter_name):
+    try:
+        converter = converters[converter_name]
+    except KeyError:
+        exc_message = 'Unknown path converter {!r}'.format(converter_name)
+        raise InvalidPathSegmentError(exc_message)
+    return converter
+
+
+def _require_path_component_to_be_static(path_component):
+    if '<' in path_component or '>' in path_component:
+        exc_message = 'Path component {!r} must either be static or be ' \
+            'made of just one converter'.format(path_component)
+        raise InvalidPathSegmentError(exc_message)
+
+
+def _require_argument_name_uniqueness_in_path(argument_name, dynamic_edges):
+    if any(
+        dynamic_edge.argument_name == argument_name
+        for dynamic_edge in dynamic_edges
+        ):
+        exc_message = 'Path repeats the argument {!r}'.format(argument_name)
+        raise InvalidPathSegmentError(exc_message)
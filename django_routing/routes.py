@@ -16,62 +16,88 @@
 ##############################################################################
 
 from abc import ABCMeta
-from abc import abstractmethod
 from abc import abstractproperty
+from collections import defaultdict
+from contextlib import contextmanager
+from functools import wraps
+from inspect import isgeneratorfunction
 from itertools import chain
+import sys
+from threading import local
+from timeit import default_timer
 
 from django_routing._utils import are_objects_inequivalent
-
-
-class RoutingException(Exception):
-    pass
-
-
-class DuplicatedRouteError(RoutingException):
-    pass
-
-
-class NonExistingRouteError(RoutingException):
-    pass
-
-
-class InvalidSpecializationError(RoutingException):
-    pass
+from django_routing._utils import get_routes_by_names
+from django_routing._utils import walk_route_tree
+from django_routing.compilation import compile_route_tree
+from django_routing.exceptions import DuplicatedRouteError
+from django_routing.exceptions import InvalidSpecializationError
+from django_routing.exceptions import NonExistingRouteError
+from django_routing.exceptions import RoutingException
 
 
 class _BaseRoute(object):
 
     __metaclass__ = ABCMeta
 
+    __slots__ = (
+        'sub_routes',
+        '_route_names',
+        '_fingerprint',
+        '_has_unhashable_views',
+        '_routes_by_name',
+        '_routes_by_view',
+        '_route_path_index',
+        )
+
     name = abstractproperty()
 
     view = abstractproperty()
 
+    path_segment = abstractproperty()
+
+    def __init__(self):
+        super(_BaseRoute, self).__init__()
+
+        self._route_names = None
+        self._routes_by_name = None
+        self._routes_by_view = None
+        self._route_path_index = None
+
     def __eq__(self, other):
-        if isinstance(other, self.__class__):
+        if self is other:
+            are_routes_equivalent = True
+        elif not isinstance(other, self.__class__):
+            are_routes_equivalent = NotImplemented
+        elif self._fingerprint != other._fingerprint:
+            are_routes_equivalent = False
+        else:
             are_views_equivalent = self.view == other.view
             are_names_equivalent = self.name == other.name
+            are_path_segments_equivalent = \
+                self.path_segment == other.path_segment
             are_sub_routes_equivalent = self.sub_routes == other.sub_routes
 
             are_routes_equivalent = all((
                 are_views_equivalent,
                 are_names_equivalent,
+                are_path_segments_equivalent,
                 are_sub_routes_equivalent,
                 ))
-        else:
-            are_routes_equivalent = NotImplemented
 
         return are_routes_equivalent
 
     __ne__ = are_objects_inequivalent
 
-    def get_route_by_name(self, route_name):
-        if self.name == route_name:
-            matching_route = self
-        else:
-            matching_route = self._get_sub_route_by_name(route_name)
+    def __hash__(self):
+        return self._fingerprint
+
+    def __reduce__(self):
+        return _reduce_route_graph(self)
 
-        if not matching_route:
+    def get_route_by_name(self, route_name):
+        matching_route = self.find_route(route_name)
+        if matching_route is None:
             exc_message = 'self {!r} does not contain one named {!r}'.format(
                 self.name,
                 route_name,
@@ -80,63 +106,172 @@ class _BaseRoute(object):
 
         return matching_route
 
-    def _get_sub_route_by_name(self, route_name):
-        matching_sub_route = None
-        for sub_route in self.sub_routes:
-            try:
-                matching_sub_route = sub_route.get_route_by_name(route_name)
-            except NonExistingRouteError:
-                pass
-            else:
-                break
+    def find_route(self, route_name, default=None):
+        # Misses are answered by the same index as hits, without raising
+        routes_by_name = self._get_routes_by_name()
+        return routes_by_name.get(route_name, default)
+
+    def get_routes_by_names(self, route_names):
+        routes_by_name = self._get_routes_by_name()
+        return get_routes_by_names(self, route_names, routes_by_name.get)
+
+    def _get_routes_by_name(self):
+        if self._routes_by_name is None:
+            self._routes_by_name = _index_routes_by_name(self)
+        return self._routes_by_name
+
+    def get_routes_by_view(self, view):
+        routes_by_view, unhashable_view_routes = self._get_routes_by_view()
+        if _get_view_fingerprint(view) is None:
+            routes = tuple(
+                route for route in unhashable_view_routes if route.view == view
+                )
+        else:
+            routes = tuple(routes_by_view.get(view, ()))
+        return routes
 
-        return matching_sub_route
+    def _get_routes_by_view(self):
+        if self._routes_by_view is None:
+            self._routes_by_view = _index_routes_by_view(self)
+        return self._routes_by_view
 
     def get_route_names(self):
-        route_names = []
-
-        if self.name:
-            route_names.append(self.name)
+        return list(self.iter_route_names())
 
-        for sub_route in self.sub_routes:
-            sub_route_names = sub_route.get_route_names()
-            route_names.extend(sub_route_names)
+    def iter_route_names(self):
+        for route, _, _ in self.walk():
+            if route.name:
+                yield route.name
 
-        return route_names
+    def walk(self, order='pre'):
+        return walk_route_tree(self, order)
 
     def _require_route_name_not_in_route(self, route_name):
-        route_names = self.get_route_names()
-        if route_name in route_names:
+        if route_name in self._get_route_name_set():
             raise DuplicatedRouteError(route_name)
 
+    def _get_route_name_set(self):
+        if self._route_names is not None:
+            pass
+        elif self._route_path_index is not None:
+            # Trees derived by updates get their names from the index they
+            # inherit, instead of collecting them again
+            self._route_names = self._route_path_index.get_route_name_set()
+        else:
+            self._route_names = _collect_route_names((self,))
+        return self._route_names
+
+    def _get_route_path_index(self):
+        if self._route_path_index is None:
+            self._route_path_index = _RoutePathIndex.build(self)
+        return self._route_path_index
+
+    def _take_sub_route_name_set(self):
+        if self.sub_routes:
+            route_names = _take_route_name_set(self.sub_routes)
+        else:
+            # Empty collections are shared by every route without sub-routes
+            route_names = set()
+        if self.name:
+            route_names.add(self.name)
+        self._route_names = route_names
+
+    def validate(self):
+        _validate_route_tree(self)
+
+    def compile(self):
+        compiled_route_tree = compile_route_tree(self)
+        return compiled_route_tree
+
     def create_specialization(
         self,
         view=None,
         additional_sub_routes=(),
         specialized_sub_routes=(),
+        path_segment=None,
         ):
         route_specialization = _RouteSpecialization(
             view,
             self,
             additional_sub_routes,
             specialized_sub_routes,
+            path_segment,
             )
         return route_specialization
 
+    def flatten(self):
+        flattened_route = _flatten_route_tree(self)
+        return flattened_route
+
+    def with_route_replaced(self, route_name, new_route):
+        route_path_index = self._get_route_path_index()
+        route_path = route_path_index.get_route_path(self, route_name)
+        replaced_route = route_path[-1]
+        replaced_route_names = frozenset(replaced_route.iter_route_names())
+        _require_route_names_uniqueness_in_replacement(
+            route_path_index,
+            replaced_route_names,
+            new_route,
+            )
+
+        updated_route = _replace_route_in_path(route_path, new_route)
+        if updated_route is not new_route:
+            updated_route._route_path_index = route_path_index.derive(
+                route_name,
+                replaced_route,
+                replaced_route_names,
+                new_route,
+                )
+        return updated_route
+
+    def with_view(self, route_name, view):
+        route_path_index = self._get_route_path_index()
+        route_path = route_path_index.get_route_path(self, route_name)
+        route_inheritances = _get_route_inheritances(route_path)
+
+        replaced_route = route_path[-1]
+        with deferred_validation():
+            new_route = _copy_route_with_view(
+                replaced_route,
+                route_inheritances[-1],
+                view,
+                )
+
+        updated_route = _replace_route_in_path(route_path, new_route)
+        # The shape of the tree and its names are unchanged
+        updated_route._route_path_index = route_path_index
+        return updated_route
+
 
 class Route(_BaseRoute):
 
-    def __init__(self, view, name, sub_routes=()):
+    __slots__ = ('_view', '_name', '_path_segment')
+
+    def __init__(self, view, name, sub_routes=(), path_segment=None):
         super(Route, self).__init__()
 
         self._view = view
         self._name = name
-
-        for sub_route in sub_routes:
-            sub_route._require_route_name_not_in_route(#pylint:disable=W0212
-                name,
-                )
-        self.sub_routes = _RouteCollection(sub_routes)
+        self._path_segment = path_segment
+
+        sub_routes = tuple(sub_routes)
+        is_validation_deferred = _is_validation_deferred()
+        if not is_validation_deferred:
+            for sub_route in sub_routes:
+                sub_route._require_route_name_not_in_route(name)
+        self.sub_routes = _create_route_collection(sub_routes)
+        if not is_validation_deferred:
+            self._take_sub_route_name_set()
+
+        view_fingerprint = _get_view_fingerprint(view)
+        self._fingerprint = hash((
+            view_fingerprint,
+            name,
+            path_segment,
+            self.sub_routes._fingerprint,
+            ))
+        self._has_unhashable_views = view_fingerprint is None or \
+            self.sub_routes._has_unhashable_views
 
     def __repr__(self):
         repr_template = '<{class_name} view={view!r} name={name!r} with ' \
@@ -157,44 +292,271 @@ class Route(_BaseRoute):
     def view(self):
         return self._view
 
+    @property
+    def path_segment(self):
+        return self._path_segment
+
+    def _get_pickled_dependencies(self):
+        return tuple(self.sub_routes)
+
+    def _get_pickled_record(self, record_indices_by_object_id):
+        pickled_record = (
+            _PICKLED_ROUTE,
+            self._view,
+            self._name,
+            _get_pickled_record_indices(
+                self.sub_routes,
+                record_indices_by_object_id,
+                ),
+            self._path_segment,
+            )
+        return pickled_record
+
+
+class RouteInterner(object):
+
+    def __init__(self):
+        super(RouteInterner, self).__init__()
+
+        self._canonical_routes = {}
+
+    def __len__(self):
+        return len(self._canonical_routes)
+
+    def intern(self, route):
+        canonical_route = self._canonical_routes.setdefault(route, route)
+        return canonical_route
+
+    def create_route(self, view, name, sub_routes=(), path_segment=None):
+        canonical_sub_routes = \
+            [self.intern(sub_route) for sub_route in sub_routes]
+        route = Route(view, name, canonical_sub_routes, path_segment)
+        canonical_route = self.intern(route)
+        return canonical_route
+
+
+class RoutingInstrumentationReport(object):
+
+    def __init__(self):
+        super(RoutingInstrumentationReport, self).__init__()
+
+        self.call_counts = defaultdict(int)
+        self.durations = defaultdict(float)
+        self.call_site_counts = defaultdict(lambda: defaultdict(int))
+
+    def record_call(self, function_name, call_site, duration):
+        self.call_counts[function_name] += 1
+        self.durations[function_name] += duration
+        self.call_site_counts[function_name][call_site] += 1
+
+    def format(self):
+        lines = []
+        for function_name in sorted(self.call_counts):
+            lines.append('{}: {} calls in {:.6f}s'.format(
+                function_name,
+                self.call_counts[function_name],
+                self.durations[function_name],
+                ))
+
+            call_site_counts = self.call_site_counts[function_name]
+            for call_site in sorted(call_site_counts):
+                lines.append('    {}:{} ({}): {} calls'.format(
+                    call_site[0],
+                    call_site[1],
+                    call_site[2],
+                    call_site_counts[call_site],
+                    ))
+        return '\n'.join(lines)
+
+
+class _ValidationState(local):
+
+    def __init__(self):
+        super(_ValidationState, self).__init__()
+
+        self.is_deferred = False
+
+
+# Validation is only deferred in the thread that asked for it, so routes
+# created concurrently in other threads are still validated
+_validation_state = _ValidationState()
+
+
+@contextmanager
+def deferred_validation():
+    # Routes created in this context are not validated, not even against
+    # each other, until validate() is called on the root of their tree
+    was_validation_deferred = _validation_state.is_deferred
+    _validation_state.is_deferred = True
+    try:
+        yield
+    finally:
+        _validation_state.is_deferred = was_validation_deferred
+
+
+def _is_validation_deferred():
+    return _validation_state.is_deferred
+
+
+_is_instrumentation_enabled = False
+
+
+@contextmanager
+def instrument_routes():
+    # The functions are only replaced by instrumented versions for the
+    # duration of the context, so there is no overhead otherwise. As a
+    # consequence, this is not thread-safe and cannot be nested.
+    global _is_instrumentation_enabled  #pylint:disable=W0603
+    if _is_instrumentation_enabled:
+        raise RoutingException('Route instrumentation is already enabled')
+
+    report = RoutingInstrumentationReport()
+    original_functions = []
+    for owner, attribute_name in _INSTRUMENTED_FUNCTIONS:
+        original_function = vars(owner)[attribute_name]
+        original_functions.append((owner, attribute_name, original_function))
+
+        if isinstance(owner, type):
+            function_name = '{}.{}'.format(owner.__name__, attribute_name)
+        else:
+            function_name = attribute_name
+        instrumented_function = \
+            _instrument_function(original_function, function_name, report)
+        setattr(owner, attribute_name, instrumented_function)
+
+    _is_instrumentation_enabled = True
+    try:
+        yield report
+    finally:
+        for owner, attribute_name, original_function in original_functions:
+            setattr(owner, attribute_name, original_function)
+        _is_instrumentation_enabled = False
+
+
+def _instrument_function(function, function_name, report):
+    is_generator_function = isgeneratorfunction(function)
+
+    @wraps(function)
+    def instrumented_function(*args, **kwargs):
+        caller_frame = sys._getframe(1)  #pylint:disable=W0212
+        call_site = (
+            caller_frame.f_code.co_filename,
+            caller_frame.f_lineno,
+            caller_frame.f_code.co_name,
+            )
+
+        if is_generator_function:
+            return _instrument_generator(
+                function(*args, **kwargs),
+                function_name,
+                call_site,
+                report,
+                )
+
+        start_time = default_timer()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            duration = default_timer() - start_time
+            report.record_call(function_name, call_site, duration)
+
+    return instrumented_function
+
+
+def _instrument_generator(generator, function_name, call_site, report):
+    # The work of a generator is done as it is iterated, so the time spent
+    # producing each item is added up and the call is recorded once the
+    # generator is exhausted or closed
+    duration = 0
+    try:
+        while True:
+            start_time = default_timer()
+            try:
+                item = next(generator)
+            except StopIteration:
+                return
+            finally:
+                duration += default_timer() - start_time
+            yield item
+    finally:
+        report.record_call(function_name, call_site, duration)
+
 
 class _BaseRouteCollection(object):
 
     __metaclass__ = ABCMeta
 
+    __slots__ = (
+        '_routes',
+        '_route_names',
+        '_fingerprint',
+        '_has_unhashable_views',
+        )
+
     def __eq__(self, other):
-        if isinstance(other, self.__class__):
-            are_routes_equivalent = tuple(self) == tuple(other)
-        else:
+        if self is other:
+            are_routes_equivalent = True
+        elif not isinstance(other, self.__class__):
             are_routes_equivalent = NotImplemented
+        elif self._fingerprint != other._fingerprint:
+            are_routes_equivalent = False
+        else:
+            are_routes_equivalent = self._routes == other._routes
         return are_routes_equivalent
 
     __ne__ = are_objects_inequivalent
 
+    def __hash__(self):
+        return self._fingerprint
+
+    def __reduce__(self):
+        return _reduce_route_graph(self)
+
     def __len__(self):
-        # Cannot call tuple() or list() on self because these functions use
-        # len() internally, causing an infinite recursion
-        routes = set(self)
-        routes_count = len(routes)
-        return routes_count
+        return len(self._routes)
 
-    @abstractmethod
     def __iter__(self):
-        pass  # pragma: no cover
+        return iter(self._routes)
+
+    def __reversed__(self):
+        return reversed(self._routes)
+
+    def _get_route_name_set(self):
+        if self._route_names is None:
+            self._route_names = _collect_route_names(self._routes)
+        return self._route_names
 
 
 class _RouteCollection(_BaseRouteCollection):
 
+    __slots__ = ()
+
     def __init__(self, routes):
         super(_RouteCollection, self).__init__()
 
-        self._routes = []
-        for route in routes:
-            self._add_route(route)
+        if _is_validation_deferred():
+            self._routes = tuple(routes)
+            self._route_names = None
+        else:
+            self._routes = []
+            self._route_names = set()
+            for route in routes:
+                self._add_route(route)
+
+            self._routes = tuple(self._routes)
+
+        self._fingerprint = _get_route_collection_fingerprint(self._routes)
+        self._has_unhashable_views = any(
+            route._has_unhashable_views for route in self._routes
+            )
 
     def _add_route(self, route):
         self._validate_new_route(route)
         self._routes.append(route)
+        self._route_names = _merge_route_name_sets(
+            self._route_names,
+            _take_route_name_set(route),
+            )
 
     def _validate_new_route(self, route):
         _require_route_names_uniqueness_in_collection(self, route)
@@ -206,40 +568,114 @@ class _RouteCollection(_BaseRouteCollection):
         if route in self:
             raise DuplicatedRouteError(repr(route))
 
+    def _validate_routes(self):
+        unnamed_routes = set()
+        for route in self._routes:
+            if route.name:
+                continue
+
+            if route in unnamed_routes:
+                raise DuplicatedRouteError(repr(route))
+            unnamed_routes.add(route)
+
+    def _get_pickled_dependencies(self):
+        return self._routes
+
+    def _get_pickled_record(self, record_indices_by_object_id):
+        pickled_record = (
+            _PICKLED_ROUTE_COLLECTION,
+            _get_pickled_record_indices(
+                self._routes,
+                record_indices_by_object_id,
+                ),
+            )
+        return pickled_record
+
     def __repr__(self):
         repr_ = '{class_name}({routes})'.format(
             class_name=self.__class__.__name__,
-            routes=self._routes,
+            routes=list(self._routes),
             )
         return repr_
 
-    def __iter__(self):
-        return iter(self._routes)
-
 
 class _RouteSpecialization(_BaseRoute):
 
+    __slots__ = (
+        '_view',
+        '_generalized_route',
+        '_root_generalization',
+        '_name',
+        '_effective_view',
+        '_path_segment',
+        '_effective_path_segment',
+        )
+
     def __init__(
         self,
         view,
         generalized_route,
         additional_sub_routes,
         specialized_sub_routes,
+        path_segment=None,
         ):
-        for sub_route in chain(additional_sub_routes, specialized_sub_routes):
-            sub_route._require_route_name_not_in_route(#pylint:disable=W0212
-                generalized_route.name,
-                )
+        is_validation_deferred = _is_validation_deferred()
+        if not is_validation_deferred:
+            sub_routes = chain(additional_sub_routes, specialized_sub_routes)
+            for sub_route in sub_routes:
+                sub_route._require_route_name_not_in_route(
+                    generalized_route.name,
+                    )
 
         super(_RouteSpecialization, self).__init__()
         self._view = view
         self._generalized_route = generalized_route
+        self._root_generalization = \
+            _get_route_root_generalization(generalized_route)
+
+        # The name, view and path segment are resolved just once, so that
+        # they do not depend on the length of the chain of generalizations
+        self._name = generalized_route.name
+        if view:
+            self._effective_view = view
+        else:
+            self._effective_view = generalized_route.view
+        self._path_segment = path_segment
+        if path_segment is None:
+            self._effective_path_segment = generalized_route.path_segment
+        else:
+            self._effective_path_segment = path_segment
 
-        self.sub_routes = _RouteSpecializationCollection(
+        if is_validation_deferred:
+            generalized_route_names = None
+        else:
+            # The generalization is shared with the rest of its tree and
+            # with its other specializations, so its names are copied
+            generalized_route_names = \
+                set(_peek_route_name_set(generalized_route))
+            generalized_route_names.discard(generalized_route.name)
+        self.sub_routes = _create_route_specialization_collection(
             generalized_route.sub_routes,
             specialized_sub_routes,
             additional_sub_routes,
+            generalized_route_names,
             )
+        if not is_validation_deferred:
+            self._take_sub_route_name_set()
+
+        view_fingerprint = _get_view_fingerprint(self.view)
+        self._fingerprint = hash((
+            view_fingerprint,
+            generalized_route.name,
+            self.path_segment,
+            self.sub_routes._fingerprint,
+            generalized_route._fingerprint,
+            ))
+        self._has_unhashable_views = any((
+            view_fingerprint is None,
+            self.sub_routes._has_unhashable_views,
+            generalized_route._has_unhashable_views,
+            ))
 
     def __repr__(self):
         repr_ = '<Specialization of {!r} with view {!r}>'.format(
@@ -251,7 +687,7 @@ class _RouteSpecialization(_BaseRoute):
     def __eq__(self, other):
         are_equivalent = super(_RouteSpecialization, self).__eq__(other)
 
-        if are_equivalent != NotImplemented:
+        if are_equivalent is True:
             other_generalization = \
                 _RouteSpecialization.get_route_generalization(other)
             are_generalized_routes_equivalent = \
@@ -261,162 +697,854 @@ class _RouteSpecialization(_BaseRoute):
 
         return are_equivalent
 
+    __hash__ = _BaseRoute.__hash__
+
     @property
     def name(self):
-        name = self._generalized_route.name
-        return name
+        return self._name
 
     @property
     def view(self):
-        if self._view:
-            view = self._view
-        else:
-            view = self._generalized_route.view
+        return self._effective_view
 
-        return view
+    @property
+    def path_segment(self):
+        return self._effective_path_segment
 
     @staticmethod
     def get_route_generalization(route):
         return route._generalized_route  #pylint:disable=W0212
 
+    def _get_pickled_dependencies(self):
+        pickled_dependencies = (self._generalized_route,) + \
+            self.sub_routes._additional_routes + \
+            self.sub_routes._specialized_routes
+        return pickled_dependencies
+
+    def _get_pickled_record(self, record_indices_by_object_id):
+        pickled_record = (
+            _PICKLED_ROUTE_SPECIALIZATION,
+            self._view,
+            record_indices_by_object_id[id(self._generalized_route)],
+            _get_pickled_record_indices(
+                self.sub_routes._additional_routes,
+                record_indices_by_object_id,
+                ),
+            _get_pickled_record_indices(
+                self.sub_routes._specialized_routes,
+                record_indices_by_object_id,
+                ),
+            self._path_segment,
+            )
+        return pickled_record
+
 
 class _RouteSpecializationCollection(_BaseRouteCollection):
 
+    __slots__ = (
+        '_generalized_routes',
+        '_specialized_routes',
+        '_specialized_routes_by_generalization',
+        '_additional_routes',
+        )
+
     def __init__(
         self,
         generalized_routes,
         specialized_routes,
         additional_routes,
+        generalized_route_names=None,
         ):
         super(_RouteSpecializationCollection, self).__init__()
 
         self._generalized_routes = generalized_routes
+        self._additional_routes = tuple(additional_routes)
+        self._specialized_routes = tuple(specialized_routes)
+        self._specialized_routes_by_generalization = {}
+
+        if _is_validation_deferred():
+            self._route_names = None
+            for specialized_route in self._specialized_routes:
+                self._add_specialized_route(specialized_route)
+        else:
+            self._add_validated_sub_routes(generalized_route_names)
+
+        # Sub-routes cannot be changed once the collection is initialized,
+        # so they are resolved just once
+        if self._specialized_routes_by_generalization:
+            self._routes = tuple(chain(
+                self._get_generalized_routes_as_specializations(),
+                self._additional_routes,
+                ))
+            self._has_unhashable_views = any(
+                route._has_unhashable_views for route in self._routes
+                )
+        else:
+            # Collections that only add routes (e.g., in a chain of
+            # specializations) take the generalized routes as they are
+            self._routes = tuple(generalized_routes) + self._additional_routes
+            self._has_unhashable_views = \
+                generalized_routes._has_unhashable_views or any(
+                    route._has_unhashable_views
+                    for route in self._additional_routes
+                    )
 
-        self._additional_routes = additional_routes
-        for additional_route in additional_routes:
-            _require_route_names_uniqueness_in_collection(
-                generalized_routes,
+        self._fingerprint = _get_route_collection_fingerprint(self._routes)
+
+    def _add_validated_sub_routes(self, generalized_route_names):
+        # The names of the generalized routes are never taken from them, as
+        # they are shared by every specialization of their parent
+        generalized_routes = self._generalized_routes
+        if generalized_route_names is None:
+            generalized_route_names = \
+                set(generalized_routes._get_route_name_set())
+
+        for additional_route in self._additional_routes:
+            _require_route_names_uniqueness_in_set(
+                generalized_route_names,
                 additional_route,
                 )
 
-        self._specialized_routes = []
-        for specialized_route in specialized_routes:
+        self._route_names = generalized_route_names
+        for additional_route in self._additional_routes:
+            self._route_names = _merge_route_name_sets(
+                self._route_names,
+                _take_route_name_set(additional_route),
+                )
+
+        generalized_routes_set = frozenset(generalized_routes)
+        for specialized_route in self._specialized_routes:
+            self._validate_specialized_route(
+                specialized_route,
+                generalized_routes_set,
+                )
             self._add_specialized_route(specialized_route)
 
+            # The names of a specialization are a superset of those in the
+            # generalization it replaces
+            self._route_names = _merge_route_name_sets(
+                self._route_names,
+                _take_route_name_set(specialized_route),
+                )
+
     def _add_specialized_route(self, specialized_route):
-        self._validate_specialized_route(specialized_route)
-        self._specialized_routes.append(specialized_route)
+        root_generalization = \
+            _get_route_root_generalization(specialized_route)
+        self._specialized_routes_by_generalization.setdefault(
+            root_generalization,
+            specialized_route,
+            )
 
-    def _validate_specialized_route(self, specialized_route):
-        self._require_route_to_be_specialization(specialized_route)
+    def _validate_specialized_route(
+        self,
+        specialized_route,
+        generalized_routes,
+        ):
+        self._validate_specialization(
+            specialized_route,
+            generalized_routes,
+            self._specialized_routes_by_generalization,
+            )
+
+        _require_route_names_uniqueness_in_collection(self, specialized_route)
+
+    def _validate_routes(self):
+        generalized_routes = frozenset(self._generalized_routes)
+        specialized_routes_by_generalization = {}
+        for specialized_route in self._specialized_routes:
+            self._validate_specialization(
+                specialized_route,
+                generalized_routes,
+                specialized_routes_by_generalization,
+                )
+
+            root_generalization = \
+                _get_route_root_generalization(specialized_route)
+            specialized_routes_by_generalization.setdefault(
+                root_generalization,
+                specialized_route,
+                )
+
+    @classmethod
+    def _validate_specialization(
+        cls,
+        specialized_route,
+        generalized_routes,
+        specialized_routes_by_generalization,
+        ):
+        cls._require_route_to_be_specialization(specialized_route)
 
         specialized_route_generalization = \
             _RouteSpecialization.get_route_generalization(specialized_route)
-        self._require_generalized_route_in_collection(
+        cls._require_generalized_route_in_collection(
             specialized_route_generalization,
+            generalized_routes,
             )
-        self._require_route_not_already_specialized(
+        cls._require_route_not_already_specialized(
             specialized_route_generalization,
+            specialized_routes_by_generalization,
             )
 
-        _require_route_names_uniqueness_in_collection(self, specialized_route)
-
     @staticmethod
     def _require_route_to_be_specialization(route):
         if not _is_route_specialized(route):
             exc_message = 'Route {!r} is not specialized'.format(route)
             raise InvalidSpecializationError(exc_message)
 
-    def _require_generalized_route_in_collection(self, generalized_route):
-        for existing_generalized_route in self._generalized_routes:
-            is_specialization_valid = _is_specialization_of_route(
-                generalized_route,
-                existing_generalized_route,
-                )
-            if is_specialization_valid:
-                break
-        else:
+    @staticmethod
+    def _require_generalized_route_in_collection(
+        generalized_route,
+        generalized_routes,
+        ):
+        root_generalization = \
+            _get_route_root_generalization(generalized_route)
+        if root_generalization not in generalized_routes:
             exc_message = 'No such generalization {!r}'.format(
                 generalized_route,
                 )
             raise InvalidSpecializationError(exc_message)
 
-    def _require_route_not_already_specialized(self, route):
-        for existing_specialized_route in self._specialized_routes:
-            if _is_specialization_of_route(existing_specialized_route, route):
-                raise InvalidSpecializationError(
-                    'Route {!r} cannot be specialized twice'.format(route)
-                    )
+    @staticmethod
+    def _require_route_not_already_specialized(
+        route,
+        specialized_routes_by_generalization,
+        ):
+        if route in specialized_routes_by_generalization:
+            raise InvalidSpecializationError(
+                'Route {!r} cannot be specialized twice'.format(route)
+                )
+
+    def _get_pickled_dependencies(self):
+        pickled_dependencies = (self._generalized_routes,) + \
+            self._specialized_routes + \
+            self._additional_routes
+        return pickled_dependencies
+
+    def _get_pickled_record(self, record_indices_by_object_id):
+        pickled_record = (
+            _PICKLED_ROUTE_SPECIALIZATION_COLLECTION,
+            record_indices_by_object_id[id(self._generalized_routes)],
+            _get_pickled_record_indices(
+                self._specialized_routes,
+                record_indices_by_object_id,
+                ),
+            _get_pickled_record_indices(
+                self._additional_routes,
+                record_indices_by_object_id,
+                ),
+            )
+        return pickled_record
 
     def __repr__(self):
         repr_ = '{}({!r}, {!r}, {!r})'.format(
             self.__class__.__name__,
             self._generalized_routes,
-            self._specialized_routes,
-            self._additional_routes,
+            list(self._specialized_routes),
+            list(self._additional_routes),
             )
         return repr_
 
-    def __iter__(self):
-        generalized_routes_as_specializations = \
-            self._get_generalized_routes_as_specializations()
-        all_sub_routes = chain(
-            generalized_routes_as_specializations,
-            self._additional_routes,
-            )
-        return all_sub_routes
-
     def _get_generalized_routes_as_specializations(self):
+        get_specialized_route = self._specialized_routes_by_generalization.get
         for generalized_route in self._generalized_routes:
-            route = self._get_specialized_route_for_generalization(
-                generalized_route,
+            yield get_specialized_route(generalized_route, generalized_route)
+
+
+def _create_route_collection(routes):
+    if routes:
+        route_collection = _RouteCollection(routes)
+    else:
+        route_collection = _EMPTY_ROUTE_COLLECTION
+    return route_collection
+
+
+def _create_route_specialization_collection(
+    generalized_routes,
+    specialized_routes,
+    additional_routes,
+    generalized_route_names=None,
+    ):
+    are_sub_routes_unchanged = \
+        not specialized_routes and not additional_routes
+    if generalized_routes is _EMPTY_ROUTE_COLLECTION and \
+        are_sub_routes_unchanged:
+        route_collection = _EMPTY_ROUTE_SPECIALIZATION_COLLECTION
+    else:
+        route_collection = _RouteSpecializationCollection(
+            generalized_routes,
+            specialized_routes,
+            additional_routes,
+            generalized_route_names,
+            )
+    return route_collection
+
+
+def _reduce_route_graph(root_object):
+    # The routes and collections reachable from the root are pickled as a flat
+    # list of records, each of which refers to the objects it depends on by
+    # their position in the list. Objects shared within the graph are only
+    # recorded once, and records are sorted so that every object can be
+    # created after its dependencies without recursion.
+    pickled_records = []
+    record_indices_by_object_id = {}
+    pending_objects = [(root_object, False)]
+    while pending_objects:
+        current_object, are_dependencies_recorded = pending_objects.pop()
+        if id(current_object) in record_indices_by_object_id:
+            continue
+
+        if are_dependencies_recorded:
+            pickled_record = current_object._get_pickled_record(
+                record_indices_by_object_id,
+                )
+            record_indices_by_object_id[id(current_object)] = \
+                len(pickled_records)
+            pickled_records.append(pickled_record)
+        else:
+            pending_objects.append((current_object, True))
+            pickled_dependencies = current_object._get_pickled_dependencies()
+            pending_objects.extend(
+                (pickled_dependency, False)
+                for pickled_dependency in reversed(pickled_dependencies)
                 )
-            yield route
 
-    def _get_specialized_route_for_generalization(self, generalized_route):
-        for specialized_route in self._specialized_routes:
-            if _is_specialization_of_route(specialized_route, generalized_route):
-                route = specialized_route
-                break
+    return _load_pickled_route_graph, (tuple(pickled_records),)
+
+
+def _get_pickled_record_indices(objects, record_indices_by_object_id):
+    record_indices = tuple(
+        record_indices_by_object_id[id(object_)] for object_ in objects
+        )
+    return record_indices
+
+
+def _load_pickled_route_graph(pickled_records):
+    # The graph was valid when it was pickled, so it is not validated again
+    loaded_objects = []
+    with deferred_validation():
+        for pickled_record in pickled_records:
+            load_pickled_object = _PICKLED_OBJECT_LOADERS[pickled_record[0]]
+            loaded_object = \
+                load_pickled_object(loaded_objects, *pickled_record[1:])
+            loaded_objects.append(loaded_object)
+
+    root_object = loaded_objects[-1]
+    return root_object
+
+
+def _load_pickled_route(
+    loaded_objects,
+    view,
+    name,
+    sub_route_indices,
+    path_segment,
+    ):
+    sub_routes = _get_loaded_objects(loaded_objects, sub_route_indices)
+    return Route(view, name, sub_routes, path_segment)
+
+
+def _load_pickled_route_specialization(
+    loaded_objects,
+    view,
+    generalized_route_index,
+    additional_sub_route_indices,
+    specialized_sub_route_indices,
+    path_segment,
+    ):
+    route_specialization = _RouteSpecialization(
+        view,
+        loaded_objects[generalized_route_index],
+        _get_loaded_objects(loaded_objects, additional_sub_route_indices),
+        _get_loaded_objects(loaded_objects, specialized_sub_route_indices),
+        path_segment,
+        )
+    return route_specialization
+
+
+def _load_pickled_route_collection(loaded_objects, route_indices):
+    routes = _get_loaded_objects(loaded_objects, route_indices)
+    return _create_route_collection(routes)
+
+
+def _load_pickled_route_specialization_collection(
+    loaded_objects,
+    generalized_routes_index,
+    specialized_route_indices,
+    additional_route_indices,
+    ):
+    route_collection = _create_route_specialization_collection(
+        loaded_objects[generalized_routes_index],
+        _get_loaded_objects(loaded_objects, specialized_route_indices),
+        _get_loaded_objects(loaded_objects, additional_route_indices),
+        )
+    return route_collection
+
+
+def _get_loaded_objects(loaded_objects, record_indices):
+    loaded_objects_subset = \
+        tuple(map(loaded_objects.__getitem__, record_indices))
+    return loaded_objects_subset
+
+
+def _get_route_root_generalization(route):
+    if _is_route_specialized(route):
+        root_generalization = route._root_generalization  #pylint:disable=W0212
+    else:
+        root_generalization = route
+    return root_generalization
+
+
+def _flatten_route_tree(route):
+    # Routes are flattened bottom-up, and those without specializations in
+    # them are reused as they are
+    flattened_routes_by_id = {}
+    for current_route, _, _ in route.walk('post'):
+        if id(current_route) in flattened_routes_by_id:
+            continue
+
+        sub_routes = tuple(current_route.sub_routes)
+        flattened_sub_routes = tuple(
+            flattened_routes_by_id[id(sub_route)] for sub_route in sub_routes
+            )
+        are_sub_routes_flat = all(
+            flattened_sub_route is sub_route
+            for flattened_sub_route, sub_route
+            in zip(flattened_sub_routes, sub_routes)
+            )
+        if are_sub_routes_flat and not _is_route_specialized(current_route):
+            flattened_route = current_route
         else:
-            route = generalized_route
+            # The tree is already valid
+            with deferred_validation():
+                flattened_route = Route(
+                    current_route.view,
+                    current_route.name,
+                    flattened_sub_routes,
+                    current_route.path_segment,
+                    )
+        flattened_routes_by_id[id(current_route)] = flattened_route
 
-        return route
+    return flattened_routes_by_id[id(route)]
 
 
-def _is_specialization_of_route(specialized_route, generalized_route):
-    if _is_route_specialized(specialized_route):
-        specialized_route_generalization = \
-            _RouteSpecialization.get_route_generalization(specialized_route)
-        is_specialization_of_route = _is_specialization_of_route(
-            specialized_route_generalization,
-            generalized_route,
+class _RoutePathIndex(object):
+    # Every route in the tree is numbered, and the parent and position of each
+    # are recorded, so that the ancestors of a named route are found in time
+    # proportional to its depth. Indices are never changed once built, so
+    # trees derived by updates share them when their shape is the same.
+
+    __slots__ = (
+        '_node_indices_by_name',
+        '_parent_node_indices',
+        '_sub_route_positions',
+        '_route_count',
+        )
+
+    def __init__(
+        self,
+        node_indices_by_name,
+        parent_node_indices,
+        sub_route_positions,
+        route_count,
+        ):
+        super(_RoutePathIndex, self).__init__()
+
+        self._node_indices_by_name = node_indices_by_name
+        self._parent_node_indices = parent_node_indices
+        self._sub_route_positions = sub_route_positions
+        self._route_count = route_count
+
+    @classmethod
+    def build(cls, route):
+        route_path_index = cls({}, [None], [None], 0)
+        route_path_index._add_route(route, 0)
+        return route_path_index
+
+    def __contains__(self, route_name):
+        return route_name in self._node_indices_by_name
+
+    def get_route_name_set(self):
+        return set(self._node_indices_by_name)
+
+    def get_route_path(self, route, route_name):
+        if not route_name or route_name not in self._node_indices_by_name:
+            exc_message = 'self {!r} does not contain one named {!r}'.format(
+                route.name,
+                route_name,
+                )
+            raise NonExistingRouteError(exc_message)
+
+        sub_route_positions = []
+        node_index = self._node_indices_by_name[route_name]
+        while node_index:
+            sub_route_positions.append(self._sub_route_positions[node_index])
+            node_index = self._parent_node_indices[node_index]
+
+        route_path = [route]
+        for sub_route_position in reversed(sub_route_positions):
+            sub_routes = route_path[-1].sub_routes
+            route_path.append(sub_routes._routes[sub_route_position])
+        return route_path
+
+    def derive(
+        self,
+        route_name,
+        replaced_route,
+        replaced_route_names,
+        new_route,
+        ):
+        # The arrays are copied as a whole, which is much cheaper than walking
+        # the tree again, and the new route takes the node of the one it
+        # replaces. The nodes of the rest of the replaced subtree are left
+        # behind, so the index is built from scratch once they outnumber the
+        # routes in the tree.
+        replaced_route_count = \
+            sum(1 for _ in walk_route_tree(replaced_route, 'pre'))
+        route_count = self._route_count - replaced_route_count
+        if self._route_count < len(self._parent_node_indices) - route_count:
+            return None
+
+        node_indices_by_name = self._node_indices_by_name.copy()
+        node_index = node_indices_by_name[route_name]
+        for replaced_route_name in replaced_route_names:
+            del node_indices_by_name[replaced_route_name]
+
+        route_path_index = self.__class__(
+            node_indices_by_name,
+            list(self._parent_node_indices),
+            list(self._sub_route_positions),
+            route_count,
+            )
+        route_path_index._add_route(new_route, node_index)
+        return route_path_index
+
+    def _add_route(self, route, node_index):
+        node_indices_by_name = self._node_indices_by_name
+        parent_node_indices = self._parent_node_indices
+        sub_route_positions = self._sub_route_positions
+        pending_routes = [(route, node_index)]
+        while pending_routes:
+            current_route, current_node_index = pending_routes.pop()
+            self._route_count += 1
+            if current_route.name:
+                node_indices_by_name[current_route.name] = current_node_index
+
+            for sub_route_position, sub_route in \
+                enumerate(current_route.sub_routes):
+                pending_routes.append((sub_route, len(parent_node_indices)))
+                parent_node_indices.append(current_node_index)
+                sub_route_positions.append(sub_route_position)
+
+
+def _get_route_inheritances(route_path):
+    # Routes that specializations get from their generalizations can only be
+    # replaced by specializations of them
+    route_inheritances = [False]
+    for route, sub_route in zip(route_path, route_path[1:]):
+        if _is_route_specialized(route):
+            additional_sub_routes = route.sub_routes._additional_routes
+            is_sub_route_inherited = not any(
+                additional_sub_route is sub_route
+                for additional_sub_route in additional_sub_routes
+                )
+        else:
+            is_sub_route_inherited = route_inheritances[-1]
+        route_inheritances.append(is_sub_route_inherited)
+    return route_inheritances
+
+
+def _replace_route_in_path(route_path, new_route):
+    # Only the ancestors of the replaced route are copied, so every other
+    # route is shared with the original tree and only the collections of the
+    # copies have to be validated again
+    route_inheritances = _get_route_inheritances(route_path)
+    new_sub_route = new_route
+    for route, is_route_inherited, sub_route in reversed(tuple(zip(
+        route_path,
+        route_inheritances,
+        route_path[1:],
+        ))):
+        with deferred_validation():
+            new_sub_route = _copy_route_with_sub_route_replaced(
+                route,
+                is_route_inherited,
+                sub_route,
+                new_sub_route,
+                )
+        new_sub_route.sub_routes._validate_routes()  #pylint:disable=W0212
+
+    return new_sub_route
+
+
+def _copy_route_with_sub_route_replaced(
+    route,
+    is_route_inherited,
+    sub_route,
+    new_sub_route,
+    ):
+    if _is_route_specialized(route):
+        additional_sub_routes = route.sub_routes._additional_routes
+        specialized_sub_routes = route.sub_routes._specialized_routes
+        if any(
+            additional_sub_route is sub_route
+            for additional_sub_route in additional_sub_routes
+            ):
+            additional_sub_routes = _replace_route_in_routes(
+                additional_sub_routes,
+                sub_route,
+                new_sub_route,
+                )
+        else:
+            specialized_sub_routes = tuple(
+                specialized_sub_route
+                for specialized_sub_route in specialized_sub_routes
+                if specialized_sub_route is not sub_route
+                ) + (new_sub_route,)
+
+        new_route = _RouteSpecialization(
+            route._view,
+            route._generalized_route,
+            additional_sub_routes,
+            specialized_sub_routes,
+            route._path_segment,
             )
+    elif is_route_inherited:
+        new_route = _RouteSpecialization(None, route, (), (new_sub_route,))
     else:
-        is_specialization_of_route = generalized_route == specialized_route
-    return is_specialization_of_route
+        new_sub_routes = _replace_route_in_routes(
+            route.sub_routes,
+            sub_route,
+            new_sub_route,
+            )
+        new_route = Route(
+            route.view,
+            route.name,
+            new_sub_routes,
+            route.path_segment,
+            )
+    return new_route
+
+
+def _copy_route_with_view(route, is_route_inherited, view):
+    if _is_route_specialized(route):
+        new_route = _RouteSpecialization(
+            view,
+            route._generalized_route,
+            route.sub_routes._additional_routes,
+            route.sub_routes._specialized_routes,
+            route._path_segment,
+            )
+    elif is_route_inherited:
+        new_route = _RouteSpecialization(view, route, (), ())
+    else:
+        new_route = Route(
+            view,
+            route.name,
+            route.sub_routes,
+            route.path_segment,
+            )
+    return new_route
+
+
+def _replace_route_in_routes(routes, replaced_route, new_route):
+    new_routes = tuple(
+        new_route if route is replaced_route else route for route in routes
+        )
+    return new_routes
+
+
+def _require_route_names_uniqueness_in_replacement(
+    route_path_index,
+    replaced_route_names,
+    new_route,
+    ):
+    # The rest of the tree is valid, so only the names brought in by the new
+    # route need checking
+    for new_route_name in new_route.iter_route_names():
+        if new_route_name in route_path_index and \
+            new_route_name not in replaced_route_names:
+            raise DuplicatedRouteError(new_route_name)
+
+
+def _index_routes_by_name(route):
+    # The first route found in a pre-order traversal wins, as it would when
+    # searching the tree recursively
+    routes_by_name = {}
+    for current_route, _, _ in route.walk():
+        routes_by_name.setdefault(current_route.name, current_route)
+    return routes_by_name
+
+
+def _index_routes_by_view(route):
+    # Hashable views are indexed by value, whilst the routes with unhashable
+    # views are kept aside to be compared by equality. The effective views of
+    # specializations are indexed, and the routes for each view are kept in
+    # pre-order.
+    routes_by_view = {}
+    unhashable_view_routes = []
+    for current_route, _, _ in route.walk():
+        view = current_route.view
+        if _get_view_fingerprint(view) is None:
+            unhashable_view_routes.append(current_route)
+        else:
+            routes_by_view.setdefault(view, []).append(current_route)
+    return routes_by_view, unhashable_view_routes
 
 
 def _is_route_specialized(route):
     return isinstance(route, _RouteSpecialization)
 
 
+def _validate_route_tree(route):
+    # Names must be unique across the whole tree, which is equivalent to
+    # checking each route against its siblings and ancestors, so the tree is
+    # traversed just once
+    route_names = set()
+    for current_route, _, _ in route.walk():
+        route_name = current_route.name
+        if route_name:
+            if route_name in route_names:
+                raise DuplicatedRouteError(route_name)
+            route_names.add(route_name)
+
+        current_route.sub_routes._validate_routes()  #pylint:disable=W0212
+
+
 def _require_route_names_uniqueness_in_collection(route_collection, route):
-    route_collection_route_names = []
-    for existing_route in route_collection:
-        route_collection_route_names.extend(existing_route.get_route_names())
+    _require_route_names_uniqueness_in_set(
+        route_collection._get_route_name_set(),
+        route,
+        )
 
+
+def _require_route_names_uniqueness_in_set(route_names, route):
+    candidate_sub_route_names = route._get_route_name_set()
     if _is_route_specialized(route):
         route_generalization = \
             _RouteSpecialization.get_route_generalization(route)
-        generalized_route_names = route_generalization.get_route_names()
+        candidate_sub_route_names = candidate_sub_route_names - \
+            _peek_route_name_set(route_generalization)
+
+    duplicated_route_names = candidate_sub_route_names & route_names
+    if duplicated_route_names:
+        # Report the same name as a depth-first search would find first
+        for candidate_sub_route_name in route.iter_route_names():
+            if candidate_sub_route_name in duplicated_route_names:
+                raise DuplicatedRouteError(candidate_sub_route_name)
+
+
+def _collect_route_names(routes):
+    # Subtrees whose names are already collected are not walked again. The
+    # names are only kept by the route or collection asking for them, so
+    # that there is no set of names at every level of the tree.
+    route_names = set()
+    pending_routes = list(routes)
+    while pending_routes:
+        route = pending_routes.pop()
+        if route._route_names is not None:
+            route_names.update(route._route_names)
+            continue
+
+        if route.name:
+            route_names.add(route.name)
+
+        sub_routes = route.sub_routes
+        if sub_routes._route_names is not None:
+            route_names.update(sub_routes._route_names)
+        else:
+            pending_routes.extend(sub_routes)
+    return route_names
+
+
+def _peek_route_name_set(route):
+    # Generalizations are shared, so they are not made to keep sets of names
+    # that only their specializations need
+    if route._route_names is None:
+        route_names = _collect_route_names((route,))
     else:
-        generalized_route_names = []
-
-    candidate_sub_route_names = route.get_route_names()
-    for candidate_sub_route_name in candidate_sub_route_names:
-        is_sub_route_name_duplicated = \
-            candidate_sub_route_name in route_collection_route_names and \
-                candidate_sub_route_name not in generalized_route_names
-        if is_sub_route_name_duplicated:
-            raise DuplicatedRouteError(candidate_sub_route_name)
+        route_names = route._route_names
+    return route_names
+
+
+def _take_route_name_set(route_or_collection):
+    # Sets of names are handed over to the parent instead of being copied,
+    # and the previous owner collects its names again if it ever needs them
+    route_names = route_or_collection._get_route_name_set()
+    route_or_collection._route_names = None
+    return route_names
+
+
+def _merge_route_name_sets(route_names_1, route_names_2):
+    # The smaller set is merged into the larger one, so each name is copied
+    # O(log n) times at most while a tree of n routes is built
+    if len(route_names_1) < len(route_names_2):
+        route_names_1, route_names_2 = route_names_2, route_names_1
+    route_names_1.update(route_names_2)
+    return route_names_1
+
+
+def _get_view_fingerprint(view):
+    try:
+        view_fingerprint = hash(view)
+    except TypeError:
+        # Unhashable views can only be told apart by comparing them, so the
+        # fingerprints of the routes with them cannot be trusted on their own
+        view_fingerprint = None
+    return view_fingerprint
+
+
+def _get_route_collection_fingerprint(routes):
+    route_fingerprints = tuple(route._fingerprint for route in routes)
+    route_collection_fingerprint = hash(route_fingerprints)
+    return route_collection_fingerprint
+
+
+_EMPTY_ROUTE_COLLECTION = _RouteCollection(())
+
+
+_EMPTY_ROUTE_SPECIALIZATION_COLLECTION = \
+    _RouteSpecializationCollection(_EMPTY_ROUTE_COLLECTION, (), ())
+
+
+# The position of the loaders is part of the pickle format
+_PICKLED_ROUTE = 0
+
+
+_PICKLED_ROUTE_SPECIALIZATION = 1
+
+
+_PICKLED_ROUTE_COLLECTION = 2
+
+
+_PICKLED_ROUTE_SPECIALIZATION_COLLECTION = 3
+
+
+_PICKLED_OBJECT_LOADERS = (
+    _load_pickled_route,
+    _load_pickled_route_specialization,
+    _load_pickled_route_collection,
+    _load_pickled_route_specialization_collection,
+    )
+
+
+# These are the hot paths of routes, and this must be kept in sync with them
+# as they move
+_INSTRUMENTED_FUNCTIONS = (
+    (_BaseRoute, '__eq__'),
+    (_BaseRoute, 'find_route'),
+    (_BaseRoute, 'get_route_by_name'),
+    (_BaseRoute, 'get_route_names'),
+    (_BaseRoute, 'get_routes_by_view'),
+    (_BaseRoute, 'iter_route_names'),
+    (_BaseRoute, '_get_route_name_set'),
+    (_BaseRouteCollection, '_get_route_name_set'),
+    (_RouteSpecializationCollection, '_validate_specialized_route'),
+    (_RoutePathIndex, 'derive'),
+    (_RoutePathIndex, 'get_route_path'),
+    (sys.modules[__name__], '_collect_route_names'),
+    (sys.modules[__name__], '_index_routes_by_name'),
+    (sys.modules[__name__], '_index_routes_by_view'),
+    (sys.modules[__name__], '_merge_route_name_sets'),
+    (sys.modules[__name__], '_require_route_names_uniqueness_in_collection'),
+    (sys.modules[__name__], '_validate_route_tree'),
+    )
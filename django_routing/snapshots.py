@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from array import array
+from hashlib import sha256
+from importlib import import_module
+import json
+from logging import getLogger
+import mmap
+import os
+from struct import Struct
+import sys
+from tempfile import NamedTemporaryFile
+
+try:
+    from os import replace as replace_file
+except ImportError:
+    # On Python 2, renaming a file replaces the destination atomically on
+    # POSIX systems only
+    from os import rename as replace_file
+
+from django_routing.compilation import CompiledRouteTree
+from django_routing.exceptions import RouteSnapshotError
+
+
+_LOGGER = getLogger(__name__)
+
+
+_SNAPSHOT_MAGIC = b'DJRS'
+
+
+_SNAPSHOT_FORMAT_VERSION = 2
+
+
+# The header is always little-endian, whereas the structure arrays use the
+# native byte order so that they can be memory-mapped as they are
+_SNAPSHOT_HEADER_STRUCT = Struct('<4sH1sB32sII')
+
+
+_NODE_INDEX_ARRAY_TYPECODE = 'i'
+
+
+_NODE_INDEX_ITEM_SIZE = array(_NODE_INDEX_ARRAY_TYPECODE).itemsize
+
+
+_NATIVE_BYTE_ORDER = sys.byteorder[0].encode('ascii')
+
+
+_STRUCTURE_ARRAY_ATTRIBUTE_NAMES = (
+    '_parent_indices',
+    '_first_child_indices',
+    '_next_sibling_indices',
+    '_subtree_end_indices',
+    '_name_indices',
+    '_view_indices',
+    '_path_segment_indices',
+    )
+
+
+_STRUCTURE_ARRAYS_ALIGNMENT = 8
+
+
+# Memory views can only be cast on Python 3, so the structure arrays are
+# copied out of the snapshot on Python 2
+_ARE_STRUCTURE_ARRAYS_MAPPED = hasattr(memoryview, 'cast')
+
+
+def save_route_tree_snapshot(route_tree, snapshot_path, source_hash):
+    if not isinstance(route_tree, CompiledRouteTree):
+        route_tree = route_tree.compile()
+
+    #pylint:disable=W0212
+    view_paths = [_get_view_path(view) for view in route_tree._views]
+    table = {
+        'names': list(route_tree._names),
+        'views': view_paths,
+        'path_segments': list(route_tree._path_segments),
+        }
+    table_bytes = json.dumps(table).encode('utf-8')
+
+    header_bytes = _SNAPSHOT_HEADER_STRUCT.pack(
+        _SNAPSHOT_MAGIC,
+        _SNAPSHOT_FORMAT_VERSION,
+        _NATIVE_BYTE_ORDER,
+        _NODE_INDEX_ITEM_SIZE,
+        _get_source_digest(source_hash),
+        len(route_tree),
+        len(table_bytes),
+        )
+    padding_length = \
+        -(len(header_bytes) + len(table_bytes)) % _STRUCTURE_ARRAYS_ALIGNMENT
+
+    # The snapshot is replaced atomically so that concurrent workers never
+    # load a partially written one
+    snapshot_directory_path = os.path.dirname(os.path.abspath(snapshot_path))
+    snapshot_file = NamedTemporaryFile(
+        dir=snapshot_directory_path,
+        delete=False,
+        )
+    try:
+        with snapshot_file:
+            snapshot_file.write(header_bytes)
+            snapshot_file.write(table_bytes)
+            snapshot_file.write(b'\0' * padding_length)
+            for attribute_name in _STRUCTURE_ARRAY_ATTRIBUTE_NAMES:
+                structure_array = array(
+                    _NODE_INDEX_ARRAY_TYPECODE,
+                    getattr(route_tree, attribute_name),
+                    )
+                snapshot_file.write(_get_array_bytes(structure_array))
+        replace_file(snapshot_file.name, snapshot_path)
+    except BaseException:
+        os.remove(snapshot_file.name)
+        raise
+
+
+def load_route_tree_snapshot(snapshot_path, source_hash):
+    with open(snapshot_path, 'rb') as snapshot_file:
+        try:
+            snapshot_buffer = mmap.mmap(
+                snapshot_file.fileno(),
+                0,
+                access=mmap.ACCESS_READ,
+                )
+        except ValueError:
+            raise RouteSnapshotError('Snapshot {!r} is empty'.format(
+                snapshot_path,
+                ))
+
+    # The snapshot stays mapped for as long as the route tree uses it
+    try:
+        route_tree = _read_route_tree_snapshot(
+            snapshot_buffer,
+            snapshot_path,
+            source_hash,
+            )
+    except BaseException:
+        snapshot_buffer.close()
+        raise
+
+    return route_tree
+
+
+def _read_route_tree_snapshot(snapshot_buffer, snapshot_path, source_hash):
+    if len(snapshot_buffer) < _SNAPSHOT_HEADER_STRUCT.size:
+        raise RouteSnapshotError('Snapshot {!r} is truncated'.format(
+            snapshot_path,
+            ))
+
+    magic, format_version, byte_order, item_size, source_digest, \
+        node_count, table_length = \
+        _SNAPSHOT_HEADER_STRUCT.unpack_from(snapshot_buffer)
+    if magic != _SNAPSHOT_MAGIC or \
+        format_version != _SNAPSHOT_FORMAT_VERSION or \
+        byte_order != _NATIVE_BYTE_ORDER or \
+        item_size != _NODE_INDEX_ITEM_SIZE:
+        raise RouteSnapshotError(
+            'Snapshot {!r} has an unsupported format'.format(snapshot_path),
+            )
+    if source_digest != _get_source_digest(source_hash):
+        raise RouteSnapshotError('Snapshot {!r} is stale'.format(
+            snapshot_path,
+            ))
+
+    table_offset = _SNAPSHOT_HEADER_STRUCT.size
+    structure_arrays_offset = table_offset + table_length
+    structure_arrays_offset += \
+        -structure_arrays_offset % _STRUCTURE_ARRAYS_ALIGNMENT
+    structure_array_size = node_count * _NODE_INDEX_ITEM_SIZE
+    snapshot_size = structure_arrays_offset + \
+        structure_array_size * len(_STRUCTURE_ARRAY_ATTRIBUTE_NAMES)
+    if len(snapshot_buffer) != snapshot_size:
+        raise RouteSnapshotError('Snapshot {!r} is truncated'.format(
+            snapshot_path,
+            ))
+
+    table_bytes = snapshot_buffer[table_offset:table_offset + table_length]
+    try:
+        table = json.loads(table_bytes.decode('utf-8'))
+        route_names = tuple(table['names'])
+        view_paths = list(table['views'])
+        path_segments = tuple(table['path_segments'])
+    except (ValueError, TypeError, KeyError):
+        # JSON and Unicode decoding errors are both value errors
+        raise RouteSnapshotError('Snapshot {!r} is corrupt'.format(
+            snapshot_path,
+            ))
+
+    structure_arrays = []
+    for array_index in range(len(_STRUCTURE_ARRAY_ATTRIBUTE_NAMES)):
+        array_offset = \
+            structure_arrays_offset + array_index * structure_array_size
+        array_end_offset = array_offset + structure_array_size
+        structure_arrays.append(_get_structure_array(
+            snapshot_buffer,
+            array_offset,
+            array_end_offset,
+            ))
+
+    route_tree = CompiledRouteTree(
+        *structure_arrays,
+        names=route_names,
+        views=_LazyViewTable(view_paths),
+        path_segments=path_segments,
+        )
+    return route_tree
+
+
+def load_or_build_route_tree(snapshot_path, build_route_tree, source_hash):
+    try:
+        route_tree = load_route_tree_snapshot(snapshot_path, source_hash)
+    except (IOError, OSError, RouteSnapshotError):
+        route_tree = build_route_tree()
+        if not isinstance(route_tree, CompiledRouteTree):
+            route_tree = route_tree.compile()
+
+        # The snapshot only saves time, so the route tree is still usable if
+        # it cannot be saved (e.g., because the directory is read-only)
+        try:
+            save_route_tree_snapshot(route_tree, snapshot_path, source_hash)
+        except (IOError, OSError, RouteSnapshotError):
+            _LOGGER.warning(
+                'Could not save the route snapshot %r',
+                snapshot_path,
+                exc_info=True,
+                )
+    return route_tree
+
+
+class _LazyViewTable(object):
+
+    __slots__ = ('_view_paths', '_views')
+
+    def __init__(self, view_paths):
+        super(_LazyViewTable, self).__init__()
+
+        self._view_paths = view_paths
+        self._views = [None] * len(view_paths)
+
+    def __len__(self):
+        return len(self._view_paths)
+
+    def __getitem__(self, view_index):
+        view = self._views[view_index]
+        view_path = self._view_paths[view_index]
+        if view is None and view_path is not None:
+            view = _import_view(view_path)
+            if view is None:
+                raise RouteSnapshotError(
+                    'View {!r} can no longer be imported'.format(view_path),
+                    )
+            self._views[view_index] = view
+        return view
+
+
+def _get_structure_array(snapshot_buffer, array_offset, array_end_offset):
+    if _ARE_STRUCTURE_ARRAYS_MAPPED:
+        array_memoryview = \
+            memoryview(snapshot_buffer)[array_offset:array_end_offset]
+        structure_array = array_memoryview.cast(_NODE_INDEX_ARRAY_TYPECODE)
+    else:
+        structure_array = array(_NODE_INDEX_ARRAY_TYPECODE)
+        structure_array.fromstring(
+            snapshot_buffer[array_offset:array_end_offset],
+            )
+    return structure_array
+
+
+def _get_array_bytes(array_):
+    try:
+        array_bytes = array_.tobytes()
+    except AttributeError:
+        # Python 2
+        array_bytes = array_.tostring()
+    return array_bytes
+
+
+def _get_source_digest(source_hash):
+    if not isinstance(source_hash, bytes):
+        source_hash = source_hash.encode('utf-8')
+    return sha256(source_hash).digest()
+
+
+def _get_view_path(view):
+    if view is None:
+        return None
+
+    view_qualified_name = getattr(view, '__qualname__', None) or \
+        getattr(view, '__name__', None)
+    view_module_name = getattr(view, '__module__', None)
+    if view_qualified_name is None or view_module_name is None:
+        view_path = None
+    else:
+        view_path = '{}.{}'.format(view_module_name, view_qualified_name)
+
+    # Only views that can be imported back can be stored in a snapshot
+    if view_path is None or _import_view(view_path) is not view:
+        raise RouteSnapshotError(
+            'View {!r} cannot be imported by its dotted path'.format(view),
+            )
+    return view_path
+
+
+def _import_view(view_path):
+    # The module path is the longest importable prefix of the dotted path,
+    # since the view may be nested in classes
+    view_path_parts = view_path.split('.')
+    for module_path_length in range(len(view_path_parts) - 1, 0, -1):
+        module_path = '.'.join(view_path_parts[:module_path_length])
+        try:
+            view = import_module(module_path)
+        except ImportError:
+            continue
+
+        try:
+            for attribute_name in view_path_parts[module_path_length:]:
+                view = getattr(view, attribute_name)
+        except AttributeError:
+            view = None
+        return view
+
+    return None
@@ -36,7 +36,7 @@ setup(
     author_email='2degrees-floss@googlegroups.com',
     url='http://packages.python.org/django-routing/',
     license='BSD (http://dev.2degreesnetwork.com/p/2degrees-license.html)',
-    packages=find_packages(exclude=['tests']),
+    packages=find_packages(exclude=['tests', 'benchmarks', 'benchmarks.*']),
     tests_require=['coverage', 'nose'],
     install_requires=[],
     test_suite='nose.collector',
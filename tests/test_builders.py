@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from nose.tools import eq_
+
+from django_routing.builders import RouteTreeBuilder
+from django_routing.compilation import CompiledRouteTree
+from django_routing.exceptions import InvalidRouteSpecificationError
+from django_routing.routes import DuplicatedRouteError
+from django_routing.routes import NonExistingRouteError
+from django_routing.routes import Route
+
+from tests.assertions import assert_raises_substring
+from tests.fixtures import FAKE_ROUTE_NAME
+from tests.fixtures import FAKE_VIEW
+
+
+class TestSpecifications(object):
+
+    def test_tuple_specification(self):
+        route_tree_builder = RouteTreeBuilder(
+            (FAKE_VIEW, FAKE_ROUTE_NAME, [(None, 'sub_route')]),
+            )
+        route = route_tree_builder.build()
+
+        expected_route = \
+            Route(FAKE_VIEW, FAKE_ROUTE_NAME, [Route(None, 'sub_route')])
+        eq_(expected_route, route)
+
+    def test_dict_specification(self):
+        route_tree_builder = RouteTreeBuilder({
+            'view': FAKE_VIEW,
+            'name': FAKE_ROUTE_NAME,
+            'sub_routes': [{'name': 'sub_route'}],
+            })
+        route = route_tree_builder.build()
+
+        expected_route = \
+            Route(FAKE_VIEW, FAKE_ROUTE_NAME, [Route(None, 'sub_route')])
+        eq_(expected_route, route)
+
+    def test_path_segments(self):
+        route_tree_builder = RouteTreeBuilder({
+            'view': FAKE_VIEW,
+            'name': FAKE_ROUTE_NAME,
+            'path_segment': '',
+            'sub_routes': [(None, 'sub_route', (), 'articles')],
+            })
+        route = route_tree_builder.build()
+
+        expected_route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [Route(None, 'sub_route', path_segment='articles')],
+            path_segment='',
+            )
+        eq_(expected_route, route)
+
+    def test_sub_route_order(self):
+        route_tree_builder = RouteTreeBuilder(
+            (None, None, [(None, 'a', [(None, 'a1')]), (None, 'b')]),
+            )
+        route = route_tree_builder.build()
+
+        eq_(['a', 'a1', 'b'], route.get_route_names())
+
+    def test_invalid_specification(self):
+        route_tree_builder = RouteTreeBuilder((None, None, [(None,)]))
+
+        with assert_raises_substring(
+            InvalidRouteSpecificationError,
+            r'Invalid route specification \(None,\)',
+            ):
+            route_tree_builder.build()
+
+    def test_unknown_specification_keys(self):
+        route_tree_builder = RouteTreeBuilder({
+            'name': FAKE_ROUTE_NAME,
+            'subroutes': [{'name': 'sub_route'}],
+            })
+
+        with assert_raises_substring(
+            InvalidRouteSpecificationError,
+            r"Unknown keys \['subroutes'\]",
+            ):
+            route_tree_builder.build()
+
+    def test_duplicated_route_names(self):
+        route_tree_builder = RouteTreeBuilder(
+            (None, 'a', [(None, 'b', [(None, 'a')])]),
+            )
+
+        with assert_raises_substring(DuplicatedRouteError, 'a'):
+            route_tree_builder.build()
+
+    def test_equivalent_sibling_sub_routes_without_names(self):
+        route_tree_builder = RouteTreeBuilder(
+            (None, 'a', [(FAKE_VIEW, None), (None, 'b'), (FAKE_VIEW, None)]),
+            )
+
+        with assert_raises_substring(
+            DuplicatedRouteError,
+            repr(Route(FAKE_VIEW, None)),
+            ):
+            route_tree_builder.build()
+
+    def test_built_route_as_sub_route(self):
+        route_tree_builder = \
+            RouteTreeBuilder((None, 'a', [(None, None, [(None, 'b')])]))
+        route = route_tree_builder.build()
+
+        with assert_raises_substring(DuplicatedRouteError, 'b'):
+            Route(FAKE_VIEW, 'b', [route])
+        eq_(['c', 'a', 'b'], Route(FAKE_VIEW, 'c', [route]).get_route_names())
+
+    def test_deep_specification(self):
+        route_specification = (None, 'route_0')
+        for route_index in range(1, 5000):
+            route_name = 'route_{}'.format(route_index)
+            route_specification = (None, route_name, [route_specification])
+        route_tree_builder = RouteTreeBuilder(route_specification)
+
+        route = route_tree_builder.build()
+
+        eq_(Route(None, 'route_0'), route.get_route_by_name('route_0'))
+
+    def test_compilation(self):
+        route_tree_builder = RouteTreeBuilder(
+            (FAKE_VIEW, FAKE_ROUTE_NAME, [(None, 'sub_route')]),
+            )
+        compiled_route_tree = route_tree_builder.compile()
+
+        eq_(CompiledRouteTree, type(compiled_route_tree))
+        eq_(
+            [FAKE_ROUTE_NAME, 'sub_route'],
+            compiled_route_tree.get_route_names(),
+            )
+
+
+class TestRows(object):
+
+    def test_rows(self):
+        route_tree_builder = RouteTreeBuilder.from_rows([
+            (None, FAKE_ROUTE_NAME, FAKE_VIEW),
+            (FAKE_ROUTE_NAME, 'a', None),
+            ('a', 'a1', None),
+            (FAKE_ROUTE_NAME, 'b', None),
+            ])
+        route = route_tree_builder.build()
+
+        expected_route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [Route(None, 'a', [Route(None, 'a1')]), Route(None, 'b')],
+            )
+        eq_(expected_route, route)
+
+    def test_children_before_parents(self):
+        route_tree_builder = RouteTreeBuilder.from_rows([
+            ('a', 'a1', None),
+            (FAKE_ROUTE_NAME, 'a', None),
+            (None, FAKE_ROUTE_NAME, None),
+            ])
+        route = route_tree_builder.build()
+
+        eq_([FAKE_ROUTE_NAME, 'a', 'a1'], route.get_route_names())
+
+    def test_non_existing_parent(self):
+        with assert_raises_substring(
+            NonExistingRouteError,
+            "Parent route 'non_existing' does not exist",
+            ):
+            RouteTreeBuilder.from_rows(
+                [(None, FAKE_ROUTE_NAME, None), ('non_existing', 'a', None)],
+                )
+
+    def test_duplicated_route_names(self):
+        with assert_raises_substring(DuplicatedRouteError, 'a'):
+            RouteTreeBuilder.from_rows([(None, 'a', None), ('a', 'a', None)])
+
+    def test_multiple_roots(self):
+        with assert_raises_substring(
+            InvalidRouteSpecificationError,
+            'Expected one root route, found 2',
+            ):
+            RouteTreeBuilder.from_rows([(None, 'a', None), (None, 'b', None)])
+
+    def test_cyclic_rows(self):
+        with assert_raises_substring(
+            InvalidRouteSpecificationError,
+            r"Routes \['x', 'y'\] are not attached to the root",
+            ):
+            RouteTreeBuilder.from_rows([
+                (None, FAKE_ROUTE_NAME, None),
+                ('y', 'x', None),
+                ('x', 'y', None),
+                ])
+
+    def test_route_as_its_own_parent(self):
+        with assert_raises_substring(
+            InvalidRouteSpecificationError,
+            r"Routes \['z'\] are not attached to the root",
+            ):
+            RouteTreeBuilder.from_rows(
+                [(None, FAKE_ROUTE_NAME, None), ('z', 'z', None)],
+                )
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from nose.tools import eq_
+from nose.tools import ok_
+
+from django_routing.compilation import CompiledRoute
+from django_routing.compilation import CompiledRouteTree
+from django_routing.routes import NonExistingRouteError
+from django_routing.routes import Route
+
+from tests.assertions import assert_equivalent
+from tests.assertions import assert_non_equivalent
+from tests.assertions import assert_raises_substring
+from tests.fixtures import FAKE_ROUTE_NAME
+from tests.fixtures import FAKE_SUB_ROUTES
+from tests.fixtures import FAKE_VIEW
+
+
+def test_compilation():
+    route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+    compiled_route_tree = route.compile()
+
+    ok_(isinstance(compiled_route_tree, CompiledRouteTree))
+    eq_(len(FAKE_SUB_ROUTES) + 1, len(compiled_route_tree))
+
+
+def test_tree_repr():
+    compiled_route_tree = Route(FAKE_VIEW, FAKE_ROUTE_NAME).compile()
+    eq_('<CompiledRouteTree with 1 routes>', repr(compiled_route_tree))
+
+
+def test_route_repr():
+    route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+    compiled_route = route.compile().root
+
+    expected_repr = \
+        '<CompiledRoute view={!r} name={!r} with {} sub-routes>'.format(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            len(FAKE_SUB_ROUTES),
+            )
+    eq_(expected_repr, repr(compiled_route))
+
+
+def test_iteration():
+    sub_route = Route(None, 'sub_route', [Route(FAKE_VIEW, 'leaf_route')])
+    route = Route(None, FAKE_ROUTE_NAME, [sub_route, Route(None, None)])
+
+    compiled_routes = tuple(route.compile())
+
+    eq_(
+        (FAKE_ROUTE_NAME, 'sub_route', 'leaf_route', None),
+        tuple(compiled_route.name for compiled_route in compiled_routes),
+        )
+
+
+class TestCompiledRoute(object):
+
+    def test_attributes(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME)
+        compiled_route = route.compile().root
+
+        ok_(isinstance(compiled_route, CompiledRoute))
+        eq_(FAKE_VIEW, compiled_route.view)
+        eq_(FAKE_ROUTE_NAME, compiled_route.name)
+        eq_((), compiled_route.sub_routes)
+        eq_(None, compiled_route.parent)
+
+    def test_path_segment(self):
+        route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [Route(None, 'sub_route', (), '<int:pk>')],
+            path_segment='',
+            )
+        compiled_route = route.compile().root
+
+        eq_('', compiled_route.path_segment)
+        eq_('<int:pk>', compiled_route.sub_routes[0].path_segment)
+
+    def test_walking(self):
+        sub_route = Route(None, 'sub_route', [Route(FAKE_VIEW, 'leaf_route')])
+        route = Route(None, FAKE_ROUTE_NAME, [sub_route, Route(None, None)])
+        compiled_route_tree = route.compile()
+
+        eq_(
+            [
+                (FAKE_ROUTE_NAME, 0, None),
+                ('sub_route', 1, FAKE_ROUTE_NAME),
+                ('leaf_route', 2, 'sub_route'),
+                (None, 1, FAKE_ROUTE_NAME),
+                ],
+            [
+                (walked_route.name, depth, parent_route and parent_route.name)
+                for walked_route, depth, parent_route in
+                compiled_route_tree.walk()
+                ],
+            )
+        eq_(
+            ['leaf_route', 'sub_route', None, FAKE_ROUTE_NAME],
+            [
+                walked_route.name
+                for walked_route, _, _ in compiled_route_tree.root.walk('post')
+                ],
+            )
+
+    def test_sub_routes(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+        compiled_route = route.compile().root
+
+        compiled_sub_routes = compiled_route.sub_routes
+        eq_(len(FAKE_SUB_ROUTES), len(compiled_sub_routes))
+        for sub_route, compiled_sub_route in \
+            zip(FAKE_SUB_ROUTES, compiled_sub_routes):
+            eq_(sub_route.view, compiled_sub_route.view)
+            eq_(sub_route.name, compiled_sub_route.name)
+            eq_(compiled_route, compiled_sub_route.parent)
+
+    def test_equality(self):
+        compiled_route_tree = \
+            Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES).compile()
+
+        assert_equivalent(compiled_route_tree.root, compiled_route_tree.root)
+        assert_non_equivalent(
+            compiled_route_tree.root,
+            compiled_route_tree.root.sub_routes[0],
+            )
+        assert_non_equivalent(compiled_route_tree.root, None)
+
+    def test_specializations(self):
+        generalized_sub_route = Route(None, 'sub_route_1')
+        generalized_route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [generalized_sub_route, Route(None, 'sub_route_2')],
+            )
+
+        specialized_view = object()
+        specialized_route = generalized_route.create_specialization(
+            additional_sub_routes=[Route(None, 'sub_route_3')],
+            specialized_sub_routes=[
+                generalized_sub_route.create_specialization(specialized_view),
+                ],
+            )
+        compiled_route = specialized_route.compile().root
+
+        eq_(FAKE_VIEW, compiled_route.view)
+        eq_(
+            ('sub_route_1', 'sub_route_2', 'sub_route_3'),
+            tuple(sub_route.name for sub_route in compiled_route.sub_routes),
+            )
+        eq_(specialized_view, compiled_route.sub_routes[0].view)
+
+
+class TestRetrieval(object):
+
+    def test_existing_own_route(self):
+        compiled_route_tree = Route(FAKE_VIEW, FAKE_ROUTE_NAME).compile()
+
+        retrieved_route = \
+            compiled_route_tree.get_route_by_name(FAKE_ROUTE_NAME)
+        eq_(compiled_route_tree.root, retrieved_route)
+
+    def test_existing_indirect_sub_route(self):
+        sub_route_name = 'sub_route_1'
+        route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [Route(None, None, [Route(FAKE_VIEW, sub_route_name)])],
+            )
+        compiled_route_tree = route.compile()
+
+        retrieved_route = compiled_route_tree.get_route_by_name(sub_route_name)
+        eq_(sub_route_name, retrieved_route.name)
+        eq_(FAKE_VIEW, retrieved_route.view)
+
+    def test_non_existing_route(self):
+        compiled_route_tree = \
+            Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES).compile()
+
+        non_existing_route_name = 'non_existing'
+        with assert_raises_substring(
+            NonExistingRouteError,
+            non_existing_route_name,
+            ):
+            compiled_route_tree.get_route_by_name(non_existing_route_name)
+
+    def test_finding_route(self):
+        route = Route(None, FAKE_ROUTE_NAME, [Route(FAKE_VIEW, 'sub_route')])
+        compiled_route_tree = route.compile()
+
+        found_route = compiled_route_tree.find_route('sub_route')
+        eq_(FAKE_VIEW, found_route.view)
+        eq_(None, compiled_route_tree.find_route('non_existing'))
+
+    def test_finding_route_outside_sub_route(self):
+        route = Route(
+            None,
+            FAKE_ROUTE_NAME,
+            [Route(None, 'sub_route_1'), Route(None, 'sub_route_2')],
+            )
+        compiled_sub_route = route.compile().get_route_by_name('sub_route_2')
+        default = object()
+
+        ok_(default is compiled_sub_route.find_route('sub_route_1', default))
+
+    def test_batch_retrieval(self):
+        route = Route(
+            None,
+            FAKE_ROUTE_NAME,
+            [Route(FAKE_VIEW, 'sub_route_1'), Route(None, 'sub_route_2')],
+            )
+        compiled_route_tree = route.compile()
+
+        routes_by_name = compiled_route_tree.get_routes_by_names(
+            ['sub_route_1', FAKE_ROUTE_NAME],
+            )
+        eq_(compiled_route_tree.root, routes_by_name[FAKE_ROUTE_NAME])
+        eq_(FAKE_VIEW, routes_by_name['sub_route_1'].view)
+
+    def test_batch_retrieval_outside_sub_route(self):
+        route = Route(
+            None,
+            FAKE_ROUTE_NAME,
+            [Route(None, 'sub_route_1'), Route(None, 'sub_route_2')],
+            )
+        compiled_sub_route = route.compile().get_route_by_name('sub_route_2')
+
+        with assert_raises_substring(
+            NonExistingRouteError,
+            "'sub_route_1', 'non_existing'",
+            ):
+            compiled_sub_route.get_routes_by_names(
+                ['sub_route_1', 'sub_route_2', 'non_existing'],
+                )
+
+    def test_route_outside_sub_route(self):
+        route = Route(
+            None,
+            FAKE_ROUTE_NAME,
+            [Route(None, 'sub_route_1'), Route(None, 'sub_route_2')],
+            )
+        compiled_sub_route = route.compile().get_route_by_name('sub_route_2')
+
+        with assert_raises_substring(NonExistingRouteError, 'sub_route_1'):
+            compiled_sub_route.get_route_by_name('sub_route_1')
+
+    def test_unnamed_routes(self):
+        unnamed_leaf_route = Route(FAKE_VIEW, None)
+        route = Route(
+            None,
+            None,
+            [Route(None, 'sub_route', [unnamed_leaf_route])],
+            )
+        compiled_route_tree = route.compile()
+
+        retrieved_route = compiled_route_tree.get_route_by_name(None)
+        eq_(compiled_route_tree.root, retrieved_route)
+
+        compiled_sub_route = compiled_route_tree.get_route_by_name('sub_route')
+        retrieved_route = compiled_sub_route.get_route_by_name(None)
+        eq_(FAKE_VIEW, retrieved_route.view)
+        eq_(compiled_sub_route, retrieved_route.parent)
+
+
+class TestRouteNames(object):
+
+    def test_route_tree(self):
+        route = Route(
+            None,
+            FAKE_ROUTE_NAME,
+            [
+                Route(None, 'sub_route_1', [Route(None, 'leaf_route')]),
+                Route(None, None),
+                Route(None, 'sub_route_2'),
+                ],
+            )
+
+        eq_(route.get_route_names(), route.compile().get_route_names())
+
+    def test_sub_route(self):
+        route = Route(
+            None,
+            FAKE_ROUTE_NAME,
+            [
+                Route(None, 'sub_route_1', [Route(None, 'leaf_route')]),
+                Route(None, 'sub_route_2'),
+                ],
+            )
+        compiled_sub_route = route.compile().get_route_by_name('sub_route_1')
+
+        eq_(
+            ['sub_route_1', 'leaf_route'],
+            compiled_sub_route.get_route_names(),
+            )
+
+    def test_iterating_route_names(self):
+        route = Route(
+            None,
+            FAKE_ROUTE_NAME,
+            [Route(None, 'sub_route_1'), Route(None, 'sub_route_2')],
+            )
+        compiled_route_tree = route.compile()
+
+        route_names = compiled_route_tree.iter_route_names()
+
+        eq_(FAKE_ROUTE_NAME, next(route_names))
+        eq_(['sub_route_1', 'sub_route_2'], list(route_names))
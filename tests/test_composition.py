@@ -18,6 +18,7 @@
 #pylint:disable=R0201
 
 from nose.tools import eq_
+from nose.tools import ok_
 
 from django_routing.routes import Route
 from django_routing.routes import DuplicatedRouteError
@@ -31,6 +32,24 @@ from tests.fixtures import FAKE_SUB_ROUTES
 from tests.fixtures import FAKE_VIEW
 
 
+class _EquivalentView(object):
+
+    def __eq__(self, other):
+        return isinstance(other, self.__class__)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.__class__)
+
+
+class _ViewHolder(object):
+
+    def view(self):
+        pass
+
+
 def test_repr():
     route = Route(None, None, FAKE_SUB_ROUTES)
     expected_sub_routes_repr = '_RouteCollection({!r})'.format(
@@ -95,6 +114,26 @@ class TestRetrieval(object):
         retrieved_route = route.get_route_by_name(sub_route_name)
         eq_(sub_route, retrieved_route)
 
+    def test_existing_sub_route_after_sibling_sub_route(self):
+        sub_route_name = 'sub_route_2'
+        sub_route = Route(FAKE_VIEW, sub_route_name)
+        route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [Route(None, 'sub_route_1', [Route(None, None)]), sub_route],
+            )
+
+        retrieved_route = route.get_route_by_name(sub_route_name)
+        ok_(sub_route is retrieved_route)
+
+    def test_repeated_retrieval(self):
+        sub_route_name = 'sub_route_1'
+        sub_route = Route(FAKE_VIEW, sub_route_name)
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, [sub_route])
+
+        ok_(sub_route is route.get_route_by_name(sub_route_name))
+        ok_(sub_route is route.get_route_by_name(sub_route_name))
+
     def test_existing_own_route(self):
         route_name = 'route_1'
         route = Route(FAKE_VIEW, route_name)
@@ -114,6 +153,167 @@ class TestRetrieval(object):
             route.get_route_by_name(non_existing_route_name)
 
 
+class TestFinding(object):
+
+    def test_existing_sub_route(self):
+        sub_route = Route(FAKE_VIEW, 'sub_route_1')
+        route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [Route(None, None, [sub_route])],
+            )
+
+        ok_(sub_route is route.find_route('sub_route_1'))
+
+    def test_non_existing_sub_route(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, [Route(None, 'sub_route_1')])
+
+        eq_(None, route.find_route('non_existing'))
+
+    def test_default(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME)
+        default = object()
+
+        ok_(default is route.find_route('non_existing', default))
+
+    def test_specialization(self):
+        generalized_route = Route(None, FAKE_ROUTE_NAME, [Route(None, 'a')])
+        specialized_sub_route = \
+            generalized_route.get_route_by_name('a').create_specialization()
+        specialized_route = generalized_route.create_specialization(
+            specialized_sub_routes=[specialized_sub_route],
+            )
+
+        ok_(specialized_sub_route is specialized_route.find_route('a'))
+
+
+def _build_route_tree():
+    route = Route(
+        FAKE_VIEW,
+        FAKE_ROUTE_NAME,
+        [
+            Route(None, None, [Route(FAKE_VIEW, 'sub_route_1')]),
+            Route(None, 'sub_route_2'),
+            ],
+        )
+    return route
+
+
+class TestBatchRetrieval(object):
+
+    def test_existing_routes(self):
+        sub_route_1 = Route(FAKE_VIEW, 'sub_route_1')
+        sub_route_2 = Route(None, 'sub_route_2')
+        route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [Route(None, None, [sub_route_1]), sub_route_2],
+            )
+
+        routes_by_name = \
+            route.get_routes_by_names(['sub_route_2', 'sub_route_1'])
+
+        eq_(2, len(routes_by_name))
+        ok_(sub_route_1 is routes_by_name['sub_route_1'])
+        ok_(sub_route_2 is routes_by_name['sub_route_2'])
+
+    def test_repeated_route_names(self):
+        sub_route_1 = Route(FAKE_VIEW, 'sub_route_1')
+        route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [Route(None, None, [sub_route_1]), Route(None, 'sub_route_2')],
+            )
+
+        routes_by_name = \
+            route.get_routes_by_names(['sub_route_1', 'sub_route_1'])
+
+        eq_({'sub_route_1': sub_route_1}, routes_by_name)
+
+    def test_no_route_names(self):
+        route = _build_route_tree()
+
+        eq_({}, route.get_routes_by_names([]))
+
+    def test_non_existing_routes(self):
+        route = _build_route_tree()
+
+        with assert_raises_substring(
+            NonExistingRouteError,
+            "'non_existing_1', 'non_existing_2'",
+            ):
+            route.get_routes_by_names(
+                ['non_existing_1', 'sub_route_1', 'non_existing_2'],
+                )
+
+    def test_repeated_non_existing_routes(self):
+        route = _build_route_tree()
+
+        with assert_raises_substring(
+            NonExistingRouteError,
+            "named 'non_existing_2', 'non_existing_1'$",
+            ):
+            route.get_routes_by_names(
+                ['non_existing_2', 'non_existing_1', 'non_existing_2'],
+                )
+
+
+class TestRetrievalByView(object):
+
+    def test_routes_with_view(self):
+        view = object()
+        sub_route_1 = Route(view, 'sub_route_1')
+        sub_route_2 = Route(view, 'sub_route_2')
+        route = Route(
+            view,
+            FAKE_ROUTE_NAME,
+            [Route(FAKE_VIEW, None, [sub_route_1]), sub_route_2],
+            )
+
+        eq_((route, sub_route_1, sub_route_2), route.get_routes_by_view(view))
+
+    def test_routes_within_sub_route(self):
+        sub_route = Route(None, 'sub_route', [Route(FAKE_VIEW, 'leaf_route')])
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, [sub_route])
+
+        eq_(
+            (Route(FAKE_VIEW, 'leaf_route'),),
+            sub_route.get_routes_by_view(FAKE_VIEW),
+            )
+        eq_(2, len(route.get_routes_by_view(FAKE_VIEW)))
+
+    def test_unhashable_views(self):
+        view = ['view']
+        route = Route(view, FAKE_ROUTE_NAME, [Route(['other'], 'sub_route')])
+
+        eq_((route,), route.get_routes_by_view(view))
+
+    def test_equivalent_unhashable_views(self):
+        sub_route = Route(['view'], 'sub_route')
+        route = Route(['view'], FAKE_ROUTE_NAME, [sub_route])
+
+        eq_((route, sub_route), route.get_routes_by_view(['view']))
+
+    def test_equivalent_views(self):
+        sub_route = Route(_EquivalentView(), 'sub_route')
+        route = Route(_EquivalentView(), FAKE_ROUTE_NAME, [sub_route])
+
+        eq_((route, sub_route), route.get_routes_by_view(_EquivalentView()))
+
+    def test_bound_method_views(self):
+        view_holder = _ViewHolder()
+        route = Route(view_holder.view, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        # Each attribute access creates a new bound method
+        eq_((route,), route.get_routes_by_view(view_holder.view))
+        eq_((), route.get_routes_by_view(_ViewHolder().view))
+
+    def test_view_without_routes(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        eq_((), route.get_routes_by_view(object()))
+
+
 class TestRouteInitializationValidation(object):
 
     def test_unique_route_names(self):
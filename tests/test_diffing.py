@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from nose.tools import assert_false
+from nose.tools import eq_
+from nose.tools import ok_
+
+from django_routing.diffing import diff
+from django_routing.routes import Route
+
+from tests.fixtures import FAKE_ROUTE_NAME
+from tests.fixtures import FAKE_VIEW
+
+
+def _build_route_tree(sub_route_1_view=None, leaf_route_name='leaf_route'):
+    route = Route(
+        None,
+        FAKE_ROUTE_NAME,
+        [
+            Route(
+                sub_route_1_view,
+                'sub_route_1',
+                [Route(None, None, [Route(None, leaf_route_name)])],
+                ),
+            Route(None, 'sub_route_2', [Route(None, 'leaf_route_2')]),
+            ],
+        )
+    return route
+
+
+def _assert_diff(
+    route_tree_diff,
+    added_route_names=(),
+    removed_route_names=(),
+    view_changed_route_names=(),
+    moved_route_names=(),
+    ):
+    eq_(set(added_route_names), route_tree_diff.added_route_names)
+    eq_(set(removed_route_names), route_tree_diff.removed_route_names)
+    eq_(
+        set(view_changed_route_names),
+        route_tree_diff.view_changed_route_names,
+        )
+    eq_(set(moved_route_names), route_tree_diff.moved_route_names)
+
+
+class TestDiffing(object):
+
+    def test_same_route_tree(self):
+        route = _build_route_tree()
+
+        route_tree_diff = diff(route, route)
+
+        _assert_diff(route_tree_diff)
+        assert_false(route_tree_diff)
+
+    def test_equivalent_route_trees(self):
+        route_tree_diff = diff(_build_route_tree(), _build_route_tree())
+
+        _assert_diff(route_tree_diff)
+
+    def test_added_and_removed_routes(self):
+        route_tree_diff = diff(
+            _build_route_tree(),
+            _build_route_tree(leaf_route_name='new_leaf_route'),
+            )
+
+        _assert_diff(
+            route_tree_diff,
+            added_route_names=['new_leaf_route'],
+            removed_route_names=['leaf_route'],
+            )
+        ok_(route_tree_diff)
+
+    def test_changed_view(self):
+        route_tree_diff = diff(
+            _build_route_tree(),
+            _build_route_tree(sub_route_1_view=FAKE_VIEW),
+            )
+
+        _assert_diff(route_tree_diff, view_changed_route_names=['sub_route_1'])
+
+    def test_changed_unhashable_view(self):
+        old_route = Route(None, FAKE_ROUTE_NAME, [Route([1], 'sub_route')])
+        new_route = Route(None, FAKE_ROUTE_NAME, [Route([2], 'sub_route')])
+
+        route_tree_diff = diff(old_route, new_route)
+
+        _assert_diff(route_tree_diff, view_changed_route_names=['sub_route'])
+
+    def test_equivalent_route_trees_with_unhashable_views(self):
+        old_route = Route(None, FAKE_ROUTE_NAME, [Route([1], 'sub_route')])
+        new_route = Route(None, FAKE_ROUTE_NAME, [Route([1], 'sub_route')])
+
+        assert_false(diff(old_route, new_route))
+
+    def test_moved_route(self):
+        old_route = Route(
+            None,
+            FAKE_ROUTE_NAME,
+            [
+                Route(None, 'sub_route_1', [Route(None, 'leaf_route')]),
+                Route(None, 'sub_route_2'),
+                ],
+            )
+        new_route = Route(
+            None,
+            FAKE_ROUTE_NAME,
+            [
+                Route(None, 'sub_route_1'),
+                Route(None, 'sub_route_2', [Route(FAKE_VIEW, 'leaf_route')]),
+                ],
+            )
+
+        route_tree_diff = diff(old_route, new_route)
+
+        _assert_diff(
+            route_tree_diff,
+            view_changed_route_names=['leaf_route'],
+            moved_route_names=['leaf_route'],
+            )
+
+    def test_reordered_routes(self):
+        sub_route_1 = Route(None, 'sub_route_1')
+        sub_route_2 = Route(None, 'sub_route_2')
+
+        route_tree_diff = diff(
+            Route(None, FAKE_ROUTE_NAME, [sub_route_1, sub_route_2]),
+            Route(None, FAKE_ROUTE_NAME, [sub_route_2, sub_route_1]),
+            )
+
+        _assert_diff(route_tree_diff)
+
+    def test_renamed_root_route(self):
+        old_route = _build_route_tree()
+        new_route = Route(None, 'new_root_route', old_route.sub_routes)
+
+        route_tree_diff = diff(old_route, new_route)
+
+        _assert_diff(
+            route_tree_diff,
+            added_route_names=['new_root_route'],
+            removed_route_names=[FAKE_ROUTE_NAME],
+            moved_route_names=old_route.get_route_names()[1:],
+            )
+
+    def test_specializations(self):
+        generalized_route = _build_route_tree()
+        generalized_sub_route = \
+            generalized_route.get_route_by_name('sub_route_1')
+        specialized_route = generalized_route.create_specialization(
+            specialized_sub_routes=[
+                generalized_sub_route.create_specialization(FAKE_VIEW),
+                ],
+            additional_sub_routes=[Route(None, 'sub_route_3')],
+            )
+
+        route_tree_diff = diff(generalized_route, specialized_route)
+
+        _assert_diff(
+            route_tree_diff,
+            added_route_names=['sub_route_3'],
+            view_changed_route_names=['sub_route_1'],
+            )
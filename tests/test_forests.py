@@ -0,0 +1,275 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from nose.tools import assert_false
+from nose.tools import eq_
+from nose.tools import ok_
+
+from django_routing.exceptions import RoutingException
+from django_routing.forests import RouteForest
+from django_routing.forests import TenantRoute
+from django_routing.routes import DuplicatedRouteError
+from django_routing.routes import NonExistingRouteError
+from django_routing.routes import Route
+
+from tests.assertions import assert_raises_substring
+from tests.fixtures import FAKE_ROUTE_NAME
+from tests.fixtures import FAKE_VIEW
+
+
+_OVERRIDDEN_VIEW = object()
+
+
+def _build_base_route():
+    base_route = Route(
+        None,
+        FAKE_ROUTE_NAME,
+        [
+            Route(None, 'sub_route_1', [Route(FAKE_VIEW, 'leaf_route')]),
+            Route(None, 'sub_route_2'),
+            ],
+        )
+    return base_route
+
+
+class TestTenants(object):
+
+    def test_adding_tenant(self):
+        route_forest = RouteForest(_build_base_route())
+
+        tenant_route_tree = route_forest.add_tenant('tenant')
+
+        eq_(1, len(route_forest))
+        ok_('tenant' in route_forest)
+        ok_(tenant_route_tree is route_forest.get_tenant('tenant'))
+
+    def test_duplicated_tenant(self):
+        route_forest = RouteForest(_build_base_route())
+
+        route_forest.add_tenant('tenant')
+
+        with assert_raises_substring(RoutingException, 'already exists'):
+            route_forest.add_tenant('tenant')
+
+    def test_tenant_without_overrides(self):
+        base_route = _build_base_route()
+        route_forest = RouteForest(base_route)
+
+        tenant_route_tree = route_forest.add_tenant('tenant')
+
+        eq_(
+            base_route.get_route_names(),
+            tenant_route_tree.get_route_names(),
+            )
+        leaf_route = tenant_route_tree.get_route_by_name('leaf_route')
+        eq_(FAKE_VIEW, leaf_route.view)
+
+    def test_tenants_sharing_base_routes(self):
+        route_forest = RouteForest(_build_base_route())
+        tenant_route_tree_1 = route_forest.add_tenant('tenant_1')
+        tenant_route_tree_2 = route_forest.add_tenant(
+            'tenant_2',
+            views_by_route_name={'leaf_route': _OVERRIDDEN_VIEW},
+            )
+
+        leaf_route_1 = tenant_route_tree_1.get_route_by_name('leaf_route')
+        leaf_route_2 = tenant_route_tree_2.get_route_by_name('leaf_route')
+        eq_(FAKE_VIEW, leaf_route_1.view)
+        eq_(_OVERRIDDEN_VIEW, leaf_route_2.view)
+        ok_(leaf_route_1._route is leaf_route_2._route)
+
+    def test_finding_route(self):
+        route_forest = RouteForest(_build_base_route())
+
+        tenant_route_tree = route_forest.add_tenant(
+            'tenant',
+            views_by_route_name={'leaf_route': _OVERRIDDEN_VIEW},
+            )
+
+        leaf_route = tenant_route_tree.find_route('leaf_route')
+        eq_(_OVERRIDDEN_VIEW, leaf_route.view)
+        eq_(None, tenant_route_tree.find_route('non_existing'))
+
+    def test_finding_route_in_sub_route(self):
+        route_forest = RouteForest(_build_base_route())
+        tenant_route_tree = route_forest.add_tenant('tenant')
+        sub_route = tenant_route_tree.get_route_by_name('sub_route_2')
+        default = object()
+
+        ok_(default is sub_route.find_route('leaf_route', default))
+        eq_('sub_route_2', sub_route.find_route('sub_route_2').name)
+
+    def test_batch_retrieval(self):
+        route_forest = RouteForest(_build_base_route())
+
+        tenant_route_tree = route_forest.add_tenant(
+            'tenant',
+            views_by_route_name={'leaf_route': _OVERRIDDEN_VIEW},
+            additional_sub_routes_by_route_name={
+                'sub_route_2': [Route(None, 'additional_route')],
+                },
+            )
+
+        routes_by_name = tenant_route_tree.get_routes_by_names(
+            ['leaf_route', 'additional_route'],
+            )
+        eq_(_OVERRIDDEN_VIEW, routes_by_name['leaf_route'].view)
+        eq_('additional_route', routes_by_name['additional_route'].name)
+
+        with assert_raises_substring(NonExistingRouteError, "'a', 'b'"):
+            tenant_route_tree.get_routes_by_names(['a', 'leaf_route', 'b'])
+
+
+class TestOverriddenViews(object):
+
+    def test_overridden_view(self):
+        base_route = _build_base_route()
+        route_forest = RouteForest(base_route)
+
+        tenant_route_tree = route_forest.add_tenant(
+            'tenant',
+            views_by_route_name={'sub_route_1': _OVERRIDDEN_VIEW},
+            )
+
+        sub_route = tenant_route_tree.get_route_by_name('sub_route_1')
+        eq_(_OVERRIDDEN_VIEW, sub_route.view)
+        eq_(None, base_route.get_route_by_name('sub_route_1').view)
+
+    def test_overridden_view_in_sub_routes(self):
+        route_forest = RouteForest(_build_base_route())
+
+        tenant_route_tree = route_forest.add_tenant(
+            'tenant',
+            views_by_route_name={'leaf_route': _OVERRIDDEN_VIEW},
+            )
+
+        sub_route = tenant_route_tree.get_route_by_name('sub_route_1')
+        eq_(_OVERRIDDEN_VIEW, sub_route.sub_routes[0].view)
+
+    def test_non_existing_route(self):
+        route_forest = RouteForest(_build_base_route())
+
+        with assert_raises_substring(
+            NonExistingRouteError,
+            "does not contain one named 'non_existing'",
+            ):
+            route_forest.add_tenant(
+                'tenant',
+                views_by_route_name={'non_existing': _OVERRIDDEN_VIEW},
+                )
+
+
+class TestAdditionalRoutes(object):
+
+    def test_additional_routes(self):
+        base_route = _build_base_route()
+        route_forest = RouteForest(base_route)
+        additional_route = \
+            Route(None, 'additional_route', [Route(None, 'additional_leaf')])
+        tenant_route_tree = route_forest.add_tenant(
+            'tenant',
+            additional_sub_routes_by_route_name={
+                'sub_route_2': [additional_route],
+                },
+            )
+
+        eq_(
+            [
+                FAKE_ROUTE_NAME,
+                'sub_route_1',
+                'leaf_route',
+                'sub_route_2',
+                'additional_route',
+                'additional_leaf',
+                ],
+            tenant_route_tree.get_route_names(),
+            )
+        eq_(
+            TenantRoute(tenant_route_tree, additional_route),
+            tenant_route_tree.get_route_by_name('additional_route'),
+            )
+        sub_route = tenant_route_tree.get_route_by_name('sub_route_2')
+        eq_(
+            (TenantRoute(tenant_route_tree, additional_route),),
+            sub_route.sub_routes,
+            )
+        eq_(
+            [FAKE_ROUTE_NAME, 'sub_route_1', 'leaf_route', 'sub_route_2'],
+            base_route.get_route_names(),
+            )
+
+    def test_retrieval_within_sub_routes(self):
+        route_forest = RouteForest(_build_base_route())
+
+        tenant_route_tree = route_forest.add_tenant(
+            'tenant',
+            additional_sub_routes_by_route_name={
+                'sub_route_2': [
+                    Route(None, 'additional_route', [Route(None, 'leaf')]),
+                    ],
+                },
+            )
+
+        sub_route_1 = tenant_route_tree.get_route_by_name('sub_route_1')
+        sub_route_2 = tenant_route_tree.get_route_by_name('sub_route_2')
+        additional_route = \
+            tenant_route_tree.get_route_by_name('additional_route')
+        eq_('leaf', sub_route_2.get_route_by_name('leaf').name)
+        eq_('leaf', additional_route.get_route_by_name('leaf').name)
+        with assert_raises_substring(NonExistingRouteError, 'leaf'):
+            sub_route_1.get_route_by_name('leaf')
+
+    def test_overridden_view_of_additional_route(self):
+        route_forest = RouteForest(_build_base_route())
+
+        tenant_route_tree = route_forest.add_tenant(
+            'tenant',
+            views_by_route_name={'additional_route': _OVERRIDDEN_VIEW},
+            additional_sub_routes_by_route_name={
+                'sub_route_2': [Route(None, 'additional_route')],
+                },
+            )
+
+        additional_route = \
+            tenant_route_tree.get_route_by_name('additional_route')
+        eq_(_OVERRIDDEN_VIEW, additional_route.view)
+
+    def test_duplicated_route_name(self):
+        route_forest = RouteForest(_build_base_route())
+
+        with assert_raises_substring(DuplicatedRouteError, 'leaf_route'):
+            route_forest.add_tenant(
+                'tenant',
+                additional_sub_routes_by_route_name={
+                    'sub_route_2': [Route(None, 'leaf_route')],
+                    },
+                )
+
+    def test_non_existing_parent_route(self):
+        route_forest = RouteForest(_build_base_route())
+
+        with assert_raises_substring(
+            NonExistingRouteError,
+            "does not contain one named 'non_existing'",
+            ):
+            route_forest.add_tenant(
+                'tenant',
+                additional_sub_routes_by_route_name={
+                    'non_existing': [Route(None, 'additional_route')],
+                    },
+                )
+        assert_false('tenant' in route_forest)
@@ -17,12 +17,17 @@
 
 #pylint:disable=R0201
 
+from pickle import dumps
+from pickle import loads
+
 from nose.tools import assert_not_equal
 from nose.tools import eq_
+from nose.tools import ok_
 
 from django_routing.routes import Route
 from django_routing.routes import DuplicatedRouteError
 from django_routing.routes import InvalidSpecializationError
+from django_routing.routes import NonExistingRouteError
 
 from tests.assertions import assert_equivalent
 from tests.assertions import assert_non_equivalent
@@ -66,6 +71,19 @@ def test_getting_name():
     eq_(FAKE_ROUTE_NAME, specialized_route.name)
 
 
+def test_inheriting_path_segment():
+    generalized_route = Route(None, FAKE_ROUTE_NAME, path_segment='a')
+    specialized_route = generalized_route.create_specialization()
+    eq_('a', specialized_route.path_segment)
+
+
+def test_overriding_path_segment():
+    generalized_route = Route(None, FAKE_ROUTE_NAME, path_segment='a')
+    specialized_route = \
+        generalized_route.create_specialization(path_segment='b')
+    eq_('b', specialized_route.path_segment)
+
+
 class TestSubRoute(object):
 
     def test_repr(self):
@@ -109,6 +127,25 @@ class TestSubRoute(object):
         expected_length = len(FAKE_SUB_ROUTES) + len(additional_sub_routes)
         eq_(expected_length, len(specialized_route.sub_routes))
 
+    def test_repeated_iteration(self):
+        generalized_sub_route = Route(None, 'sub_route_1')
+        generalized_route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [generalized_sub_route, Route(None, 'sub_route_2')],
+            )
+
+        specialized_sub_route = generalized_sub_route.create_specialization()
+        specialized_route = generalized_route.create_specialization(
+            specialized_sub_routes=[specialized_sub_route],
+            )
+
+        sub_routes_1 = tuple(specialized_route.sub_routes)
+        sub_routes_2 = tuple(specialized_route.sub_routes)
+        eq_(len(sub_routes_1), len(sub_routes_2))
+        for sub_route_1, sub_route_2 in zip(sub_routes_1, sub_routes_2):
+            ok_(sub_route_1 is sub_route_2)
+
     def test_sub_routes_order(self):
         generalized_sub_route1 = Route(None, 'sub_route_1')
         generalized_sub_route2 = Route(None, 'sub_route_2')
@@ -160,6 +197,88 @@ class TestRetrieval(object):
         retrieved_route = specialized_route.get_route_by_name(FAKE_ROUTE_NAME)
         eq_(sub_route, retrieved_route)
 
+    def test_getting_specialization_of_sub_route_by_name(self):
+        generalized_sub_route = Route(None, FAKE_ROUTE_NAME)
+        generalized_route = Route(None, None, [generalized_sub_route])
+
+        specialized_sub_route = \
+            generalized_sub_route.create_specialization(FAKE_VIEW)
+        specialized_route = generalized_route.create_specialization(
+            specialized_sub_routes=[specialized_sub_route],
+            )
+
+        retrieved_route = specialized_route.get_route_by_name(FAKE_ROUTE_NAME)
+        ok_(specialized_sub_route is retrieved_route)
+
+    def test_getting_sub_route_of_additional_sub_route_by_name(self):
+        sub_route_name = 'sub_route_name'
+        sub_route = Route(FAKE_VIEW, sub_route_name)
+        generalized_route = Route(None, FAKE_ROUTE_NAME)
+        specialized_route = generalized_route.create_specialization(
+            additional_sub_routes=[Route(None, None, [sub_route])],
+            )
+
+        retrieved_route = specialized_route.get_route_by_name(sub_route_name)
+        ok_(sub_route is retrieved_route)
+
+    def test_getting_non_existing_route_by_name(self):
+        generalized_route = Route(None, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+        specialized_route = generalized_route.create_specialization()
+
+        non_existing_route_name = 'non_existing'
+        with assert_raises_substring(
+            NonExistingRouteError,
+            non_existing_route_name,
+            ):
+            specialized_route.get_route_by_name(non_existing_route_name)
+
+
+class TestRetrievalByView(object):
+
+    def test_overridden_views(self):
+        generalized_sub_route = Route(FAKE_VIEW, 'sub_route')
+        generalized_route = \
+            Route(FAKE_VIEW, FAKE_ROUTE_NAME, [generalized_sub_route])
+
+        overridden_view = object()
+        specialized_sub_route = \
+            generalized_sub_route.create_specialization(overridden_view)
+        specialized_route = generalized_route.create_specialization(
+            specialized_sub_routes=[specialized_sub_route],
+            )
+
+        eq_(
+            (specialized_route,),
+            specialized_route.get_routes_by_view(FAKE_VIEW),
+            )
+        eq_(
+            (specialized_sub_route,),
+            specialized_route.get_routes_by_view(overridden_view),
+            )
+
+
+class TestWalking(object):
+
+    def test_specialized_sub_routes(self):
+        generalized_sub_route = Route(None, 'sub_route_1')
+        additional_sub_route = Route(None, 'sub_route_2')
+        generalized_route = \
+            Route(None, FAKE_ROUTE_NAME, [generalized_sub_route])
+
+        specialized_sub_route = \
+            generalized_sub_route.create_specialization(FAKE_VIEW)
+        specialized_route = generalized_route.create_specialization(
+            additional_sub_routes=[additional_sub_route],
+            specialized_sub_routes=[specialized_sub_route],
+            )
+
+        expected_walk = [
+            (specialized_route, 0, None),
+            (specialized_sub_route, 1, specialized_route),
+            (additional_sub_route, 1, specialized_route),
+            ]
+        eq_(expected_walk, list(specialized_route.walk()))
+
 
 class TestEquality(object):
 
@@ -188,6 +307,15 @@ class TestEquality(object):
 
         assert_non_equivalent(specialized_route_1, specialized_route_2)
 
+    def test_sibling_specializations_with_different_path_segments(self):
+        generalized_route = Route(None, FAKE_ROUTE_NAME, path_segment='a')
+
+        specialized_route_1 = \
+            generalized_route.create_specialization(path_segment='b')
+        specialized_route_2 = generalized_route.create_specialization()
+
+        assert_non_equivalent(specialized_route_1, specialized_route_2)
+
     def test_sibling_specializations_with_same_sub_routes(self):
         generalized_sub_route = Route(None, None, FAKE_SUB_ROUTES)
         generalized_route = Route(
@@ -294,6 +422,89 @@ class TestEquality(object):
             )
 
 
+class TestHashing(object):
+
+    def test_sibling_specializations_with_same_attributes(self):
+        generalized_route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        specialized_route_1 = generalized_route.create_specialization()
+        specialized_route_2 = generalized_route.create_specialization()
+
+        eq_(hash(specialized_route_1), hash(specialized_route_2))
+        eq_(
+            hash(specialized_route_1.sub_routes),
+            hash(specialized_route_2.sub_routes),
+            )
+
+    def test_specialization_vs_non_specialization(self):
+        generalized_route = Route(None, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+        specialized_route = generalized_route.create_specialization()
+
+        eq_(2, len({generalized_route, specialized_route}))
+
+
+class TestPickling(object):
+
+    def test_specialization(self):
+        generalized_route = Route(None, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+        specialized_route = generalized_route.create_specialization(len)
+
+        unpickled_route = loads(dumps(specialized_route))
+
+        assert_equivalent(specialized_route, unpickled_route)
+        eq_(hash(specialized_route), hash(unpickled_route))
+        eq_(len, unpickled_route.view)
+
+    def test_path_segment(self):
+        generalized_route = Route(None, FAKE_ROUTE_NAME, path_segment='a')
+        specialized_route = \
+            generalized_route.create_specialization(path_segment='b')
+
+        unpickled_route = loads(dumps(specialized_route))
+
+        assert_equivalent(specialized_route, unpickled_route)
+        eq_('b', unpickled_route.path_segment)
+
+    def test_specialized_and_additional_sub_routes(self):
+        generalized_sub_route = Route(None, 'sub_route')
+        generalized_route = \
+            Route(None, FAKE_ROUTE_NAME, [generalized_sub_route])
+        specialized_route = generalized_route.create_specialization(
+            additional_sub_routes=[Route(None, 'additional_sub_route')],
+            specialized_sub_routes=[
+                generalized_sub_route.create_specialization(len),
+                ],
+            )
+
+        unpickled_route = loads(dumps(specialized_route))
+
+        assert_equivalent(specialized_route, unpickled_route)
+        eq_(len, unpickled_route.get_route_by_name('sub_route').view)
+
+    def test_shared_generalization(self):
+        generalized_route = Route(None, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+        specialized_route = generalized_route.create_specialization(len)
+
+        unpickled_generalized_route, unpickled_specialized_route = \
+            loads(dumps((generalized_route, specialized_route)))
+
+        unpickled_generalization = \
+            unpickled_specialized_route.get_route_generalization(
+                unpickled_specialized_route,
+                )
+        eq_(unpickled_generalized_route, unpickled_generalization)
+
+    def test_deep_specialization_chain(self):
+        route = Route(None, FAKE_ROUTE_NAME)
+        for _ in range(500):
+            route = route.create_specialization()
+
+        unpickled_route = loads(dumps(route))
+
+        eq_(FAKE_ROUTE_NAME, unpickled_route.name)
+        eq_(hash(route), hash(unpickled_route))
+
+
 class TestMultipleSpecialization(object):
 
     def test_no_change(self):
@@ -429,6 +640,24 @@ class TestSpecializedSubRoutes(object):
         # A second sub-route without name shouldn't override the first sub-route
         eq_((specialized_sub_route, sub_route), tuple(specialized_route.sub_routes))
 
+    def test_deeply_specialized_sub_route(self):
+        generalized_sub_route = Route(None, 'sub_route_name')
+        generalized_route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [generalized_sub_route],
+            )
+
+        specialized_sub_route = generalized_sub_route \
+            .create_specialization() \
+            .create_specialization() \
+            .create_specialization(view=FAKE_VIEW)
+        specialized_route = generalized_route.create_specialization(
+            specialized_sub_routes=[specialized_sub_route],
+            )
+
+        eq_((specialized_sub_route,), tuple(specialized_route.sub_routes))
+
     def test_non_existing_named_sub_route(self):
         generalized_route = Route(None, None)
 
@@ -660,3 +889,65 @@ class TestSettingViews(object):
             generalized_route.create_specialization(view=overridden_view)
 
         eq_(overridden_view, specialized_route.view)
+
+    def test_deep_specialization_chain(self):
+        specialized_route = Route(FAKE_VIEW, FAKE_ROUTE_NAME)
+        for _ in range(5000):
+            specialized_route = specialized_route.create_specialization()
+
+        eq_(FAKE_VIEW, specialized_route.view)
+        eq_(FAKE_ROUTE_NAME, specialized_route.name)
+
+
+class TestFlattening(object):
+
+    def test_specialization(self):
+        generalized_sub_route = Route(None, 'sub_route_1')
+        generalized_route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [generalized_sub_route, Route(None, 'sub_route_2')],
+            )
+        overridden_view = object()
+        specialized_route = generalized_route.create_specialization(
+            additional_sub_routes=[Route(None, 'sub_route_3')],
+            specialized_sub_routes=[
+                generalized_sub_route.create_specialization(overridden_view),
+                ],
+            )
+
+        flattened_route = specialized_route.flatten()
+
+        expected_route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [
+                Route(overridden_view, 'sub_route_1'),
+                Route(None, 'sub_route_2'),
+                Route(None, 'sub_route_3'),
+                ],
+            )
+        eq_(expected_route, flattened_route)
+
+    def test_specialization_chain(self):
+        specialized_route = Route(FAKE_VIEW, FAKE_ROUTE_NAME)
+        for _ in range(3):
+            specialized_route = specialized_route.create_specialization()
+
+        flattened_route = specialized_route.flatten()
+
+        eq_(Route(FAKE_VIEW, FAKE_ROUTE_NAME), flattened_route)
+
+    def test_reusing_routes_without_specializations(self):
+        sub_route = Route(None, 'sub_route_1', [Route(None, 'sub_route_2')])
+        generalized_route = Route(None, FAKE_ROUTE_NAME, [sub_route])
+        specialized_route = generalized_route.create_specialization(FAKE_VIEW)
+
+        flattened_route = specialized_route.flatten()
+
+        ok_(sub_route is tuple(flattened_route.sub_routes)[0])
+
+    def test_route_without_specializations(self):
+        route = Route(None, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        ok_(route is route.flatten())
@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from nose.tools import assert_false
+from nose.tools import eq_
+from nose.tools import ok_
+
+from django_routing.routes import Route
+from django_routing.routes import RoutingException
+from django_routing.routes import instrument_routes
+
+from tests.assertions import assert_raises_substring
+from tests.fixtures import FAKE_ROUTE_NAME
+from tests.fixtures import FAKE_SUB_ROUTES
+from tests.fixtures import FAKE_VIEW
+
+
+class TestInstrumentation(object):
+
+    def test_call_counts(self):
+        route_1 = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+        route_2 = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        with instrument_routes() as report:
+            route_1.get_route_by_name(FAKE_ROUTE_NAME)
+            route_1.get_route_names()
+            route_1 == route_2  #pylint:disable=W0104
+
+        eq_(1, report.call_counts['_BaseRoute.get_route_by_name'])
+        ok_(report.call_counts['_BaseRoute.get_route_names'] >= 1)
+        ok_(report.call_counts['_BaseRoute.__eq__'] >= 1)
+
+    def test_validation_call_counts(self):
+        generalized_sub_route = Route(None, 'sub_route')
+        generalized_route = Route(None, None, [generalized_sub_route])
+
+        with instrument_routes() as report:
+            generalized_route.create_specialization(
+                specialized_sub_routes=[
+                    generalized_sub_route.create_specialization(),
+                    ],
+                )
+
+        eq_(
+            1,
+            report.call_counts[
+                '_RouteSpecializationCollection._validate_specialized_route'
+                ],
+            )
+        eq_(
+            1,
+            report.call_counts[
+                '_require_route_names_uniqueness_in_collection'
+                ],
+            )
+
+    def test_name_set_call_counts(self):
+        sub_route = Route(None, None, [Route(None, 'sub_route')])
+
+        with instrument_routes() as report:
+            Route(FAKE_VIEW, FAKE_ROUTE_NAME, [sub_route])
+
+        ok_(report.call_counts['_BaseRoute._get_route_name_set'] >= 1)
+        ok_(
+            report.call_counts['_BaseRouteCollection._get_route_name_set'] >=
+            1
+            )
+        ok_(report.call_counts['_merge_route_name_sets'] >= 1)
+
+    def test_lookup_call_counts(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        with instrument_routes() as report:
+            route.find_route(FAKE_ROUTE_NAME)
+            route.get_routes_by_view(FAKE_VIEW)
+
+        eq_(1, report.call_counts['_BaseRoute.find_route'])
+        eq_(1, report.call_counts['_index_routes_by_name'])
+        eq_(1, report.call_counts['_BaseRoute.get_routes_by_view'])
+        eq_(1, report.call_counts['_index_routes_by_view'])
+
+    def test_generator_call_counts(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        with instrument_routes() as report:
+            route_names = route.iter_route_names()
+            assert_false(report.call_counts)
+
+            eq_([FAKE_ROUTE_NAME, 'sub_route_2'], list(route_names))
+
+        eq_(1, report.call_counts['_BaseRoute.iter_route_names'])
+        ok_(0 <= report.durations['_BaseRoute.iter_route_names'])
+        call_site = \
+            tuple(report.call_site_counts['_BaseRoute.iter_route_names'])[0]
+        eq_('test_generator_call_counts', call_site[2])
+
+    def test_durations(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        with instrument_routes() as report:
+            route.get_route_names()
+
+        ok_(0 <= report.durations['_BaseRoute.get_route_names'])
+
+    def test_call_sites(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        with instrument_routes() as report:
+            route.get_route_by_name(FAKE_ROUTE_NAME)
+
+        call_site_counts = \
+            report.call_site_counts['_BaseRoute.get_route_by_name']
+        eq_(1, len(call_site_counts))
+
+        call_site = tuple(call_site_counts)[0]
+        eq_(__file__.rstrip('c'), call_site[0])
+        eq_('test_call_sites', call_site[2])
+
+    def test_formatting(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        with instrument_routes() as report:
+            route.get_route_by_name(FAKE_ROUTE_NAME)
+
+        # Functions are reported in alphabetical order
+        report_text = report.format()
+        ok_(report_text.startswith('_BaseRoute.find_route: 1 calls'))
+        ok_('\n_BaseRoute.get_route_by_name: 1 calls' in report_text)
+        ok_('(test_formatting): 1 calls' in report_text)
+
+    def test_calls_after_context(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        with instrument_routes() as report:
+            pass
+        route.get_route_by_name(FAKE_ROUTE_NAME)
+
+        assert_false(report.call_counts)
+
+    def test_nested_contexts(self):
+        with instrument_routes():
+            with assert_raises_substring(RoutingException, 'already enabled'):
+                with instrument_routes():
+                    pass  # pragma: no cover
+
+        with instrument_routes():
+            pass
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from nose.tools import eq_
+from nose.tools import ok_
+
+from django_routing.routes import Route
+from django_routing.routes import RouteInterner
+
+from tests.fixtures import FAKE_ROUTE_NAME
+from tests.fixtures import FAKE_VIEW
+
+
+class TestInterning(object):
+
+    def test_new_route(self):
+        interner = RouteInterner()
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME)
+
+        ok_(route is interner.intern(route))
+        eq_(1, len(interner))
+
+    def test_equivalent_route(self):
+        interner = RouteInterner()
+        route_1 = interner.intern(Route(FAKE_VIEW, FAKE_ROUTE_NAME))
+        route_2 = interner.intern(Route(FAKE_VIEW, FAKE_ROUTE_NAME))
+
+        ok_(route_1 is route_2)
+        eq_(1, len(interner))
+
+    def test_non_equivalent_route(self):
+        interner = RouteInterner()
+        route_1 = interner.intern(Route(FAKE_VIEW, FAKE_ROUTE_NAME))
+        route_2 = interner.intern(Route(object(), FAKE_ROUTE_NAME))
+
+        ok_(route_1 is not route_2)
+        eq_(2, len(interner))
+
+    def test_specializations(self):
+        interner = RouteInterner()
+        generalized_route = Route(None, FAKE_ROUTE_NAME)
+        specialized_route_1 = \
+            interner.intern(generalized_route.create_specialization())
+        specialized_route_2 = \
+            interner.intern(generalized_route.create_specialization())
+
+        ok_(specialized_route_1 is specialized_route_2)
+        eq_(1, len(interner))
+
+
+class TestRouteCreation(object):
+
+    def test_equivalent_routes(self):
+        interner = RouteInterner()
+        route_1 = interner.create_route(FAKE_VIEW, FAKE_ROUTE_NAME)
+        route_2 = interner.create_route(FAKE_VIEW, FAKE_ROUTE_NAME)
+
+        ok_(route_1 is route_2)
+
+    def test_sub_routes_sharing(self):
+        interner = RouteInterner()
+        sub_route = interner.create_route(FAKE_VIEW, 'sub_route')
+
+        route_1 = interner.create_route(
+            None,
+            'route_1',
+            [Route(FAKE_VIEW, 'sub_route')],
+            )
+        route_2 = interner.create_route(
+            None,
+            'route_2',
+            [Route(FAKE_VIEW, 'sub_route')],
+            )
+
+        eq_((sub_route,), tuple(route_1.sub_routes))
+        ok_(sub_route is tuple(route_1.sub_routes)[0])
+        ok_(sub_route is tuple(route_2.sub_routes)[0])
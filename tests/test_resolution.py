@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from uuid import UUID
+
+from nose.tools import eq_
+from nose.tools import ok_
+
+from django_routing.exceptions import InvalidPathSegmentError
+from django_routing.exceptions import InvalidURLArgumentsError
+from django_routing.exceptions import NonExistingRouteError
+from django_routing.exceptions import UnresolvablePathError
+from django_routing.forests import RouteForest
+from django_routing.resolution import RouteResolver
+from django_routing.resolution import StringConverter
+from django_routing.routes import Route
+
+from tests.assertions import assert_raises_substring
+from tests.fixtures import FAKE_VIEW
+
+
+def _article_view():
+    pass  # pragma: no cover
+
+
+def _build_route_tree():
+    route = Route(
+        FAKE_VIEW,
+        'home',
+        [
+            Route(
+                None,
+                'articles',
+                [
+                    Route(_article_view, 'article', (), '<int:pk>'),
+                    Route(None, 'latest_article', (), 'latest'),
+                    Route(None, 'article_by_slug', (), '<slug:slug>'),
+                    ],
+                'articles',
+                ),
+            Route(
+                None,
+                None,
+                [Route(None, 'about', (), 'about')],
+                ),
+            Route(None, 'files', (), 'files/<path:file_path>'),
+            ],
+        path_segment='',
+        )
+    return route
+
+
+class TestResolution(object):
+
+    def test_root(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        route_match = resolver.resolve('/')
+
+        eq_('home', route_match.route.name)
+        eq_(FAKE_VIEW, route_match.view)
+        eq_({}, route_match.kwargs)
+
+    def test_static_segment(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        route_match = resolver.resolve('/articles/')
+
+        eq_('articles', route_match.route.name)
+
+    def test_converted_segment(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        route_match = resolver.resolve('/articles/42/')
+
+        eq_('article', route_match.route.name)
+        eq_(_article_view, route_match.view)
+        eq_({'pk': 42}, route_match.kwargs)
+
+    def test_static_segment_declared_before_dynamic_segment(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        route_match = resolver.resolve('/articles/latest')
+
+        eq_('latest_article', route_match.route.name)
+
+    def test_falling_back_to_next_converter(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        route_match = resolver.resolve('/articles/my-article')
+
+        eq_('article_by_slug', route_match.route.name)
+        eq_({'slug': 'my-article'}, route_match.kwargs)
+
+    def test_route_without_path_segment(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        route_match = resolver.resolve('/about')
+
+        eq_('about', route_match.route.name)
+
+    def test_path_converter(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        route_match = resolver.resolve('/files/a/b/c.txt')
+
+        eq_('files', route_match.route.name)
+        eq_({'file_path': 'a/b/c.txt'}, route_match.kwargs)
+
+    def test_unresolvable_path(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        with assert_raises_substring(UnresolvablePathError, 'articles/4/2'):
+            resolver.resolve('/articles/4/2')
+
+    def test_rejected_value(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        with assert_raises_substring(UnresolvablePathError, 'files'):
+            resolver.resolve('/files')
+
+    def test_first_route_for_path(self):
+        route = Route(
+            None,
+            None,
+            [
+                Route(None, 'route_1', (), 'path'),
+                Route(None, 'route_2', (), 'path'),
+                ],
+            )
+        resolver = RouteResolver(route)
+
+        eq_('route_1', resolver.resolve('path').route.name)
+
+    def test_dynamic_segment_declared_before_static_segment(self):
+        route = Route(
+            None,
+            None,
+            [
+                Route(None, 'article', (), '<slug:slug>'),
+                Route(None, 'latest_article', (), 'latest'),
+                ],
+            )
+        resolver = RouteResolver(route)
+
+        route_match = resolver.resolve('latest')
+
+        eq_('article', route_match.route.name)
+        eq_({'slug': 'latest'}, route_match.kwargs)
+
+    def test_declaration_order_across_branches(self):
+        route = Route(
+            None,
+            None,
+            [
+                Route(None, 'archive', (), 'articles/archive'),
+                Route(None, 'latest_entry', (), '<slug:section>/latest'),
+                Route(None, 'latest_article', (), 'articles/latest'),
+                ],
+            )
+        resolver = RouteResolver(route)
+
+        eq_('archive', resolver.resolve('articles/archive').route.name)
+
+        route_match = resolver.resolve('articles/latest')
+
+        eq_('latest_entry', route_match.route.name)
+        eq_({'section': 'articles'}, route_match.kwargs)
+
+    def test_path_converter_declared_before_other_segments(self):
+        route = Route(
+            None,
+            None,
+            [
+                Route(None, 'file', (), '<path:file_path>'),
+                Route(None, 'about', (), 'about'),
+                ],
+            )
+        resolver = RouteResolver(route)
+
+        eq_('file', resolver.resolve('about').route.name)
+
+    def test_backtracking(self):
+        route = Route(
+            None,
+            None,
+            [
+                Route(None, None, [Route(None, 'edit', (), 'edit')], 'new'),
+                Route(
+                    None,
+                    None,
+                    [Route(None, 'delete', (), 'delete')],
+                    '<pk>',
+                    ),
+                ],
+            )
+        resolver = RouteResolver(route)
+
+        route_match = resolver.resolve('new/delete')
+
+        eq_('delete', route_match.route.name)
+        eq_({'pk': 'new'}, route_match.kwargs)
+
+    def test_specialization(self):
+        route = _build_route_tree()
+        article_route = route.get_route_by_name('article')
+        articles_route = route.get_route_by_name('articles')
+        specialized_route = route.create_specialization(
+            specialized_sub_routes=[
+                articles_route.create_specialization(
+                    specialized_sub_routes=[
+                        article_route.create_specialization(
+                            path_segment='<uuid:pk>',
+                            ),
+                        ],
+                    ),
+                ],
+            )
+        resolver = RouteResolver(specialized_route)
+        article_uuid = '12345678-1234-5678-1234-567812345678'
+
+        route_match = resolver.resolve('/articles/' + article_uuid)
+
+        eq_('article', route_match.route.name)
+        eq_({'pk': UUID(article_uuid)}, route_match.kwargs)
+
+    def test_tenant_route_tree(self):
+        route_forest = RouteForest(_build_route_tree())
+        tenant_route_tree = route_forest.add_tenant(
+            'tenant',
+            additional_sub_routes_by_route_name={
+                'articles': [Route(None, 'archive', (), 'archive/all')],
+                },
+            )
+        resolver = RouteResolver(tenant_route_tree.root)
+
+        route_match = resolver.resolve('/articles/archive/all')
+
+        eq_('archive', route_match.route.name)
+
+    def test_compiled_route_tree(self):
+        compiled_route_tree = _build_route_tree().compile()
+        resolver = RouteResolver(compiled_route_tree.root)
+
+        route_match = resolver.resolve('/articles/42')
+
+        eq_('article', route_match.route.name)
+        eq_(_article_view, route_match.view)
+        eq_({'pk': 42}, route_match.kwargs)
+
+    def test_custom_converter(self):
+        class YearConverter(StringConverter):
+            regex = '[0-9]{4}'
+
+            def to_python(self, value):
+                return int(value)
+
+        route = Route(None, 'year', (), '<year:year>')
+        resolver = RouteResolver(route, {'year': YearConverter()})
+
+        eq_({'year': 2013}, resolver.resolve('2013').kwargs)
+        with assert_raises_substring(UnresolvablePathError, '13'):
+            resolver.resolve('13')
+
+
+class TestReversal(object):
+
+    def test_root(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        eq_('/', resolver.reverse('home'))
+
+    def test_static_segments(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        eq_('/articles/latest/', resolver.reverse('latest_article'))
+
+    def test_converted_segment(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        eq_('/articles/42/', resolver.reverse('article', pk=42))
+
+    def test_route_without_path_segment(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        eq_('/about/', resolver.reverse('about'))
+
+    def test_path_converter(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        url = resolver.reverse('files', file_path='a/b c.txt')
+
+        eq_('/files/a/b%20c.txt/', url)
+
+    def test_round_trip(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        url = resolver.reverse('article_by_slug', slug='my-article')
+
+        route_match = resolver.resolve(url)
+
+        eq_('article_by_slug', route_match.route.name)
+        eq_({'slug': 'my-article'}, route_match.kwargs)
+
+    def test_static_segment_with_braces(self):
+        route = Route(None, 'route', (), '{a}/<b>')
+        resolver = RouteResolver(route)
+
+        eq_('/%7Ba%7D/c/', resolver.reverse('route', b='c'))
+
+    def test_non_existing_route(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        with assert_raises_substring(NonExistingRouteError, 'non_existing'):
+            resolver.reverse('non_existing')
+
+    def test_missing_argument(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        with assert_raises_substring(InvalidURLArgumentsError, 'pk'):
+            resolver.reverse('article')
+
+    def test_unexpected_argument(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        with assert_raises_substring(InvalidURLArgumentsError, 'slug'):
+            resolver.reverse('article', slug='my-article')
+
+    def test_invalid_argument_value(self):
+        resolver = RouteResolver(_build_route_tree())
+
+        with assert_raises_substring(InvalidURLArgumentsError, 'article'):
+            resolver.reverse('article', pk='not-a-number')
+
+    def test_specialization(self):
+        route = _build_route_tree()
+        articles_route = route.get_route_by_name('articles')
+        specialized_route = route.create_specialization(
+            specialized_sub_routes=[
+                articles_route.create_specialization(path_segment='news'),
+                ],
+            )
+        resolver = RouteResolver(specialized_route)
+
+        eq_('/news/42/', resolver.reverse('article', pk=42))
+
+    def test_repeated_argument(self):
+        route = Route(None, 'route', [Route(None, None, (), '<a>')], '<a>')
+
+        with assert_raises_substring(InvalidPathSegmentError, 'repeats'):
+            RouteResolver(route)
+
+
+class TestPathSegments(object):
+
+    def test_unknown_converter(self):
+        route = Route(None, None, (), '<float:value>')
+
+        with assert_raises_substring(InvalidPathSegmentError, 'float'):
+            RouteResolver(route)
+
+    def test_mixed_path_component(self):
+        route = Route(None, None, (), 'page-<int:number>')
+
+        with assert_raises_substring(InvalidPathSegmentError, 'page-'):
+            RouteResolver(route)
+
+    def test_default_converter(self):
+        route = Route(None, 'route', (), 'users/<username>')
+        resolver = RouteResolver(route)
+
+        route_match = resolver.resolve('users/jane')
+
+        ok_(route is route_match.route)
+        eq_({'username': 'jane'}, route_match.kwargs)
@@ -17,17 +17,83 @@
 
 #pylint:disable=R0201
 
+from pickle import dumps
+from pickle import loads
+
+try:
+    import tracemalloc
+except ImportError:
+    # Python 2
+    tracemalloc = None
+
+from nose.plugins.skip import SkipTest
+from nose.tools import assert_false
 from nose.tools import eq_
+from nose.tools import ok_
 
+from django_routing.routes import DuplicatedRouteError
 from django_routing.routes import Route
+from django_routing.routes import deferred_validation
 
 from tests.assertions import assert_equivalent
 from tests.assertions import assert_non_equivalent
+from tests.assertions import assert_raises_substring
 from tests.fixtures import FAKE_ROUTE_NAME
 from tests.fixtures import FAKE_SUB_ROUTES
 from tests.fixtures import FAKE_VIEW
 
 
+# Upper bound of the memory allocated per node by routes and their
+# specializations, with some leeway over the ~250 and ~280 bytes measured on
+# CPython 3.11
+_MAXIMUM_BYTES_PER_NODE = 350
+
+
+def _build_wide_route_tree(group_count=10, sub_routes_per_group=100):
+    groups = []
+    for group_index in range(group_count):
+        leaf_routes = [
+            Route(None, 'route_{}_{}'.format(group_index, leaf_index))
+            for leaf_index in range(sub_routes_per_group)
+            ]
+        groups.append(Route(None, None, leaf_routes))
+
+    root_route = Route(None, None, groups)
+    return root_route
+
+
+def _specialize_route_tree(route_tree):
+    specialized_groups = []
+    for group in route_tree.sub_routes:
+        specialized_leaf_routes = [
+            leaf_route.create_specialization()
+            for leaf_route in group.sub_routes
+            ]
+        specialized_groups.append(group.create_specialization(
+            specialized_sub_routes=specialized_leaf_routes,
+            ))
+
+    specialized_route_tree = route_tree.create_specialization(
+        specialized_sub_routes=specialized_groups,
+        )
+    return specialized_route_tree
+
+
+def _measure_bytes_per_node(tree_builder, *args):
+    if tracemalloc is None:
+        raise SkipTest('Memory allocations can only be traced on Python 3')
+
+    tracemalloc.start()
+    try:
+        route_tree = tree_builder(*args)
+        allocated_bytes = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    node_count = len(list(route_tree.walk()))
+    return route_tree, float(allocated_bytes) / node_count
+
+
 class TestBaseRoute(object):
 
     def test_repr(self):
@@ -48,6 +114,212 @@ class TestBaseRoute(object):
         route = Route(FAKE_VIEW, FAKE_ROUTE_NAME)
         eq_(FAKE_VIEW, route.view)
 
+    def test_getting_path_segment(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, path_segment='articles')
+        eq_('articles', route.path_segment)
+
+    def test_getting_unset_path_segment(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME)
+        eq_(None, route.path_segment)
+
+
+class TestRouteNames(object):
+
+    def test_route_names(self):
+        route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [Route(None, None, FAKE_SUB_ROUTES), Route(None, 'sub_route_1')],
+            )
+
+        eq_(
+            [FAKE_ROUTE_NAME, 'sub_route_2', 'sub_route_1'],
+            route.get_route_names(),
+            )
+
+    def test_iterating_route_names(self):
+        route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [Route(None, None, FAKE_SUB_ROUTES), Route(None, 'sub_route_1')],
+            )
+
+        route_names = route.iter_route_names()
+
+        eq_(FAKE_ROUTE_NAME, next(route_names))
+        eq_(['sub_route_2', 'sub_route_1'], list(route_names))
+
+
+class TestWalking(object):
+
+    def test_pre_order(self):
+        sub_route_1_1 = Route(None, 'sub_route_1_1')
+        sub_route_1 = Route(None, 'sub_route_1', [sub_route_1_1])
+        sub_route_2 = Route(None, 'sub_route_2')
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, [sub_route_1, sub_route_2])
+
+        expected_walk = [
+            (route, 0, None),
+            (sub_route_1, 1, route),
+            (sub_route_1_1, 2, sub_route_1),
+            (sub_route_2, 1, route),
+            ]
+        eq_(expected_walk, list(route.walk()))
+        eq_(expected_walk, list(route.walk('pre')))
+
+    def test_post_order(self):
+        sub_route_1_1 = Route(None, 'sub_route_1_1')
+        sub_route_1 = Route(None, 'sub_route_1', [sub_route_1_1])
+        sub_route_2 = Route(None, 'sub_route_2')
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, [sub_route_1, sub_route_2])
+
+        expected_walk = [
+            (sub_route_1_1, 2, sub_route_1),
+            (sub_route_1, 1, route),
+            (sub_route_2, 1, route),
+            (route, 0, None),
+            ]
+        eq_(expected_walk, list(route.walk('post')))
+
+    def test_laziness(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+        route_walk = route.walk()
+
+        eq_((route, 0, None), next(route_walk))
+
+    def test_unknown_order(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        with assert_raises_substring(ValueError, "order 'in'"):
+            route.walk('in')
+
+    def test_deep_route(self):
+        with deferred_validation():
+            route = Route(None, 'route_0')
+            for route_index in range(1, 5000):
+                route = Route(None, 'route_{}'.format(route_index), [route])
+
+        deepest_route, depth, _ = list(route.walk())[-1]
+        eq_('route_0', deepest_route.name)
+        eq_(4999, depth)
+        eq_(5000, len(route.get_route_names()))
+
+    def test_deep_sub_route_validation(self):
+        with deferred_validation():
+            sub_route = Route(None, 'route_0')
+            for route_index in range(1, 1500):
+                route_name = 'route_{}'.format(route_index)
+                sub_route = Route(None, route_name, [sub_route])
+
+        with assert_raises_substring(DuplicatedRouteError, 'route_0'):
+            Route(None, 'route_0', [sub_route])
+
+    def test_deep_eager_validation(self):
+        route = Route(None, 'route_0')
+        for route_index in range(1, 20000):
+            route = Route(None, 'route_{}'.format(route_index), [route])
+
+        with assert_raises_substring(DuplicatedRouteError, 'route_0'):
+            Route(None, None, [Route(None, 'route_0'), route])
+
+
+class TestCompactness(object):
+
+    def test_routes_without_attribute_dictionaries(self):
+        route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        assert_false(hasattr(route, '__dict__'))
+        assert_false(hasattr(route.sub_routes, '__dict__'))
+
+    def test_specializations_without_attribute_dictionaries(self):
+        generalized_route = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+        specialized_route = generalized_route.create_specialization()
+
+        assert_false(hasattr(specialized_route, '__dict__'))
+        assert_false(hasattr(specialized_route.sub_routes, '__dict__'))
+
+    def test_leaf_routes_sharing_sub_routes(self):
+        route_1 = Route(FAKE_VIEW, 'route_1')
+        route_2 = Route(FAKE_VIEW, 'route_2')
+
+        ok_(route_1.sub_routes is route_2.sub_routes)
+
+    def test_leaf_specializations_sharing_sub_routes(self):
+        specialized_route_1 = \
+            Route(FAKE_VIEW, 'route_1').create_specialization()
+        specialized_route_2 = \
+            Route(FAKE_VIEW, 'route_2').create_specialization()
+
+        ok_(specialized_route_1.sub_routes is specialized_route_2.sub_routes)
+
+    def test_bytes_per_route(self):
+        bytes_per_route = _measure_bytes_per_node(_build_wide_route_tree)[1]
+
+        ok_(bytes_per_route < _MAXIMUM_BYTES_PER_NODE, bytes_per_route)
+
+    def test_bytes_per_specialization(self):
+        bytes_per_specialization = _measure_bytes_per_node(
+            _specialize_route_tree,
+            _build_wide_route_tree(),
+            )[1]
+
+        ok_(
+            bytes_per_specialization < _MAXIMUM_BYTES_PER_NODE,
+            bytes_per_specialization,
+            )
+
+    def test_route_names_only_kept_by_root(self):
+        leaf_route = Route(None, 'leaf_route')
+        sub_route = Route(None, 'sub_route', [leaf_route])
+        route = Route(None, FAKE_ROUTE_NAME, [sub_route])
+
+        eq_(
+            {FAKE_ROUTE_NAME, 'sub_route', 'leaf_route'},
+            route._get_route_name_set(),
+            )
+        for route_or_collection in (
+            leaf_route,
+            sub_route,
+            sub_route.sub_routes,
+            route.sub_routes,
+            ):
+            eq_(None, route_or_collection._route_names)
+
+    def test_generalization_names_kept_by_generalization(self):
+        route = Route(None, FAKE_ROUTE_NAME, [Route(None, 'sub_route')])
+        route_names = route._get_route_name_set()
+
+        specialized_route = route.create_specialization(
+            additional_sub_routes=[Route(None, 'additional_sub_route')],
+            )
+
+        ok_(route_names is route._get_route_name_set())
+        eq_({FAKE_ROUTE_NAME, 'sub_route'}, route_names)
+        eq_(None, route.sub_routes._route_names)
+        eq_(
+            {FAKE_ROUTE_NAME, 'sub_route', 'additional_sub_route'},
+            specialized_route._get_route_name_set(),
+            )
+
+    def test_empty_sub_routes_names_untouched(self):
+        leaf_route_1 = Route(None, 'leaf_route_1')
+        empty_sub_routes_names = leaf_route_1.sub_routes._route_names
+
+        leaf_route_2 = Route(None, 'leaf_route_2')
+        specialized_leaf_route = leaf_route_2.create_specialization()
+
+        eq_(set(), empty_sub_routes_names)
+        ok_(leaf_route_2.sub_routes._route_names is empty_sub_routes_names)
+        eq_(set(), specialized_leaf_route.sub_routes._route_names)
+        eq_({'leaf_route_2'}, specialized_leaf_route._get_route_name_set())
+
+    def test_sub_route_reused_after_handing_over_names(self):
+        sub_route = Route(None, 'sub_route', [Route(None, 'leaf_route')])
+        Route(None, 'route_1', [sub_route])
+
+        with assert_raises_substring(DuplicatedRouteError, 'leaf_route'):
+            Route(None, 'route_2', [Route(None, 'leaf_route'), sub_route])
+
 
 class TestEquality(object):
 
@@ -70,9 +342,111 @@ class TestEquality(object):
             Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES),
             Route(FAKE_VIEW, FAKE_ROUTE_NAME, []),
             )
+        assert_non_equivalent(
+            Route(FAKE_VIEW, FAKE_ROUTE_NAME, path_segment='articles'),
+            Route(FAKE_VIEW, FAKE_ROUTE_NAME, path_segment='<int:pk>'),
+            )
 
     def test_non_route(self):
         assert_non_equivalent(
             Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES),
             None,
             )
+
+
+class TestHashing(object):
+
+    def test_routes_with_same_attributes(self):
+        route_1 = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+        route_2 = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        eq_(hash(route_1), hash(route_2))
+        eq_(1, len({route_1, route_2}))
+
+    def test_routes_with_different_attributes(self):
+        route_1 = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+        route_2 = Route(FAKE_VIEW, FAKE_ROUTE_NAME, [])
+
+        eq_(2, len({route_1, route_2}))
+
+    def test_routes_as_dictionary_keys(self):
+        route_1 = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+        route_2 = Route(FAKE_VIEW, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        values_by_route = {route_1: 'value'}
+        eq_('value', values_by_route[route_2])
+
+    def test_unhashable_views(self):
+        route_1 = Route([], FAKE_ROUTE_NAME)
+        route_2 = Route([], FAKE_ROUTE_NAME)
+        route_3 = Route([FAKE_VIEW], FAKE_ROUTE_NAME)
+
+        assert_equivalent(route_1, route_2)
+        eq_(hash(route_1), hash(route_2))
+        assert_non_equivalent(route_1, route_3)
+
+
+class TestPickling(object):
+
+    def test_route(self):
+        route = Route(len, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        unpickled_route = loads(dumps(route))
+
+        assert_equivalent(route, unpickled_route)
+        eq_(hash(route), hash(unpickled_route))
+        eq_(len, unpickled_route.view)
+
+    def test_path_segment(self):
+        route = Route(len, FAKE_ROUTE_NAME, path_segment='<int:pk>')
+
+        unpickled_route = loads(dumps(route))
+
+        assert_equivalent(route, unpickled_route)
+        eq_('<int:pk>', unpickled_route.path_segment)
+
+    def test_shared_sub_routes(self):
+        shared_route = Route(None, None, [Route(len, None)])
+        route = Route(
+            None,
+            FAKE_ROUTE_NAME,
+            [
+                Route(None, 'sub_route_1', [shared_route]),
+                Route(None, 'sub_route_2', [shared_route]),
+                ],
+            )
+
+        unpickled_route = loads(dumps(route))
+
+        unpickled_sub_route_1, unpickled_sub_route_2 = \
+            unpickled_route.sub_routes
+        unpickled_shared_route_1 = tuple(unpickled_sub_route_1.sub_routes)[0]
+        unpickled_shared_route_2 = tuple(unpickled_sub_route_2.sub_routes)[0]
+        ok_(unpickled_shared_route_1 is unpickled_shared_route_2)
+
+    def test_deep_route(self):
+        with deferred_validation():
+            route = Route(None, 'route_0')
+            for route_index in range(1, 5000):
+                route = Route(None, 'route_{}'.format(route_index), [route])
+
+        unpickled_route = loads(dumps(route))
+
+        eq_(
+            Route(None, 'route_0'),
+            unpickled_route.get_route_by_name('route_0'),
+            )
+
+    def test_sub_routes(self):
+        route = Route(None, FAKE_ROUTE_NAME, FAKE_SUB_ROUTES)
+
+        unpickled_sub_routes = loads(dumps(route.sub_routes))
+
+        eq_(route.sub_routes, unpickled_sub_routes)
+
+    def test_empty_sub_routes(self):
+        route = Route(None, FAKE_ROUTE_NAME)
+
+        unpickled_route = loads(dumps(route))
+
+        ok_(route.sub_routes is unpickled_route.sub_routes)
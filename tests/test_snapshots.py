@@ -0,0 +1,352 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from contextlib import contextmanager
+import os
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from nose.tools import assert_false
+from nose.tools import assert_raises
+from nose.tools import eq_
+from nose.tools import ok_
+
+from django_routing.compilation import CompiledRouteTree
+from django_routing.exceptions import RouteSnapshotError
+from django_routing.routes import Route
+from django_routing.snapshots import load_or_build_route_tree
+from django_routing.snapshots import load_route_tree_snapshot
+from django_routing.snapshots import save_route_tree_snapshot
+
+from tests.assertions import assert_raises_substring
+from tests.fixtures import FAKE_VIEW
+
+
+_SOURCE_HASH = 'source hash'
+
+
+def view_1():
+    pass
+
+
+def view_2():
+    pass
+
+
+class ViewContainer(object):
+
+    @staticmethod
+    def view_3():
+        pass
+
+
+def _build_route_tree():
+    route = Route(
+        view_1,
+        'root',
+        [
+            Route(
+                view_2,
+                'a',
+                [Route(ViewContainer.view_3, 'a1', (), '<int:pk>')],
+                'a',
+                ),
+            Route(None, None, [Route(view_1, 'b1')]),
+            ],
+        path_segment='',
+        )
+    return route
+
+
+def _corrupt_snapshot_table(snapshot_path, original_bytes, corrupt_bytes):
+    with open(snapshot_path, 'rb+') as snapshot_file:
+        snapshot_bytes = snapshot_file.read()
+        snapshot_file.seek(snapshot_bytes.index(original_bytes))
+        snapshot_file.write(corrupt_bytes)
+
+
+@contextmanager
+def _temporary_snapshot_path():
+    snapshot_directory_path = mkdtemp()
+    try:
+        yield os.path.join(snapshot_directory_path, 'routes.snapshot')
+    finally:
+        rmtree(snapshot_directory_path)
+
+
+class _CountingRouteTreeBuilder(object):
+
+    def __init__(self):
+        super(_CountingRouteTreeBuilder, self).__init__()
+
+        self.build_count = 0
+
+    def __call__(self):
+        self.build_count += 1
+        return _build_route_tree()
+
+
+class TestSnapshotRoundTrip(object):
+
+    def test_structure(self):
+        with _temporary_snapshot_path() as snapshot_path:
+            route = _build_route_tree()
+            save_route_tree_snapshot(route, snapshot_path, _SOURCE_HASH)
+
+            route_tree = \
+                load_route_tree_snapshot(snapshot_path, _SOURCE_HASH)
+
+            eq_(CompiledRouteTree, type(route_tree))
+            eq_(5, len(route_tree))
+            eq_(route.get_route_names(), route_tree.get_route_names())
+            eq_(
+                ['a', None],
+                [sub_route.name for sub_route in route_tree.root.sub_routes],
+                )
+            eq_('a', route_tree.get_route_by_name('a1').parent.name)
+
+    def test_views(self):
+        with _temporary_snapshot_path() as snapshot_path:
+            route = _build_route_tree()
+            save_route_tree_snapshot(route, snapshot_path, _SOURCE_HASH)
+
+            route_tree = \
+                load_route_tree_snapshot(snapshot_path, _SOURCE_HASH)
+
+            eq_(view_1, route_tree.root.view)
+            eq_(view_2, route_tree.get_route_by_name('a').view)
+            eq_(ViewContainer.view_3, route_tree.get_route_by_name('a1').view)
+            eq_(None, route_tree.root.sub_routes[1].view)
+
+    def test_path_segments(self):
+        with _temporary_snapshot_path() as snapshot_path:
+            route = _build_route_tree()
+            save_route_tree_snapshot(route, snapshot_path, _SOURCE_HASH)
+
+            route_tree = \
+                load_route_tree_snapshot(snapshot_path, _SOURCE_HASH)
+
+            eq_('', route_tree.root.path_segment)
+            eq_('<int:pk>', route_tree.get_route_by_name('a1').path_segment)
+            eq_(None, route_tree.get_route_by_name('b1').path_segment)
+
+    def test_compiled_route_tree(self):
+        with _temporary_snapshot_path() as snapshot_path:
+            route_tree = _build_route_tree().compile()
+            save_route_tree_snapshot(
+                route_tree,
+                snapshot_path,
+                _SOURCE_HASH,
+                )
+
+            loaded_route_tree = \
+                load_route_tree_snapshot(snapshot_path, _SOURCE_HASH)
+
+            eq_(
+                route_tree.get_route_names(),
+                loaded_route_tree.get_route_names(),
+                )
+
+    def test_view_without_dotted_path(self):
+        with _temporary_snapshot_path() as snapshot_path:
+            route = Route(FAKE_VIEW, 'root')
+
+            with assert_raises_substring(
+                RouteSnapshotError,
+                'cannot be imported by its dotted path',
+                ):
+                save_route_tree_snapshot(route, snapshot_path, _SOURCE_HASH)
+
+    def test_stale_snapshot(self):
+        with _temporary_snapshot_path() as snapshot_path:
+            route = _build_route_tree()
+            save_route_tree_snapshot(route, snapshot_path, _SOURCE_HASH)
+
+            with assert_raises_substring(RouteSnapshotError, 'is stale'):
+                load_route_tree_snapshot(snapshot_path, 'new source hash')
+
+    def test_empty_snapshot(self):
+        with _temporary_snapshot_path() as snapshot_path:
+            open(snapshot_path, 'wb').close()
+
+            with assert_raises_substring(RouteSnapshotError, 'is empty'):
+                load_route_tree_snapshot(snapshot_path, _SOURCE_HASH)
+
+    def test_truncated_snapshot(self):
+        with _temporary_snapshot_path() as snapshot_path:
+            route = _build_route_tree()
+            save_route_tree_snapshot(route, snapshot_path, _SOURCE_HASH)
+            with open(snapshot_path, 'rb+') as snapshot_file:
+                snapshot_file.truncate(os.path.getsize(snapshot_path) - 1)
+
+            with assert_raises_substring(RouteSnapshotError, 'is truncated'):
+                load_route_tree_snapshot(snapshot_path, _SOURCE_HASH)
+
+    def test_snapshot_with_invalid_json_table(self):
+        with _temporary_snapshot_path() as snapshot_path:
+            route = _build_route_tree()
+            save_route_tree_snapshot(route, snapshot_path, _SOURCE_HASH)
+            _corrupt_snapshot_table(snapshot_path, b'{', b'[')
+
+            with assert_raises_substring(RouteSnapshotError, 'is corrupt'):
+                load_route_tree_snapshot(snapshot_path, _SOURCE_HASH)
+
+    def test_snapshot_with_invalid_utf8_table(self):
+        with _temporary_snapshot_path() as snapshot_path:
+            route = _build_route_tree()
+            save_route_tree_snapshot(route, snapshot_path, _SOURCE_HASH)
+            _corrupt_snapshot_table(snapshot_path, b'{', b'\xff')
+
+            with assert_raises_substring(RouteSnapshotError, 'is corrupt'):
+                load_route_tree_snapshot(snapshot_path, _SOURCE_HASH)
+
+    def test_snapshot_with_incomplete_table(self):
+        with _temporary_snapshot_path() as snapshot_path:
+            route = _build_route_tree()
+            save_route_tree_snapshot(route, snapshot_path, _SOURCE_HASH)
+            _corrupt_snapshot_table(
+                snapshot_path,
+                b'"names"',
+                b'"namez"',
+                )
+
+            with assert_raises_substring(RouteSnapshotError, 'is corrupt'):
+                load_route_tree_snapshot(snapshot_path, _SOURCE_HASH)
+
+    def test_failed_save(self):
+        with _temporary_snapshot_path() as snapshot_path:
+            # The snapshot cannot replace a directory
+            os.mkdir(snapshot_path)
+
+            with assert_raises(OSError):
+                save_route_tree_snapshot(
+                    _build_route_tree(),
+                    snapshot_path,
+                    _SOURCE_HASH,
+                    )
+
+            eq_(
+                [os.path.basename(snapshot_path)],
+                os.listdir(os.path.dirname(snapshot_path)),
+                )
+
+
+class TestLoadingOrBuilding(object):
+
+    def test_missing_snapshot(self):
+        build_route_tree = _CountingRouteTreeBuilder()
+        with _temporary_snapshot_path() as snapshot_path:
+            route_tree = load_or_build_route_tree(
+                snapshot_path,
+                build_route_tree,
+                _SOURCE_HASH,
+                )
+
+            eq_(1, build_route_tree.build_count)
+            eq_(CompiledRouteTree, type(route_tree))
+            snapshot_route_tree = \
+                load_route_tree_snapshot(snapshot_path, _SOURCE_HASH)
+            eq_(
+                route_tree.get_route_names(),
+                snapshot_route_tree.get_route_names(),
+                )
+
+    def test_existing_snapshot(self):
+        build_route_tree = _CountingRouteTreeBuilder()
+        with _temporary_snapshot_path() as snapshot_path:
+            save_route_tree_snapshot(
+                _build_route_tree(),
+                snapshot_path,
+                _SOURCE_HASH,
+                )
+
+            route_tree = load_or_build_route_tree(
+                snapshot_path,
+                build_route_tree,
+                _SOURCE_HASH,
+                )
+
+            eq_(0, build_route_tree.build_count)
+            eq_(view_2, route_tree.get_route_by_name('a').view)
+
+    def test_stale_snapshot(self):
+        build_route_tree = _CountingRouteTreeBuilder()
+        with _temporary_snapshot_path() as snapshot_path:
+            save_route_tree_snapshot(
+                Route(view_1, 'old_root'),
+                snapshot_path,
+                'old source hash',
+                )
+
+            route_tree = load_or_build_route_tree(
+                snapshot_path,
+                build_route_tree,
+                _SOURCE_HASH,
+                )
+
+            eq_(1, build_route_tree.build_count)
+            eq_('root', route_tree.root.name)
+            # The stale snapshot was replaced
+            load_route_tree_snapshot(snapshot_path, _SOURCE_HASH)
+
+    def test_failed_save(self):
+        build_route_tree = _CountingRouteTreeBuilder()
+        with _temporary_snapshot_path() as snapshot_path:
+            # The snapshot cannot replace a directory
+            os.mkdir(snapshot_path)
+
+            route_tree = load_or_build_route_tree(
+                snapshot_path,
+                build_route_tree,
+                _SOURCE_HASH,
+                )
+
+            eq_(1, build_route_tree.build_count)
+            eq_('root', route_tree.root.name)
+            ok_(os.path.isdir(snapshot_path))
+
+    def test_route_tree_that_cannot_be_saved(self):
+        with _temporary_snapshot_path() as snapshot_path:
+            route_tree = load_or_build_route_tree(
+                snapshot_path,
+                lambda: Route(lambda request: None, 'root'),
+                _SOURCE_HASH,
+                )
+
+            eq_('root', route_tree.root.name)
+            assert_false(os.path.exists(snapshot_path))
+
+    def test_corrupt_snapshot(self):
+        build_route_tree = _CountingRouteTreeBuilder()
+        with _temporary_snapshot_path() as snapshot_path:
+            save_route_tree_snapshot(
+                _build_route_tree(),
+                snapshot_path,
+                _SOURCE_HASH,
+                )
+            _corrupt_snapshot_table(snapshot_path, b'{', b'\xff')
+
+            route_tree = load_or_build_route_tree(
+                snapshot_path,
+                build_route_tree,
+                _SOURCE_HASH,
+                )
+
+            eq_(1, build_route_tree.build_count)
+            eq_('root', route_tree.root.name)
+            # The corrupt snapshot was replaced
+            load_route_tree_snapshot(snapshot_path, _SOURCE_HASH)
@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from nose.tools import eq_
+from nose.tools import ok_
+
+from django_routing.routes import DuplicatedRouteError
+from django_routing.routes import InvalidSpecializationError
+from django_routing.routes import NonExistingRouteError
+from django_routing.routes import Route
+
+from tests.assertions import assert_raises_substring
+from tests.fixtures import FAKE_ROUTE_NAME
+from tests.fixtures import FAKE_VIEW
+
+
+def _build_route_tree():
+    route = Route(
+        None,
+        FAKE_ROUTE_NAME,
+        [
+            Route(None, 'sub_route_1', [Route(None, 'leaf_route')]),
+            Route(None, 'sub_route_2', [Route(None, None)]),
+            ],
+        )
+    return route
+
+
+def _specialize_route_tree(route):
+    specialized_route = route.create_specialization(
+        additional_sub_routes=[Route(None, 'additional_sub_route')],
+        )
+    return specialized_route
+
+
+class TestReplacingRoutes(object):
+
+    def test_replacing_sub_route(self):
+        route = _build_route_tree()
+        sub_route_2 = route.get_route_by_name('sub_route_2')
+        new_route = Route(None, 'new_route', [Route(None, 'new_leaf_route')])
+
+        updated_route = route.with_route_replaced('sub_route_1', new_route)
+
+        expected_route = Route(None, FAKE_ROUTE_NAME, [new_route, sub_route_2])
+        eq_(expected_route, updated_route)
+        ok_(new_route is updated_route.get_route_by_name('new_route'))
+
+    def test_sharing_untouched_routes(self):
+        route = _build_route_tree()
+        sub_route_2 = route.get_route_by_name('sub_route_2')
+        new_route = Route(FAKE_VIEW, 'leaf_route')
+
+        updated_route = route.with_route_replaced('leaf_route', new_route)
+
+        ok_(sub_route_2 is updated_route.get_route_by_name('sub_route_2'))
+        eq_(
+            Route(None, 'sub_route_1', [new_route]),
+            updated_route.get_route_by_name('sub_route_1'),
+            )
+
+    def test_original_route_unchanged(self):
+        route = _build_route_tree()
+
+        route.with_route_replaced('leaf_route', Route(None, 'new_route'))
+
+        eq_(
+            [FAKE_ROUTE_NAME, 'sub_route_1', 'leaf_route', 'sub_route_2'],
+            route.get_route_names(),
+            )
+
+    def test_replacing_root_route(self):
+        route = _build_route_tree()
+        new_route = Route(None, 'new_route')
+
+        updated_route = route.with_route_replaced(FAKE_ROUTE_NAME, new_route)
+
+        ok_(new_route is updated_route)
+
+    def test_reusing_replaced_names(self):
+        route = _build_route_tree()
+        new_route = Route(None, 'sub_route_1', [Route(None, 'leaf_route')])
+
+        updated_route = route.with_route_replaced('sub_route_1', new_route)
+
+        eq_(route, updated_route)
+
+    def test_duplicated_route_name(self):
+        route = _build_route_tree()
+        new_route = Route(None, 'new_route', [Route(None, 'sub_route_2')])
+
+        with assert_raises_substring(DuplicatedRouteError, 'sub_route_2'):
+            route.with_route_replaced('leaf_route', new_route)
+
+    def test_duplicated_unnamed_route(self):
+        route = Route(
+            None,
+            FAKE_ROUTE_NAME,
+            [Route(None, None), Route(None, 'leaf_route')],
+            )
+
+        with assert_raises_substring(DuplicatedRouteError, 'Route'):
+            route.with_route_replaced('leaf_route', Route(None, None))
+
+    def test_non_existing_route(self):
+        route = _build_route_tree()
+
+        with assert_raises_substring(
+            NonExistingRouteError,
+            'does not contain one named',
+            ):
+            route.with_route_replaced('non_existing', Route(None, None))
+
+    def test_updating_replaced_route(self):
+        route = _build_route_tree()
+        new_route = Route(None, 'new_route', [Route(None, 'new_leaf_route')])
+        updated_route = route.with_route_replaced('sub_route_1', new_route)
+
+        twice_updated_route = \
+            updated_route.with_view('new_leaf_route', FAKE_VIEW)
+
+        eq_(
+            FAKE_VIEW,
+            twice_updated_route.get_route_by_name('new_leaf_route').view,
+            )
+        with assert_raises_substring(NonExistingRouteError, 'leaf_route'):
+            updated_route.with_view('leaf_route', FAKE_VIEW)
+
+    def test_duplicated_route_name_after_replacement(self):
+        route = _build_route_tree()
+
+        updated_route = route.with_route_replaced(
+            'sub_route_1',
+            Route(None, 'new_route'),
+            )
+
+        with assert_raises_substring(DuplicatedRouteError, 'new_route'):
+            updated_route.with_route_replaced(
+                'sub_route_2',
+                Route(None, 'new_route'),
+                )
+
+    def test_repeated_replacements(self):
+        updated_route = _build_route_tree()
+        for replacement_index in range(10):
+            new_leaf_routes = [
+                Route(None, 'leaf_{}_{}'.format(replacement_index, leaf_index))
+                for leaf_index in range(replacement_index % 3 * 5)
+                ]
+            updated_route = updated_route.with_route_replaced(
+                'sub_route_1',
+                Route(None, 'sub_route_1', new_leaf_routes),
+                )
+            updated_route = updated_route.with_view('sub_route_2', FAKE_VIEW)
+
+        # The last replacement had no leaf routes
+        eq_(
+            [FAKE_ROUTE_NAME, 'sub_route_1', 'sub_route_2'],
+            updated_route.get_route_names(),
+            )
+        eq_(FAKE_VIEW, updated_route.get_route_by_name('sub_route_2').view)
+
+
+class TestSettingViews(object):
+
+    def test_setting_view(self):
+        route = _build_route_tree()
+        sub_route_2 = route.get_route_by_name('sub_route_2')
+
+        updated_route = route.with_view('leaf_route', FAKE_VIEW)
+
+        eq_(FAKE_VIEW, updated_route.get_route_by_name('leaf_route').view)
+        eq_(None, route.get_route_by_name('leaf_route').view)
+        ok_(sub_route_2 is updated_route.get_route_by_name('sub_route_2'))
+
+    def test_setting_view_of_route_with_sub_routes(self):
+        route = _build_route_tree()
+        leaf_route = route.get_route_by_name('leaf_route')
+
+        updated_route = route.with_view('sub_route_1', FAKE_VIEW)
+
+        updated_sub_route = updated_route.get_route_by_name('sub_route_1')
+        eq_(FAKE_VIEW, updated_sub_route.view)
+        ok_(leaf_route is updated_route.get_route_by_name('leaf_route'))
+
+    def test_setting_views_repeatedly(self):
+        route = _build_route_tree()
+
+        updated_route = route.with_view('leaf_route', FAKE_VIEW)
+
+        twice_updated_route = updated_route.with_view('sub_route_2', FAKE_VIEW)
+
+        eq_(
+            FAKE_VIEW,
+            twice_updated_route.get_route_by_name('leaf_route').view,
+            )
+        eq_(
+            FAKE_VIEW,
+            twice_updated_route.get_route_by_name('sub_route_2').view,
+            )
+
+    def test_names_of_updated_route(self):
+        route = _build_route_tree()
+
+        updated_route = route.with_view('leaf_route', FAKE_VIEW)
+
+        with assert_raises_substring(DuplicatedRouteError, 'leaf_route'):
+            Route(None, 'leaf_route', [updated_route])
+
+
+class TestUpdatingSpecializations(object):
+
+    def test_setting_view_of_additional_sub_route(self):
+        specialized_route = _specialize_route_tree(_build_route_tree())
+
+        updated_route = \
+            specialized_route.with_view('additional_sub_route', FAKE_VIEW)
+
+        updated_sub_route = \
+            updated_route.get_route_by_name('additional_sub_route')
+        eq_(Route(FAKE_VIEW, 'additional_sub_route'), updated_sub_route)
+
+    def test_setting_view_of_inherited_sub_route(self):
+        route = _build_route_tree()
+        specialized_route = _specialize_route_tree(route)
+        leaf_route = route.get_route_by_name('leaf_route')
+
+        updated_route = specialized_route.with_view('leaf_route', FAKE_VIEW)
+
+        updated_leaf_route = updated_route.get_route_by_name('leaf_route')
+        eq_(FAKE_VIEW, updated_leaf_route.view)
+        eq_(
+            leaf_route,
+            updated_leaf_route.get_route_generalization(updated_leaf_route),
+            )
+        eq_(
+            specialized_route.get_route_names(),
+            updated_route.get_route_names(),
+            )
+
+    def test_setting_view_of_specialized_sub_route(self):
+        specialized_route = _specialize_route_tree(_build_route_tree())
+
+        updated_route = specialized_route.with_view('leaf_route', FAKE_VIEW)
+
+        twice_updated_route = updated_route.with_view('leaf_route', None)
+
+        updated_leaf_route = \
+            twice_updated_route.get_route_by_name('leaf_route')
+        eq_(None, updated_leaf_route.view)
+
+    def test_replacing_inherited_sub_route_with_specialization(self):
+        route = _build_route_tree()
+        specialized_route = _specialize_route_tree(route)
+        sub_route_1 = route.get_route_by_name('sub_route_1')
+        new_route = sub_route_1.create_specialization(FAKE_VIEW)
+
+        updated_route = specialized_route.with_route_replaced(
+            'sub_route_1',
+            new_route,
+            )
+
+        ok_(new_route is updated_route.get_route_by_name('sub_route_1'))
+
+    def test_replacing_inherited_sub_route_with_non_specialization(self):
+        specialized_route = _specialize_route_tree(_build_route_tree())
+
+        with assert_raises_substring(
+            InvalidSpecializationError,
+            'is not specialized',
+            ):
+            specialized_route.with_route_replaced(
+                'sub_route_1',
+                Route(None, 'new_route'),
+                )
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+##############################################################################
+#
+# Copyright (c) 2013, 2degrees Limited.
+# All Rights Reserved.
+#
+# This file is part of django-routing
+# <https://github.com/2degrees/django-routing/>, which is subject to the
+# provisions of the BSD at
+# <http://dev.2degreesnetwork.com/p/2degrees-license.html>. A copy of the
+# license should accompany this distribution. THIS SOFTWARE IS PROVIDED "AS IS"
+# AND ANY AND ALL EXPRESS OR IMPLIED WARRANTIES ARE DISCLAIMED, INCLUDING, BUT
+# NOT LIMITED TO, THE IMPLIED WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST
+# INFRINGEMENT, AND FITNESS FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+
+from threading import Thread
+
+from nose.tools import eq_
+
+from django_routing.routes import DuplicatedRouteError
+from django_routing.routes import InvalidSpecializationError
+from django_routing.routes import Route
+from django_routing.routes import deferred_validation
+
+from tests.assertions import assert_raises_substring
+from tests.fixtures import FAKE_ROUTE_NAME
+from tests.fixtures import FAKE_SUB_ROUTES
+from tests.fixtures import FAKE_VIEW
+
+
+class TestDeferredValidation(object):
+
+    def test_valid_route(self):
+        with deferred_validation():
+            route = Route(
+                FAKE_VIEW,
+                FAKE_ROUTE_NAME,
+                [Route(None, None, FAKE_SUB_ROUTES), Route(None, 'sub_route')],
+                )
+
+        route.validate()
+
+    def test_valid_specialization(self):
+        generalized_sub_route = Route(None, 'sub_route_1')
+        generalized_route = Route(
+            FAKE_VIEW,
+            FAKE_ROUTE_NAME,
+            [generalized_sub_route],
+            )
+
+        with deferred_validation():
+            specialized_route = generalized_route.create_specialization(
+                additional_sub_routes=[Route(None, 'sub_route_2')],
+                specialized_sub_routes=[
+                    generalized_sub_route.create_specialization(FAKE_VIEW),
+                    ],
+                )
+
+        specialized_route.validate()
+
+    def test_sibling_sub_routes_with_duplicated_names(self):
+        duplicated_route_name = 'sub_route_1'
+        with deferred_validation():
+            route = Route(
+                FAKE_VIEW,
+                FAKE_ROUTE_NAME,
+                (
+                    Route(FAKE_VIEW, duplicated_route_name),
+                    Route(None, duplicated_route_name),
+                    ),
+                )
+
+        with assert_raises_substring(
+            DuplicatedRouteError,
+            duplicated_route_name,
+            ):
+            route.validate()
+
+    def test_sub_route_duplicating_indirect_ancestor_name(self):
+        duplicated_route_name = 'route_name'
+        with deferred_validation():
+            route = Route(
+                FAKE_VIEW,
+                duplicated_route_name,
+                [Route(None, None, [Route(FAKE_VIEW, duplicated_route_name)])],
+                )
+
+        with assert_raises_substring(
+            DuplicatedRouteError,
+            duplicated_route_name,
+            ):
+            route.validate()
+
+    def test_equivalent_sibling_sub_routes_without_names(self):
+        sub_route = Route(FAKE_VIEW, None)
+        with deferred_validation():
+            route = Route(
+                FAKE_VIEW,
+                FAKE_ROUTE_NAME,
+                (sub_route, Route(FAKE_VIEW, None)),
+                )
+
+        with assert_raises_substring(DuplicatedRouteError, repr(sub_route)):
+            route.validate()
+
+    def test_additional_sub_route_duplicating_name(self):
+        duplicated_route_name = 'route_name'
+        generalized_route = Route(
+            None,
+            None,
+            [Route(None, duplicated_route_name)],
+            )
+
+        with deferred_validation():
+            specialized_route = generalized_route.create_specialization(
+                additional_sub_routes=[
+                    Route(FAKE_VIEW, duplicated_route_name),
+                    ],
+                )
+
+        with assert_raises_substring(
+            DuplicatedRouteError,
+            duplicated_route_name,
+            ):
+            specialized_route.validate()
+
+    def test_non_specialized_sub_route(self):
+        sub_route_name = 'sub_route_name'
+        generalized_route = Route(None, None, [Route(None, sub_route_name)])
+
+        with deferred_validation():
+            specialized_route = generalized_route.create_specialization(
+                specialized_sub_routes=[Route(None, sub_route_name)],
+                )
+
+        with assert_raises_substring(
+            InvalidSpecializationError,
+            'is not specialized',
+            ):
+            specialized_route.validate()
+
+    def test_non_existing_generalization(self):
+        non_existing_sub_route_name = 'non_existing_route'
+        generalized_route = Route(None, None)
+
+        with deferred_validation():
+            specialized_route = generalized_route.create_specialization(
+                specialized_sub_routes=[
+                    Route(None, non_existing_sub_route_name) \
+                        .create_specialization(),
+                    ],
+                )
+
+        with assert_raises_substring(
+            InvalidSpecializationError,
+            non_existing_sub_route_name,
+            ):
+            specialized_route.validate()
+
+    def test_sub_route_specialized_twice(self):
+        generalized_sub_route = Route(None, 'sub_route')
+        generalized_route = Route(None, None, [generalized_sub_route])
+
+        with deferred_validation():
+            specialized_route = generalized_route.create_specialization(
+                specialized_sub_routes=[
+                    generalized_sub_route.create_specialization(FAKE_VIEW),
+                    generalized_sub_route.create_specialization(),
+                    ],
+                )
+
+        with assert_raises_substring(
+            InvalidSpecializationError,
+            'cannot be specialized twice',
+            ):
+            specialized_route.validate()
+
+    def test_validation_after_context(self):
+        duplicated_route_name = 'sub_route_1'
+        with deferred_validation():
+            pass
+
+        with assert_raises_substring(
+            DuplicatedRouteError,
+            duplicated_route_name,
+            ):
+            Route(
+                FAKE_VIEW,
+                FAKE_ROUTE_NAME,
+                (
+                    Route(FAKE_VIEW, duplicated_route_name),
+                    Route(None, duplicated_route_name),
+                    ),
+                )
+
+    def test_validated_route_with_unvalidated_sub_routes(self):
+        duplicated_route_name = 'route_name'
+        with deferred_validation():
+            sub_route = \
+                Route(None, None, [Route(FAKE_VIEW, duplicated_route_name)])
+
+        with assert_raises_substring(
+            DuplicatedRouteError,
+            duplicated_route_name,
+            ):
+            Route(FAKE_VIEW, duplicated_route_name, [sub_route])
+
+    def test_validation_in_other_threads(self):
+        duplicated_route_name = 'sub_route_1'
+        exceptions = []
+
+        def create_route():
+            try:
+                Route(
+                    FAKE_VIEW,
+                    FAKE_ROUTE_NAME,
+                    (
+                        Route(FAKE_VIEW, duplicated_route_name),
+                        Route(None, duplicated_route_name),
+                        ),
+                    )
+            except DuplicatedRouteError as exc:
+                exceptions.append(exc)
+
+        with deferred_validation():
+            thread = Thread(target=create_route)
+            thread.start()
+            thread.join()
+
+        eq_(1, len(exceptions))